@@ -0,0 +1,92 @@
+"""
+Benchmark: sequentieller Abruf (wie bisher in HtmlParser._get_soup) gegen den AsyncFetcher.
+
+Startet mehrere lokale HTTP-Server mit künstlicher Latenz (jeder Port gilt als eigener Host)
+und misst den Durchsatz beider Varianten.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_async_fetch --hosts 4 --pages 25 --latency 0.1
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import requests as rq
+
+from config import Config
+from src.utils.async_fetcher import AsyncFetcher
+
+PAGE = b"<html><body>" + b"<a class='link' href='/article'>article</a>" * 50 + b"</body></html>"
+
+
+def start_latency_server(latency: float) -> ThreadingHTTPServer:
+    """
+    Startet einen lokalen HTTP-Server, der jede Anfrage nach `latency` Sekunden beantwortet.
+    """
+
+    class LatencyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_sequential(urls: List[str], config: Config) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        rq.get(url, headers=config.headers)
+    return time.perf_counter() - start
+
+
+def run_async(urls: List[str], config: Config) -> float:
+    fetcher = AsyncFetcher(config=config)
+    start = time.perf_counter()
+    results = fetcher.fetch_all(urls)
+    elapsed = time.perf_counter() - start
+    assert all(result and result.ok for result in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=25, help="Seiten pro Host")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latenz pro Anfrage in Sekunden")
+    args = parser.parse_args()
+
+    config = Config()
+    servers = [start_latency_server(args.latency) for _ in range(args.hosts)]
+    urls = [
+        f"http://127.0.0.1:{server.server_address[1]}/page/{page_nr}/"
+        for page_nr in range(args.pages)
+        for server in servers
+    ]
+
+    print(
+        f"{len(urls)} urls, {args.hosts} hosts, latency {args.latency * 1000:.0f} ms, "
+        f"global limit {config.max_concurrent_requests}, per host limit {config.max_requests_per_host}"
+    )
+    for label, runner in (("sequential", run_sequential), ("async", run_async)):
+        elapsed = runner(urls, config)
+        print(f"{label:<12} {elapsed:8.2f} s  {len(urls) / elapsed:8.1f} pages/s")
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
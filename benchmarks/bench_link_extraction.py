@@ -0,0 +1,88 @@
+"""
+Micro-Benchmark der Link-Extraktion: BeautifulSoup ("html.parser", bisheriger Pfad) gegen die
+lxml-Backends des LinkExtractor auf den gespeicherten Listenseiten unter benchmarks/fixtures/.
+
+Gemessen werden die Parse-Zeit pro Seite (Median) und der Spitzenverbrauch an Arbeitsspeicher
+pro Seite. Da lxml außerhalb des Python-Heaps allokiert, läuft jede Messung in einem eigenen
+Prozess und es wird der Zuwachs des maximalen RSS gemessen.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.make_fixtures
+    python -m benchmarks.bench_link_extraction --repeat 20
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.make_fixtures import FIXTURES_PATH
+from config import Config
+from src.parser.link_extractor import BACKENDS, LinkExtractor
+
+A_TAG_LOCATION = "loop-card__title-link"
+BASE_URL = "https://example.org/latest/"
+
+
+def measure(backend: str, fixture: str, repeat: int) -> dict:
+    """
+    Misst ein Backend auf einer Fixture im aktuellen Prozess.
+    """
+    content = FIXTURES_PATH.joinpath(fixture).read_bytes()
+    extractor = LinkExtractor(config=Config(), backend=backend)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    links = extractor.extract(content, BASE_URL, A_TAG_LOCATION)
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extractor.extract(content, BASE_URL, A_TAG_LOCATION)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "fixture": fixture,
+        "kib": round(len(content) / 1024),
+        "links": len(links),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        # ru_maxrss ist unter Linux in KiB angegeben
+        "peak_rss_kib": rss_peak - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "FIXTURE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child, repeat=args.repeat)))
+        return
+
+    fixtures = sorted(path.name for path in FIXTURES_PATH.glob("listing_*.html"))
+    if not fixtures:
+        sys.exit("no fixtures found, run `python -m benchmarks.make_fixtures` first")
+
+    print(f"{'fixture':<20} {'KiB':>5} {'backend':<8} {'links':>5} {'median ms':>10} {'peak RSS KiB':>13}")
+    for fixture in fixtures:
+        for backend in BACKENDS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_link_extraction",
+                 "--repeat", str(args.repeat), "--child", backend, fixture],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{result['fixture']:<20} {result['kib']:>5} {result['backend']:<8} {result['links']:>5} "
+                f"{result['median_ms']:>10} {result['peak_rss_kib']:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
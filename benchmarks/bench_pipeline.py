@@ -0,0 +1,350 @@
+"""
+Benchmark der gesamten Pipeline (main.run) und der einzelnen Stufen gegen den lokalen
+FixtureServer, ohne Netzwerk und ohne Browser.
+
+Stufen:
+    full        main.run() mit allen Stufen als Datenfluss (CrawlOrchestrator)
+    barrier     main.run() Stufe für Stufe (Config.dataflow_enabled = False) zum Vergleich
+    pagination  HTTP-Paginierung der Listenseiten (DynamicPageHandler)
+    links       Link-Extraktion aller Listenseiten (HtmlParser.get_links_from_main_urls)
+    articles    Download und Parsen der Artikel (HtmlParser.get_articles_with_newspaper)
+    tables      Tabellen der Medaillenseite (HtmlParser.get_tables_from_html)
+    export      Schreiben von Artikeln über den ResultSink (Config.export_format, ohne Netzwerk)
+
+Jede Messung läuft in einem eigenen Prozess, gemessen werden Laufzeit, Durchsatz, Latenz der
+Abrufe (p50/p95/p99 aus dem Run-Report, siehe src/utils/metrics.py) und der maximale RSS
+(Hauptprozess und Parse-Worker), für full zusätzlich die Zeit bis zum ersten Ergebnis.
+Die vorbereitenden Stufen laufen jeweils ungemessen.
+
+Die Ergebnisse werden mit Git-Revision an benchmarks/results/results.jsonl angehängt und mit
+dem letzten Lauf mit denselben Parametern verglichen.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.make_fixtures
+    python -m benchmarks.bench_pipeline --latency 0.05 --error-rate 0.02
+    python -m benchmarks.bench_pipeline --stages articles,export --export-format parquet
+"""
+
+import argparse
+import datetime
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.make_fixtures import SITE_PATH
+
+RESULTS_PATH = Path(__file__).parent.joinpath("results", "results.jsonl")
+STAGES = ("full", "barrier", "pagination", "links", "articles", "tables", "export")
+
+
+def make_config(workdir: Path, args: argparse.Namespace):
+    """
+    Config mit allen Pfaden im temporären Arbeitsverzeichnis. Die Höflichkeitspausen werden
+    auf --rps gesetzt, da sonst das Rate-Limit statt des Codes gemessen wird.
+    """
+    from config import Config
+
+    config = Config()
+    config.urls_json_path = workdir.joinpath("urls.json")
+    config.output_path = workdir.joinpath("output")
+    config.cache_enabled = False
+    config.strategy_probe_path = workdir.joinpath("strategy_probe.sqlite")
+    config.checkpoint_path = workdir.joinpath("checkpoints")
+    config.incremental_crawl = False
+    config.metrics_enabled = True
+    config.metrics_path = workdir.joinpath("reports")
+    config.default_requests_per_second = args.rps
+    config.default_burst = max(1, int(args.rps))
+    config.respect_crawl_delay = False
+    config.export_format = args.export_format
+    config.parse_workers = args.parse_workers
+    return config
+
+
+def make_sources(base_url: str, n_pages: int) -> List[dict]:
+    """
+    Quellen wie in urls.json, aber gegen den FixtureServer.
+    """
+    common = {
+        "selenium": False,
+        "page_button_location": "wp-block-query-pagination-next",
+        "date_tag": "",
+        "date_location": "",
+    }
+    return [
+        {
+            **common,
+            "url": f"{base_url}/latest/",
+            "name": "fixture_news",
+            "bs4": True,
+            "pandas": False,
+            "newspaper3K": True,
+            "paginated": True,
+            "a_tag_location_css": "loop-card__title-link",
+            "pagination": {"strategy": "url_template", "template": "{url}page/{page}/", "max_pages": n_pages},
+        },
+        {
+            **common,
+            "url": f"{base_url}/statistics/medal/country/",
+            "name": "fixture_medals",
+            "bs4": False,
+            "pandas": True,
+            "newspaper3K": False,
+            "paginated": False,
+            "a_tag_location_css": "",
+        },
+    ]
+
+
+def percentiles(values: List[float]) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        f"p{q}": round(values[min(len(values) - 1, int(len(values) * q / 100))] * 1000, 1)
+        for q in (50, 95, 99)
+    }
+
+
+def run_stage(stage: str, base_url: str, args: argparse.Namespace) -> dict:
+    """
+    Führt eine Stufe im aktuellen Prozess aus und gibt die Messwerte zurück.
+    """
+    from loguru import logger
+
+    # Die Log-Ausgabe kostet Zeit, gemessen wird die Pipeline wie im Betrieb, aber ohne Konsole
+    logger.remove()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_"))
+    config = make_config(workdir, args)
+    sources = make_sources(base_url, args.pages)
+    config.urls_json_path.write_text(json.dumps(sources), encoding="utf-8")
+
+    if stage in ("full", "barrier"):
+        import main
+
+        config.dataflow_enabled = stage == "full"
+        start = time.perf_counter()
+        main.run(config=config, n_articles=args.articles)
+        seconds = time.perf_counter() - start
+        report = json.loads(max(config.metrics_path.glob("*.json")).read_text(encoding="utf-8"))
+        # Ergebnisse des Laufs, nicht Zähler wie Anfragen oder gefundene Links
+        counters = report["counters"]
+        items = int(counters.get("articles_extracted", 0) + counters.get("tables_extracted", 0))
+    elif stage == "export":
+        seconds, items = run_export(config, args)
+        report = {"fetches": []}
+    else:
+        seconds, items, report = run_isolated_stage(stage, config, args)
+
+    fetches = [fetch for fetch in report["fetches"] if fetch["cache"] != "hit"]
+    return {
+        "stage": stage,
+        "seconds": round(seconds, 3),
+        "items": items,
+        "items_per_second": round(items / seconds, 1) if seconds else None,
+        "requests": len(fetches),
+        "errors": sum(fetch["status_code"] != 200 for fetch in fetches),
+        "latency_ms": percentiles([fetch["total"] for fetch in fetches]),
+        "first_result_seconds": report.get("dataflow", {}).get("first_result_seconds"),
+        # ru_maxrss ist unter Linux in KiB angegeben
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_rss_children_kib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def run_isolated_stage(stage: str, config, args: argparse.Namespace):
+    from src.parser.generic_html_parser import DynamicPageHandler
+    from src.parser.html_parser import HtmlParser
+    from src.utils.file_manager import FileHandler
+
+    file_handler = FileHandler(config=config)
+    main_urls_list = file_handler.load_sources_from_json()
+    html_handler = HtmlParser(config=config)
+    metrics = html_handler.metrics
+    dynamic_page_handler = DynamicPageHandler(config=config, fetcher=html_handler.fetcher)
+
+    def timed(function, *func_args, **kwargs):
+        metrics.enabled = True
+        start = time.perf_counter()
+        result = function(*func_args, **kwargs)
+        seconds = time.perf_counter() - start
+        metrics.enabled = False
+        return seconds, result
+
+    # Vorbereitende Stufen ohne Messung
+    metrics.enabled = False
+    if stage == "pagination":
+        seconds, _ = timed(dynamic_page_handler.get_paginated_links, main_urls_list=main_urls_list)
+        items = sum(len(source.pages) for source in main_urls_list if source.pagination_strategy)
+    elif stage == "links":
+        dynamic_page_handler.get_paginated_links(main_urls_list=main_urls_list)
+        # Die HTTP-Paginierung sammelt die Links bereits, hier werden die Seiten erneut geparst
+        for source in main_urls_list:
+            source.sublinks = None
+        seconds, _ = timed(html_handler.get_links_from_main_urls, main_urls_list=main_urls_list)
+        items = sum(len(source.sublinks or []) for source in main_urls_list)
+    elif stage == "articles":
+        dynamic_page_handler.get_paginated_links(main_urls_list=main_urls_list)
+        with file_handler.open_result_sink() as sink:
+            seconds, _ = timed(
+                html_handler.get_articles_with_newspaper,
+                main_urls_list=main_urls_list, n_articles=args.articles, sink=sink,
+            )
+        items = int(metrics.report()["counters"].get("articles_extracted", 0))
+    else:
+        seconds, tables = timed(html_handler.get_tables_from_html, main_urls_list=main_urls_list)
+        items = len(tables)
+    dynamic_page_handler.close()
+
+    return seconds, items, metrics.report()
+
+
+def run_export(config, args: argparse.Namespace):
+    """
+    Schreibt --export-records Artikel mit Texten aus den Fixtures über den ResultSink.
+    """
+    from src.utils.result_sink import ResultSink
+
+    texts = [path.read_text(encoding="utf-8") for path in sorted(SITE_PATH.glob("2024/05/*/index.html"))]
+    records = (
+        {
+            "name": f"fixture_{i % 4}",
+            "article_link": f"https://example.org/{i}/",
+            "title": f"Article {i}",
+            "date": datetime.datetime(2024, 5, 1 + i % 28, tzinfo=datetime.timezone.utc),
+            "article": texts[i % len(texts)],
+            "tags": "#benchmark",
+        }
+        for i in range(args.export_records)
+    )
+
+    start = time.perf_counter()
+    with ResultSink(config=config) as sink:
+        for record in records:
+            sink.write(record["name"], [record])
+    return time.perf_counter() - start, args.export_records
+
+
+def git_revision() -> str:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode != 0
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_results(params: dict) -> dict:
+    """
+    Ergebnisse des letzten gespeicherten Laufs mit denselben Parametern, nach Stufe.
+    """
+    if not RESULTS_PATH.exists():
+        return {}
+    previous = {}
+    for line in RESULTS_PATH.read_text(encoding="utf-8").splitlines():
+        entry = json.loads(line)
+        if entry["params"] == params:
+            previous.update({result["stage"]: result for result in entry["results"]})
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"kommagetrennt aus {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="Messungen pro Stufe (gemeldet wird der Median)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latenz pro Anfrage in Sekunden")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Bytes pro Sekunde und Antwort (0 = unbegrenzt)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlerhafter Antworten")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--pages", type=int, default=5, help="Listenseiten, die paginiert werden")
+    parser.add_argument("--articles", type=int, default=50, help="Artikel pro Quelle")
+    parser.add_argument("--rps", type=float, default=100.0, help="Rate-Limit pro Domain")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--export-format", default="csv")
+    parser.add_argument("--export-records", type=int, default=2000)
+    parser.add_argument("--no-save", action="store_true", help="Ergebnisse nicht speichern")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "BASE_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_stage(*args.child, args)))
+        return
+
+    if not SITE_PATH.exists():
+        sys.exit("no site fixtures found, run `python -m benchmarks.make_fixtures` first")
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown_stages = set(stages) - set(STAGES)
+    if unknown_stages:
+        sys.exit(f"unknown stages {sorted(unknown_stages)}, choose from {list(STAGES)}")
+
+    params = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("stages", "repeat", "no_save", "child")
+    }
+    previous = previous_results(params)
+    child_args = [
+        f"--{key.replace('_', '-')}={value}" for key, value in params.items() if value is not None
+    ]
+
+    results = []
+    print(
+        f"{'stage':<11} {'seconds':>8} {'items':>6} {'items/s':>8} {'requests':>8} {'errors':>6} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'RSS MiB':>8} {'workers':>8} {'first s':>8} {'vs prev':>8}"
+    )
+    for stage in stages:
+        runs = []
+        for _ in range(args.repeat):
+            with FixtureServer(
+                latency=args.latency,
+                bandwidth=args.bandwidth,
+                error_rate=args.error_rate,
+                error_status=args.error_status,
+            ) as server:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_pipeline", *child_args,
+                     "--child", stage, server.base_url],
+                    capture_output=True, text=True, check=True,
+                ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        runs.sort(key=lambda run: run["seconds"])
+        result = runs[len(runs) // 2]
+        result["peak_rss_kib"] = max(run["peak_rss_kib"] for run in runs)
+        results.append(result)
+
+        change = ""
+        if stage in previous and previous[stage]["seconds"]:
+            change = f"{(result['seconds'] / previous[stage]['seconds'] - 1) * 100:+.0f} %"
+        latency = result["latency_ms"]
+        print(
+            f"{stage:<11} {result['seconds']:>8.2f} {result['items']:>6} {result['items_per_second'] or 0:>8.1f} "
+            f"{result['requests']:>8} {result['errors']:>6} {latency.get('p50', '-'):>7} {latency.get('p95', '-'):>7} "
+            f"{latency.get('p99', '-'):>7} {result['peak_rss_kib'] / 1024:>8.0f} "
+            f"{result['peak_rss_children_kib'] / 1024:>8.0f} {result['first_result_seconds'] or '-':>8} {change:>8}"
+        )
+
+    if not args.no_save:
+        RESULTS_PATH.parent.mkdir(exist_ok=True)
+        entry = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "params": params,
+            "results": results,
+        }
+        with RESULTS_PATH.open("a", encoding="utf-8") as results_file:
+            results_file.write(json.dumps(entry) + "\n")
+        print(f"results appended to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Lokaler HTTP-Server, der die Fixtures unter benchmarks/fixtures/site/ ausliefert (siehe
+make_fixtures.py). Latenz, Bandbreite und Fehler sind einstellbar, damit die Benchmarks
+reale Quellen reproduzierbar und ohne Netzwerk nachbilden.
+
+Ein Pfad wie /latest/ wird auf site/latest/index.html abgebildet. Fehler werden mit einem
+festen Seed gewürfelt, sodass jeder Lauf dieselben Anfragen scheitern lässt.
+
+Standalone, z. B. zum Ausprobieren mit main.py:
+    python -m benchmarks.fixture_server --port 8000 --latency 0.05 --error-rate 0.02
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.make_fixtures import SITE_PATH
+
+CHUNK_SIZE = 16 * 1024
+
+
+class FixtureServer:
+    """
+    Liefert statische Fixtures mit künstlicher Latenz, begrenzter Bandbreite und Fehlern aus.
+
+    Attributes:
+        root (Path): Wurzelverzeichnis der ausgelieferten Seiten.
+        latency (float): Wartezeit vor jeder Antwort in Sekunden.
+        bandwidth (int): Maximale Bytes pro Sekunde und Antwort (0 = unbegrenzt).
+        error_rate (float): Anteil der Anfragen, die mit error_status beantwortet werden.
+        error_status (int): Statuscode der eingestreuten Fehler (z. B. 503 oder 500).
+        n_requests (int): Anzahl der bisher beantworteten Anfragen.
+        n_errors (int): Anzahl der eingestreuten Fehler.
+    """
+
+    def __init__(
+        self,
+        root: Path = SITE_PATH,
+        latency: float = 0.0,
+        bandwidth: int = 0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.root = root
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.n_requests = 0
+        self.n_errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _resolve(self, url_path: str) -> Path | None:
+        path = self.root.joinpath(url_path.split("?")[0].lstrip("/")).resolve()
+        if path.is_dir():
+            path = path.joinpath("index.html")
+        # Keine Pfade außerhalb der Fixtures ausliefern
+        if self.root.resolve() not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            self.n_requests += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.n_errors += 1
+                return True
+        return False
+
+    def _make_handler(self):
+        server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            # Keep-Alive wie bei echten Servern
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                path = server._resolve(self.path)
+                if server._inject_error():
+                    self._send(server.error_status, b"injected error")
+                elif path is None:
+                    self._send(404, b"not found")
+                else:
+                    self._send(200, path.read_bytes())
+
+            def _send(self, status_code: int, body: bytes):
+                self.send_response(status_code)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for offset in range(0, len(body), CHUNK_SIZE):
+                    chunk = body[offset:offset + CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    if server.bandwidth:
+                        time.sleep(len(chunk) / server.bandwidth)
+
+            def log_message(self, *args):
+                pass
+
+        return FixtureHandler
+
+    def start(self) -> "FixtureServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latenz pro Anfrage in Sekunden")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Bytes pro Sekunde und Antwort (0 = unbegrenzt)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlerhafter Antworten")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    if not SITE_PATH.exists():
+        raise SystemExit("no site fixtures found, run `python -m benchmarks.make_fixtures` first")
+    server = FixtureServer(
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        port=args.port,
+    ).start()
+    print(f"serving {SITE_PATH} on {server.base_url}/latest/ (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
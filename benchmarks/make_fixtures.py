@@ -0,0 +1,226 @@
+"""
+Erzeugt die HTML-Fixtures für die Benchmarks unter benchmarks/fixtures/.
+
+Die Seiten sind synthetisch, aber wie die konfigurierten Quellen aufgebaut (tief verschachtelte
+Listenseiten mit vielen Navigations-Links und wenigen Artikel-Links), damit die Benchmarks
+reproduzierbar und ohne Netzwerk laufen. Die Ausgabe ist deterministisch.
+
+Unter fixtures/site/ entsteht zusätzlich eine vollständige Website (paginierte Listenseiten,
+Artikel, Sitemap, RSS-Feed und eine Medaillentabelle wie bei olympedia), die der
+FixtureServer ausliefert.
+Aufgezeichnete Seiten können im selben Verzeichnisbaum abgelegt werden.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.make_fixtures
+"""
+
+import argparse
+import datetime
+import gzip
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FIXTURES_PATH = Path(__file__).parent.joinpath("fixtures")
+SITE_PATH = FIXTURES_PATH.joinpath("site")
+
+WORDS = (
+    "startup funding round investors product launch market growth security data "
+    "platform cloud model users revenue team company report analysis policy"
+).split()
+
+
+# Newspaper3K erkennt Fließtext an der Anzahl der Stoppwörter
+STOP_WORDS = "the a of and to in is that for with on as by it was this from at".split()
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def _prose(rng: random.Random, n_words: int) -> str:
+    words = (rng.choice(STOP_WORDS) if i % 2 else rng.choice(WORDS) for i in range(n_words))
+    return " ".join(words).capitalize() + "."
+
+
+def make_listing_page(
+    rng: random.Random,
+    n_articles: int,
+    n_noise_links: int,
+    page_nr: int = 1,
+    slugs: List[str] = None,
+    absolute_host: str | None = "https://example.org",
+    feed_url: str | None = None,
+) -> str:
+    """
+    Listenseite mit `n_articles` Artikel-Links (Klasse loop-card__title-link, teils relativ,
+    teils doppelt) zwischen `n_noise_links` sonstigen Links. Mit `slugs` werden die Artikel
+    vorgegeben, ohne `absolute_host` sind alle Links relativ. Mit `feed_url` verweist der
+    Kopf der Seite auf einen RSS-Feed.
+    """
+    nav = "".join(
+        f'<li class="menu-item"><a class="menu-link" href="/category/{rng.choice(WORDS)}/{i}/">'
+        f"{rng.choice(WORDS)}</a></li>"
+        for i in range(n_noise_links)
+    )
+    cards = []
+    for i in range(n_articles):
+        slug = slugs[i] if slugs else f"{page_nr}-{i}-{rng.choice(WORDS)}-{rng.choice(WORDS)}"
+        href = f"/2024/05/{slug}/" if i % 3 or not absolute_host else f"{absolute_host}/2024/05/{slug}/"
+        cards.append(
+            '<div class="wp-block-post"><div class="loop-card"><div class="loop-card__content">'
+            f'<h3 class="loop-card__title"><a class="loop-card__title-link" href="{href}">'
+            f"{_sentence(rng, 8)}</a></h3>"
+            f'<div class="loop-card__meta"><span class="author">{rng.choice(WORDS)}</span>'
+            f'<a class="loop-card__cat" href="/category/{rng.choice(WORDS)}/">{rng.choice(WORDS)}</a></div>'
+            f'<p class="loop-card__excerpt">{_sentence(rng, 30)}</p>'
+            # Gleicher Artikel nochmals über das Vorschaubild verlinkt
+            f'<a class="loop-card__title-link loop-card__image" href="{href}"><img src="/img/{i}.jpg"></a>'
+            "</div></div></div>"
+        )
+    next_link = f'<a class="wp-block-query-pagination-next" href="/latest/page/{page_nr + 1}/">Next</a>'
+    feed_link = f'<link rel="alternate" type="application/rss+xml" href="{feed_url}">' if feed_url else ""
+    return (
+        f"<!DOCTYPE html><html><head><title>Latest</title>{feed_link}"
+        + "".join(f'<script>var config{i} = "{ "x" * 200 }";</script>' for i in range(20))
+        + f'</head><body><header><nav><ul>{nav}</ul></nav></header><main><div class="wp-block-query">'
+        + "".join(cards)
+        + f"</div>{next_link}</main><footer><ul>{nav}</ul></footer></body></html>"
+    )
+
+
+def published_at(article_nr: int) -> datetime.datetime:
+    return datetime.datetime(2024, 5, 1 + article_nr % 28, 10, tzinfo=datetime.timezone.utc)
+
+
+def make_article_page(rng: random.Random, n_paragraphs: int, article_nr: int) -> str:
+    paragraphs = "".join(f"<p>{_prose(rng, 40)} {_prose(rng, 25)}</p>" for _ in range(n_paragraphs))
+    return (
+        f"<!DOCTYPE html><html><head><title>Article {article_nr}</title>"
+        f'<meta property="article:published_time" content="{published_at(article_nr).isoformat()}">'
+        f'</head><body><article><h1>{_sentence(rng, 10)}</h1><span class="author">{rng.choice(WORDS)}</span>'
+        f'<div class="entry-content">{paragraphs}</div></article></body></html>'
+    )
+
+
+def make_table_page(rng: random.Random, n_tables: int, n_rows: int) -> str:
+    """
+    Tabellenseite im Stil der Olympedia-Medaillentabelle: eine große Haupttabelle mit id
+    und weitere kleinere Tabellen.
+    """
+    tables = []
+    for table_nr in range(n_tables):
+        rows = n_rows if table_nr == 0 else n_rows // 10
+        body = "".join(
+            f"<tr><td>{rng.choice(WORDS).upper()}{row}</td><td>{rng.randint(0, 300)}</td>"
+            f"<td>{rng.randint(0, 300)}</td><td>{rng.randint(0, 300)}</td><td>{rng.randint(0, 900)}</td></tr>"
+            for row in range(rows)
+        )
+        table_id = ' id="medals"' if table_nr == 0 else ""
+        tables.append(
+            f'<table class="table table-striped"{table_id}><thead><tr><th>Country</th><th>Gold</th>'
+            f"<th>Silver</th><th>Bronze</th><th>Total</th></tr></thead><tbody>{body}</tbody></table>"
+        )
+    return f"<!DOCTYPE html><html><head><title>Medals</title></head><body>{''.join(tables)}</body></html>"
+
+
+def make_sitemaps(articles: List[Tuple[str, datetime.datetime]]) -> Dict[str, str | bytes]:
+    """
+    robots.txt mit Verweis auf einen Sitemap-Index, der auf eine gzip-komprimierte Sitemap
+    mit allen Artikeln samt Artikelbild (Image-Sitemap) und eine ältere, leere Sitemap
+    verweist, sowie ein RSS-Feed mit den 20 neuesten Artikeln. Die URLs sind relativ, da der Host des FixtureServers erst beim
+    Start feststeht.
+    """
+    newest = max(date for _, date in articles)
+    urls = "".join(
+        f"<url><loc>{path}</loc><lastmod>{date.isoformat()}</lastmod>"
+        f"<image:image><image:loc>{path}image.jpg</image:loc></image:image></url>"
+        for path, date in articles
+    )
+    index = (
+        f"<sitemap><loc>/sitemap-2024-05.xml.gz</loc><lastmod>{newest.isoformat()}</lastmod></sitemap>"
+        "<sitemap><loc>/sitemap-2024-04.xml</loc><lastmod>2024-04-30T10:00:00+00:00</lastmod></sitemap>"
+    )
+    items = "".join(
+        f"<item><title>Article</title><link>{path}</link><pubDate>{date.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate></item>"
+        for path, date in sorted(articles, key=lambda article: article[1], reverse=True)[:20]
+    )
+    namespace = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    image_namespace = 'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"'
+    return {
+        "robots.txt": "User-agent: *\nAllow: /\nSitemap: /sitemap.xml\n",
+        "sitemap.xml": f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {namespace}>{index}</sitemapindex>',
+        "sitemap-2024-05.xml.gz": gzip.compress(
+            f'<?xml version="1.0" encoding="UTF-8"?><urlset {namespace} {image_namespace}>{urls}</urlset>'.encode("utf-8"), mtime=0
+        ),
+        "sitemap-2024-04.xml": f'<?xml version="1.0" encoding="UTF-8"?><urlset {namespace}></urlset>',
+        "feed.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Latest</title>'
+            f"<link>/latest/</link>{items}</channel></rss>"
+        ),
+    }
+
+
+def make_site(rng: random.Random, n_pages: int, n_articles: int, n_paragraphs: int) -> Dict[str, str | bytes]:
+    """
+    Website mit `n_pages` Listenseiten unter /latest/ (Paginierung über /latest/page/<nr>/)
+    mit je `n_articles` Artikeln, Sitemap und RSS-Feed der Artikel sowie einer
+    Medaillentabelle unter /statistics/medal/country/.
+
+    Returns:
+        Dict[str, str | bytes]: Relativer Dateipfad und Inhalt jeder Seite.
+    """
+    pages, articles = {}, []
+    for page_nr in range(1, n_pages + 1):
+        slugs = [f"{page_nr}-{i}-{rng.choice(WORDS)}" for i in range(n_articles)]
+        listing_path = "latest/index.html" if page_nr == 1 else f"latest/page/{page_nr}/index.html"
+        pages[listing_path] = make_listing_page(
+            rng, n_articles, n_noise_links=200, page_nr=page_nr, slugs=slugs, absolute_host=None, feed_url="/feed.xml"
+        )
+        for i, slug in enumerate(slugs):
+            article_nr = (page_nr - 1) * n_articles + i
+            pages[f"2024/05/{slug}/index.html"] = make_article_page(rng, n_paragraphs, article_nr=article_nr)
+            articles.append((f"/2024/05/{slug}/", published_at(article_nr)))
+    pages.update(make_sitemaps(articles))
+    pages["statistics/medal/country/index.html"] = make_table_page(rng, n_tables=3, n_rows=250)
+    return pages
+
+
+def write_site(n_pages: int = 5, n_articles: int = 20, n_paragraphs: int = 12) -> None:
+    """
+    Schreibt die Website für den FixtureServer nach fixtures/site/ (vorhandene Seiten werden ersetzt).
+    """
+    shutil.rmtree(SITE_PATH, ignore_errors=True)
+    pages = make_site(random.Random(1), n_pages, n_articles, n_paragraphs)
+    for path, content in pages.items():
+        SITE_PATH.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            SITE_PATH.joinpath(path).write_bytes(content)
+        else:
+            SITE_PATH.joinpath(path).write_text(content, encoding="utf-8")
+    size = sum(len(content) for content in pages.values())
+    print(f"site/: {len(pages)} pages, {size / 1024:.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site-pages", type=int, default=5, help="Listenseiten der Website")
+    parser.add_argument("--site-articles", type=int, default=20, help="Artikel pro Listenseite")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    FIXTURES_PATH.mkdir(exist_ok=True)
+    fixtures = {
+        "listing_small.html": make_listing_page(rng, n_articles=20, n_noise_links=50),
+        "listing_large.html": make_listing_page(rng, n_articles=60, n_noise_links=1500),
+    }
+    for name, content in fixtures.items():
+        FIXTURES_PATH.joinpath(name).write_text(content, encoding="utf-8")
+        print(f"{name}: {len(content) / 1024:.0f} KiB")
+
+    write_site(n_pages=args.site_pages, n_articles=args.site_articles)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 import sys
+from functools import lru_cache
 from loguru import logger
 from dataclasses import dataclass
 from pathlib import Path
-from fake_useragent import UserAgent
 
-ua = UserAgent()
+
+@lru_cache(maxsize=1)
+def random_user_agent() -> str:
+    """
+    Wählt einmal pro Prozess einen zufälligen User-Agent. fake-useragent lädt dafür seine
+    Datenbank, daher erst beim ersten Abruf und nicht schon beim Import der Config.
+    """
+    from fake_useragent import UserAgent
+
+    return UserAgent().random
 
 
 @dataclass
@@ -20,7 +29,107 @@ class Config:
         output_path (Path): Pfad zum Verzeichnis für Ausgabedateien.
         delimiter (str): Trennzeichen für CSV-Dateien.
         encoding (str): Zeichenkodierung für Dateien.
-        boolean_cols (list): Liste von Spaltennamen, die boolesche Werte enthalten.
+        max_concurrent_requests (int): Maximale Anzahl gleichzeitiger HTTP-Anfragen insgesamt.
+        max_requests_per_host (int): Maximale Anzahl gleichzeitiger HTTP-Anfragen pro Host.
+        user_agent (str | None): User-Agent, der bei allen HTTP-Anfragen gesendet wird
+            (None = zufälliger User-Agent aus fake-useragent, einmal pro Prozess gewählt).
+        accept (str): Accept-Header für HTTP-Anfragen.
+        http_connect_timeout (float): Timeout für den Verbindungsaufbau in Sekunden.
+        http_read_timeout (float): Timeout für das Lesen der Antwort in Sekunden.
+        http_pool_connections (int): Anzahl der Hosts, deren Connection-Pool zwischengespeichert wird.
+        http_pool_maxsize (int): Maximale Anzahl offener Verbindungen pro Host.
+        http_retries (int): Maximale Anzahl an Wiederholungen pro Anfrage.
+        http_backoff_factor (float): Basis des exponentiellen Backoffs zwischen Wiederholungen in
+            Sekunden, die Wartezeit wird zufällig zwischen 0 und diesem Wert * 2^Versuch gewählt.
+        http_backoff_max (float): Obergrenze des Backoffs in Sekunden.
+        http_retry_status_codes (tuple): HTTP-Statuscodes, bei denen nach dem Backoff wiederholt
+            wird (zusätzlich zu Verbindungsfehlern). 429 und 503 werden vom DomainRateLimiter
+            behandelt und ebenfalls wiederholt.
+        breaker_enabled (bool): Weist Anfragen an Hosts mit zu vielen Fehlern zeitweise ab.
+        breaker_window (int): Anzahl der letzten Anfragen pro Host, deren Fehlerquote zählt.
+        breaker_min_requests (int): Mindestanzahl an Anfragen im Fenster, bevor der Breaker öffnet.
+        breaker_failure_rate (float): Fehlerquote, ab der der Breaker eines Hosts öffnet.
+        breaker_cooldown (float): Sekunden bis zur ersten Probe-Anfrage an einen gesperrten Host,
+            verdoppelt sich bei jeder erneuten Öffnung.
+        breaker_max_cooldown (float): Obergrenze der Pause in Sekunden.
+        default_requests_per_second (float): Standard-Rate pro Domain für Artikel-Downloads.
+        default_burst (int): Standard-Anzahl an Anfragen pro Domain, die ohne Pause erlaubt sind.
+        respect_crawl_delay (bool): Berücksichtigt den Crawl-delay aus der robots.txt.
+        cache_enabled (bool): Aktiviert den persistenten HTTP-Cache.
+        cache_path (Path): Verzeichnis des HTTP-Caches.
+        cache_ttl (float): Sekunden, die ein Eintrag ohne Revalidierung gültig ist
+            (pro Quelle in urls.json über "cache_ttl" überschreibbar).
+        cache_max_bytes (int): Maximale Größe des Caches, darüber wird nach LRU entfernt.
+        cache_only (bool): Offline-Modus, es werden nur gespeicherte Antworten verwendet.
+        browser_pool_size (int): Maximale Anzahl gleichzeitig laufender Browser für die Paginierung.
+        browser_max_pages (int): Anzahl Seiten, nach denen ein Browser durch einen neuen ersetzt wird.
+        browser_page_load_timeout (float): Timeout für das Laden einer Seite im Browser in Sekunden.
+        link_extractor_backend (str): Parser-Backend für die Link-Extraktion ("lxml", "stream" oder "bs4").
+        strategy_probe_enabled (bool): Prüft per einfachem Abruf, ob eine per Selenium paginierte
+            Quelle auch ohne Browser gelesen werden kann.
+        strategy_probe_ttl (float): Sekunden, die eine gespeicherte Entscheidung gültig ist.
+        strategy_probe_path (Path): Pfad zur Datenbank der Entscheidungen pro Quelle.
+        discovery_enabled (bool): Liest die Links von Quellen mit "discovery" in urls.json aus
+            Sitemaps und RSS/Atom-Feeds statt aus den Listenseiten.
+        discovery_max_age_days (float | None): Standard-Zeitfenster für lastmod/pubDate in Tagen
+            (None = alle Links).
+        discovery_max_links (int): Standard-Höchstzahl der Links pro Quelle, die neuesten zuerst.
+        discovery_max_documents (int): Höchstzahl der Sitemaps und Feeds, die pro Quelle gelesen werden.
+        pagination_max_pages (int): Standard-Seitenlimit für die HTTP-Paginierung.
+        selenium_max_pages (int): Standard-Seitenlimit für die Paginierung per Selenium, auch wenn
+            die StrategyProbe die Quelle auf HTTP umstellt.
+        parse_workers (int | None): Anzahl der Prozesse für das Parsen von Artikeln
+            (None = Anzahl der CPU-Kerne, 0 = Parsen in einem Thread ohne Prozess-Pool).
+        parse_queue_size (int): Maximale Anzahl heruntergeladener, noch nicht geparster Artikel.
+        dataflow_enabled (bool): Verarbeitet jede Seite sofort über alle Stufen (CrawlOrchestrator)
+            statt Stufe für Stufe für alle Quellen.
+        page_workers (int): Anzahl der Worker für Listenseiten (Abruf und Link-Extraktion).
+        download_workers (int): Anzahl der Worker für Artikel-Downloads.
+        table_workers (int): Anzahl der Worker für Tabellenseiten.
+        stage_queue_size (int): Maximale Anzahl Einträge in den Warteschlangen zwischen den Stufen.
+        incremental_crawl (bool): Überspringt Artikel, die in früheren Läufen extrahiert wurden.
+        incremental_recheck_seen (bool): Lädt bekannte Artikel erneut und übernimmt sie nur,
+            wenn sich Seite und Text geändert haben.
+        seen_store_path (Path): Pfad zur Datenbank der bereits extrahierten Artikel.
+        dedup_enabled (bool): Erkennt Beinahe-Duplikate (z. B. Agenturmeldungen unter mehreren
+            Links) über SimHash-Fingerabdrücke des Artikeltextes, auch über Läufe hinweg.
+        dedup_action (str): "drop" verwirft Duplikate, "tag" exportiert sie mit dem Link des
+            Originals in der Spalte "duplicate_of".
+        dedup_max_distance (int): Höchstzahl abweichender Bits (0 bis 63 von 64), bis zu der zwei
+            Artikel als Duplikat gelten.
+        dedup_index_path (Path): Pfad zur Datenbank der Fingerabdrücke.
+        result_run_id (str | None): Kennung des Laufs in den Namen der Ausgabedateien
+            (None = Zeitstempel). Mit einer festen Kennung setzt ein Neustart die Dateien fort.
+        sink_flush_records (int): Anzahl gepufferter Datensätze pro Quelle bis zum Schreiben.
+        sink_flush_interval (float): Sekunden, nach denen gepufferte Datensätze spätestens geschrieben werden.
+        checkpoint_enabled (bool): Protokolliert den Fortschritt eines Laufs, ein abgebrochener
+            Lauf wird beim nächsten Start fortgesetzt, ohne Seiten erneut abzurufen.
+        checkpoint_path (Path): Verzeichnis der Checkpoint-Dateien (eine pro Lauf).
+        checkpoint_max_age (float | None): Sekunden seit dem letzten Fortschritt, bis zu denen ein
+            abgebrochener Lauf fortgesetzt wird, ältere Läufe werden neu begonnen (None = jedes
+            Alter). Mit result_run_id wird der Lauf unabhängig vom Alter fortgesetzt.
+        checkpoint_flush_records (int): Anzahl gepufferter Ereignisse bis zum Schreiben.
+        checkpoint_flush_interval (float): Sekunden, nach denen gepufferte Ereignisse spätestens
+            geschrieben werden.
+        export_format (str): Ausgabeformat der Ergebnisse ("csv", "parquet" oder "arrow";
+            die spaltenorientierten Formate benötigen pyarrow).
+        export_compression (str): Kompression für Parquet bzw. Arrow IPC (z. B. "zstd", "lz4").
+        metrics_enabled (bool): Sammelt Messwerte pro Stufe und URL und schreibt einen Run-Report.
+        metrics_per_url (bool): Nimmt jeden einzelnen Abruf in den Run-Report auf.
+        metrics_prometheus (bool): Schreibt die Messwerte zusätzlich im Textformat von Prometheus.
+        task_queue_url (str): Gemeinsame Warteschlange für den verteilten Crawl,
+            "sqlite:///<pfad>" (ein Rechner) oder "redis://<host>:<port>/<db>" (mehrere Rechner).
+        task_queue_prefix (str): Präfix der Schlüssel in Redis.
+        task_visibility_timeout (float): Sekunden, nach denen eine nicht bestätigte Aufgabe
+            erneut vergeben wird.
+        task_max_attempts (int): Maximale Anzahl Zuteilungen einer Aufgabe.
+        task_retry_delay (float): Sekunden, bevor eine fehlgeschlagene Aufgabe erneut vergeben
+            wird, verdoppelt sich mit jedem Versuch (mindestens die verbleibende Pause des
+            Circuit Breakers ihres Hosts).
+        task_retry_max_delay (float): Obergrenze dieser Wartezeit in Sekunden.
+        task_lease_batch (int): Anzahl Artikel-Aufgaben, die ein Worker auf einmal übernimmt.
+        task_poll_interval (float): Wartezeit eines Workers in Sekunden, wenn keine Aufgabe vorliegt.
+        metrics_path (Path): Verzeichnis der Run-Reports.
     """
 
     project_path: Path = Path(__file__).parent.resolve()
@@ -28,66 +137,140 @@ class Config:
     urls_csv_path: Path = project_path.joinpath("urls.csv")
     urls_json_path: Path = project_path.joinpath("urls.json")
     output_path: Path = project_path.joinpath("output")
-    print(output_path)
     delimiter: str = ";"
     encoding: str = "utf-8"
     start_headless = False
 
-    boolean_cols = ["selenium", "pandas", "bs4", "newspaper3K", "paginated"]
+    # Browser-Pool für Selenium (siehe src/parser/browser_pool.py)
+    browser_pool_size: int = 2
+    browser_max_pages: int = 50
+    browser_page_load_timeout: float = 30.0
+
+    # HTTP statt Browser, wo möglich (siehe src/parser/strategy_probe.py)
+    strategy_probe_enabled: bool = True
+    strategy_probe_ttl: float = 7 * 24 * 3600
+    strategy_probe_path: Path = output_path.joinpath("strategy_probe.sqlite")
+
+    # Links aus Sitemaps und Feeds (siehe src/parser/link_discovery.py)
+    discovery_enabled: bool = True
+    discovery_max_age_days: float | None = 7.0
+    discovery_max_links: int = 1000
+    discovery_max_documents: int = 20
+
+    # Link-Extraktion (siehe src/parser/link_extractor.py)
+    link_extractor_backend: str = "lxml"
+
+    # Paginierung (pro Quelle in urls.json über "pagination": {"max_pages": ...} überschreibbar)
+    pagination_max_pages: int = 50
+    selenium_max_pages: int = 3
+
+    # Nebenläufigkeit beim Abruf von Seiten (siehe src/utils/async_fetcher.py)
+    max_concurrent_requests: int = 16
+    max_requests_per_host: int = 4
+
+    # HTTP-Client (siehe src/utils/http_client.py)
+    user_agent: str | None = None
+    accept: str = "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 30.0
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = max_requests_per_host
+    http_retries: int = 3
+    http_backoff_factor: float = 0.5
+    http_backoff_max: float = 30.0
+    http_retry_status_codes: tuple = (500, 502, 504)
+
+    # Circuit Breaker pro Host (siehe src/utils/host_health.py)
+    breaker_enabled: bool = True
+    breaker_window: int = 20
+    breaker_min_requests: int = 5
+    breaker_failure_rate: float = 0.5
+    breaker_cooldown: float = 30.0
+    breaker_max_cooldown: float = 600.0
+
+    # Rate-Limit pro Domain (siehe src/utils/rate_limiter.py), pro Quelle in urls.json
+    # über "requests_per_second" und "burst" überschreibbar
+    default_requests_per_second: float = 0.33
+    default_burst: int = 1
+    respect_crawl_delay: bool = True
+
+    # Persistenter HTTP-Cache (siehe src/utils/http_cache.py)
+    cache_enabled: bool = True
+    cache_path: Path = output_path.joinpath("http_cache")
+    cache_ttl: float = 0
+    cache_max_bytes: int = 500 * 1024 * 1024
+    cache_only: bool = False
 
-    headers = {
-        "User-Agent": ua.random,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    }
+    # Parsen der Artikel (siehe src/parser/article_pipeline.py)
+    parse_workers: int | None = None
+    parse_queue_size: int = 32
+
+    # Datenfluss zwischen den Stufen (siehe src/parser/crawl_orchestrator.py)
+    dataflow_enabled: bool = True
+    page_workers: int = 4
+    download_workers: int = max_concurrent_requests
+    table_workers: int = 2
+    stage_queue_size: int = 100
+
+    # Inkrementeller Crawl (siehe src/utils/seen_store.py)
+    incremental_crawl: bool = False
+    incremental_recheck_seen: bool = False
+    seen_store_path: Path = output_path.joinpath("seen_articles.sqlite")
+
+    # Erkennung von Beinahe-Duplikaten (siehe src/utils/near_duplicates.py)
+    dedup_enabled: bool = False
+    dedup_action: str = "drop"
+    dedup_max_distance: int = 3
+    dedup_index_path: Path = output_path.joinpath("near_duplicates.sqlite")
+
+    # Fortlaufender Export der Ergebnisse (siehe src/utils/result_sink.py)
+    result_run_id: str | None = None
+    sink_flush_records: int = 50
+    sink_flush_interval: float = 30.0
+    export_format: str = "csv"
+    export_compression: str = "zstd"
+
+    # Fortsetzen abgebrochener Läufe (siehe src/parser/checkpoint.py)
+    checkpoint_enabled: bool = True
+    checkpoint_path: Path = output_path.joinpath("checkpoints")
+    checkpoint_max_age: float | None = 24 * 3600
+    checkpoint_flush_records: int = 100
+    checkpoint_flush_interval: float = 5.0
+
+    # Messwerte und Run-Report (siehe src/utils/metrics.py)
+    metrics_enabled: bool = False
+    metrics_per_url: bool = True
+    metrics_prometheus: bool = False
+    metrics_path: Path = output_path.joinpath("reports")
+
+    # Verteilter Crawl (siehe src/utils/task_queue.py und distributed.py)
+    task_queue_url: str = f"sqlite:///{output_path.joinpath('task_queue.sqlite')}"
+    task_queue_prefix: str = "scraper"
+    task_visibility_timeout: float = 300.0
+    task_max_attempts: int = 3
+    task_retry_delay: float = 30.0
+    task_retry_max_delay: float = 600.0
+    task_lease_batch: int = 10
+    task_poll_interval: float = 2.0
+
+    @property
+    def headers(self) -> dict:
+        """
+        Standard-Header für alle HTTP-Anfragen.
+        """
+        return {"User-Agent": self.user_agent or random_user_agent(), "Accept": self.accept}
 
     @staticmethod
     def initialize_logger() -> None:
         """
-        Initialisiert und konfiguriert den Logger.
-
+        Initialisiert und konfiguriert den Logger. Alle Stufen laufen über einen Handler auf
+        stderr, gefärbt nach Stufe (Warnungen gelb, Fehler rot). Ein erneuter Aufruf, z. B. pro
+        Lauf in den Benchmarks, ersetzt den Handler, statt jede Meldung mehrfach auszugeben.
         """
 
         # Für mehr Info: https://loguru.readthedocs.io/en/stable/api/logger.html
         log_level = "DEBUG"
         log_format = ("<green>{time:YYYY-MM-DD HH:mm:ss.SSS zz}</green> | <level>{level: <8}</level> | <yellow>Line "
-                      "{line: >4} ({file}):</yellow> <b>{message}</b>")
+                      "{line: >4} ({file}):</yellow> <level>{message}</level>")
+        logger.remove()
         logger.add(sys.stderr, level=log_level, format=log_format, colorize=True, backtrace=True, diagnose=True)
-
-        # spezifische Handler für Fehler und kritische Stufen mit benutzerdefinierten:
-        logger.add(
-            sys.stderr,
-            level="ERROR",
-            format="<red>{time:YYYY-MM-DD HH:mm:ss.SSS zz}</red> | <level>{level: <8}</level> | <red>Line {line: >4} "
-                   "({file}):</red> <level>{message}</level>",
-            colorize=True,
-            backtrace=True,
-            diagnose=True
-        )
-
-        # Warnmeldungen mit Gelb einfärben
-        log_format_warning = (
-            "<yellow>{time:YYYY-MM-DD HH:mm:ss.SSS zz}</yellow> | "
-            "<yellow>{level: <8}</yellow> | "
-            "<yellow>Line {line: >4} ({file}):</yellow> "
-            "<yellow>{message}</yellow>"
-        )
-
-        # sys.stderr -> logging für die Konsole
-        logger.add(
-            sys.stderr,
-            level="WARNING",
-            format=log_format_warning,
-            colorize=True,
-            backtrace=True,
-            diagnose=True
-        )
-        logger.add(
-            sys.stderr,
-            level="CRITICAL",
-            format="<bold red>{time:YYYY-MM-DD HH:mm:ss.SSS zz}</bold red> | <level>{level: <8}</level> | "
-                   "<bold red>Line {line: >4} ({file}):</bold red> <level>{message}</level>",
-            colorize=True,
-            backtrace=True,
-            diagnose=True
-        )
-
@@ -0,0 +1,74 @@
+"""
+Verteilter Crawl über eine gemeinsame TaskQueue (Config.task_queue_url).
+
+Der Coordinator legt pro Quelle aus urls.json eine Aufgabe an, beliebig viele Worker
+(auf einem oder mehreren Rechnern) bearbeiten die Quellen und die daraus entstehenden
+Artikel-Aufgaben. Jeder Worker schreibt eigene Ausgabedateien.
+
+Aufruf aus dem Projektverzeichnis:
+    python distributed.py enqueue --articles 20 --reset
+    python distributed.py worker --processes 4
+    python distributed.py status
+"""
+
+import argparse
+import multiprocessing
+
+from config import Config
+from src.parser.distributed_crawl import CrawlCoordinator, CrawlWorker
+from src.utils.file_manager import FileHandler
+from src.utils.task_queue import open_task_queue
+
+
+def run_worker(worker_id: str = None, keep_alive: bool = False) -> dict:
+    """
+    Startet einen Worker im aktuellen Prozess.
+    """
+    config = Config()
+    config.initialize_logger()
+    return CrawlWorker(config=config, worker_id=worker_id).run(keep_alive=keep_alive)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Quellen aus urls.json in die Warteschlange legen")
+    enqueue.add_argument("--articles", type=int, default=None, help="Artikel pro Quelle (Standard: alle)")
+    enqueue.add_argument("--reset", action="store_true", help="Aufgaben früherer Crawls entfernen")
+
+    worker = commands.add_parser("worker", help="Aufgaben bearbeiten, bis die Warteschlange leer ist")
+    worker.add_argument("--worker-id", default=None)
+    worker.add_argument("--processes", type=int, default=1, help="Anzahl Worker-Prozesse auf diesem Rechner")
+    worker.add_argument("--keep-alive", action="store_true", help="auf neue Aufgaben warten")
+
+    commands.add_parser("status", help="Anzahl der Aufgaben pro Zustand")
+    args = parser.parse_args()
+
+    config = Config()
+    if args.command == "enqueue":
+        config.initialize_logger()
+        main_urls_list = FileHandler(config=config).load_sources_from_json()
+        CrawlCoordinator(config=config).enqueue(main_urls_list, n_articles=args.articles, reset=args.reset)
+    elif args.command == "status":
+        print(open_task_queue(config).stats())
+    elif args.processes == 1:
+        run_worker(args.worker_id, args.keep_alive)
+    else:
+        # "spawn" wie in der ArticlePipeline, jeder Prozess ist ein eigenständiger Worker
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=run_worker,
+                args=(f"{args.worker_id}-{index}" if args.worker_id else None, args.keep_alive),
+            )
+            for index in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
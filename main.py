@@ -1,51 +1,103 @@
+from contextlib import nullcontext
+
+from src.parser.crawl_orchestrator import CrawlOrchestrator
 from src.parser.generic_html_parser import DynamicPageHandler
 from src.parser.html_parser import HtmlParser
 from src.utils.file_manager import FileHandler
 from config import Config
 
 
-def run():
+def run(config: Config = None, n_articles: int = 5):
     """
     Hauptfunktion, die den Web-Scraping-Prozess steuert.
 
     Liest Konfigurationsdaten, extrahiert URLs, verarbeitet dynamische Seiten,
-    extrahiert Artikel und Tabellen und exportiert die Ergebnisse in CSV-Dateien.
+    extrahiert Artikel und Tabellen und schreibt die Ergebnisse fortlaufend in Dateien
+    (Format aus Config.export_format). Mit Config.dataflow_enabled durchläuft jede Seite
+    sofort alle Stufen (CrawlOrchestrator), sonst wird Stufe für Stufe verarbeitet.
+
+    Mit Config.checkpoint_enabled wird ein abgebrochener Lauf beim nächsten Aufruf
+    fortgesetzt: Abgeschlossene Quellen, Tabellen und Artikel werden nicht erneut abgerufen.
+
+    Args:
+        config (Config): Optionale Konfiguration, z. B. für die Benchmarks unter benchmarks/.
+        n_articles (int): Die Anzahl der Artikel, die pro Quelle extrahiert werden sollen.
     """
     # Initialisierung der Config Klasse
-    config = Config()
+    config = config or Config()
     config.initialize_logger()
 
-    # Initialisierung der Handler für Dateioperationen und HTML-Verarbeitung
+    # Konfigurationsdaten aus JSON einlesen und prüfen, Fehler brechen vor dem ersten Abruf ab
     file_handler = FileHandler(config=config)
-    dynamic_page_handler = DynamicPageHandler(config=config)
-    html_handler = HtmlParser(config=config)
+    main_urls_list = file_handler.load_sources_from_json()
+
+    # Fortschritt eines abgebrochenen Laufs übernehmen, Ausgabedateien werden fortgesetzt
+    checkpoint = file_handler.open_checkpoint(main_urls_list)
+    run_id = checkpoint.run_id if checkpoint else None
 
-    # Konfigurationsdaten aus JSON einlesen
-    main_urls_list = file_handler.create_main_url_dict_from_json()
+    # Der Checkpoint wird auch nach einem Fehler geschrieben, abgeschlossen wird der Lauf
+    # nur ohne Fehler, sonst setzt ihn der nächste Start fort
+    with checkpoint or nullcontext():
+        # Initialisierung der Handler für die HTML-Verarbeitung
+        html_handler = HtmlParser(config=config)
+        dynamic_page_handler = DynamicPageHandler(config=config, fetcher=html_handler.fetcher)
 
-    # Verarbeitung von paginierten URLs
-    paginated_urls = dynamic_page_handler.get_paginated_links(
-        main_urls_list=main_urls_list
-    )
+        # Laufzeit pro Stufe und Messwerte der Abrufe (nur mit Config.metrics_enabled)
+        metrics = html_handler.metrics
 
-    # Extrahieren von Links von den Haupt-URLs
-    final_urls_list = html_handler.get_links_from_main_urls(
-        main_urls_list=paginated_urls
-    )
+        if config.dataflow_enabled:
+            # Jede Seite durchläuft sofort alle Stufen, Ergebnisse werden fortlaufend geschrieben
+            orchestrator = CrawlOrchestrator(
+                config=config, html_parser=html_handler, dynamic_page_handler=dynamic_page_handler
+            )
+            # Die Browser werden auch nach einem Fehler in einer Stufe beendet
+            with (
+                dynamic_page_handler,
+                file_handler.open_result_sink(run_id=run_id) as sink,
+                metrics.stage("dataflow"),
+            ):
+                orchestrator.run(
+                    main_urls_list=main_urls_list, n_articles=n_articles, sink=sink, checkpoint=checkpoint
+                )
+            metrics.add_section("browser_pool", dynamic_page_handler.browser_pool.get_timing_stats())
+        else:
+            # Verarbeitung von paginierten URLs, Browser werden danach nicht mehr benötigt
+            with dynamic_page_handler, metrics.stage("pagination"):
+                paginated_urls = dynamic_page_handler.get_paginated_links(
+                    main_urls_list=main_urls_list
+                )
+            metrics.add_section("browser_pool", dynamic_page_handler.browser_pool.get_timing_stats())
 
-    # Extrahieren von Artikeln mit Newspaper3K
-    articles_list = html_handler.get_articles_with_newspaper(
-        main_urls_list=final_urls_list, n_articles=5
-    )
+            # Extrahieren von Links von den Haupt-URLs
+            with metrics.stage("links"):
+                final_urls_list = html_handler.get_links_from_main_urls(
+                    main_urls_list=paginated_urls
+                )
+            if checkpoint:
+                # Seiten und Sublinks müssen bei einer Fortsetzung nicht erneut abgerufen werden
+                for source in final_urls_list:
+                    if source.sublinks is not None:
+                        checkpoint.record_source(source)
 
-    # Extrahieren von Tabelleninhalten von Webseiten
-    table_content = html_handler.get_tables_from_html(main_urls_list=main_urls_list)
+            # Artikel und Tabellen werden direkt bei ihrer Extraktion pro Quelle in Dateien
+            # geschrieben, statt sie bis zum Ende im Speicher zu sammeln
+            with file_handler.open_result_sink(run_id=run_id) as sink:
+                # Extrahieren von Tabelleninhalten von Webseiten
+                with metrics.stage("tables"):
+                    html_handler.get_tables_from_html(
+                        main_urls_list=main_urls_list, sink=sink, checkpoint=checkpoint
+                    )
 
-    # Kombinieren der Ergebnisse aus Artikeln und Tabellen
-    result_list = table_content + articles_list
+                # Extrahieren von Artikeln mit Newspaper3K
+                with metrics.stage("articles"):
+                    html_handler.get_articles_with_newspaper(
+                        main_urls_list=final_urls_list, n_articles=n_articles, sink=sink, checkpoint=checkpoint
+                    )
 
-    # Ausgabe der Ergebnisse und Export in CSV-Dateien
-    file_handler.export_collection_to_csv(output_df_list=result_list)
+    metrics.add_section("throttled_seconds", html_handler.fetcher.rate_limiter.get_throttle_stats())
+    metrics.add_section("host_health", html_handler.fetcher.host_health.get_health_stats())
+    html_handler.fetcher.host_health.log_summary()
+    metrics.write_report()
 
 
 if __name__ == "__main__":
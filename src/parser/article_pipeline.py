@@ -0,0 +1,334 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+import newspaper
+from loguru import logger
+from newspaper import Article
+
+from config import Config
+from src.parser.checkpoint import CheckpointStore
+from src.parser.source_spec import SourcePlan
+from src.utils.async_fetcher import AsyncFetcher, FetchResult
+from src.utils.host_health import is_host_failure
+from src.utils.near_duplicates import NearDuplicateIndex
+from src.utils.result_sink import ResultSink
+from src.utils.seen_store import SeenArticleStore
+
+
+def parse_article(name: str, link: str, html: str) -> dict | None:
+    """
+    Parst einen bereits heruntergeladenen Artikel mit Newspaper3K. Läuft in einem
+    Worker-Prozess und bekommt deshalb nur einfache, picklebare Werte übergeben.
+
+    Args:
+        name (str): Der Name der Quelle.
+        link (str): Die URL des Artikels.
+        html (str): Der HTML-Inhalt der Seite.
+
+    Returns:
+        dict | None: Die Artikelinformationen oder None, falls kein Artikel gefunden wurde.
+    """
+    try:
+        article = Article(link)
+        article.download(input_html=html)
+        article.parse()
+
+        # Erstellen eines Dictionaries mit Artikelinformationen
+        article_dict = {
+            "name": name,
+            "article_link": link,
+            "title": article.title,
+            "date": article.publish_date,
+            "article": article.text,
+            "tags": (
+                "#" + " #".join(article.tags) if article.tags else ""
+            ),
+        }
+    except (Exception, newspaper.ArticleException) as err:
+        logger.error(
+            f"Something went wrong while parsing {link} - Error: {err}"
+        )
+        return None
+
+    # Überprüfen, ob der Artikelinhalt gefunden wurde
+    return article_dict if article_dict.get("article") else None
+
+
+def parse_article_timed(name: str, link: str, html: str) -> Tuple[dict | None, float]:
+    """
+    Wie parse_article, gibt zusätzlich die Parse-Dauer im Worker-Prozess in Sekunden zurück
+    (ohne die Wartezeit in der Warteschlange des Pools).
+    """
+    start = time.perf_counter()
+    return parse_article(name, link, html), time.perf_counter() - start
+
+
+@dataclass
+class SourceState:
+    """
+    Fortschritt einer Quelle in der ArticlePipeline.
+
+    Attributes:
+        source (SourcePlan): Die Quelle.
+        links (List[str]): Die noch nicht heruntergeladenen Links.
+        articles (List[dict]): Die bereits extrahierten Artikel (leer, wenn in einen ResultSink
+            geschrieben wird).
+        n_found (int): Anzahl der bisher extrahierten Artikel.
+        in_flight (int): Anzahl der Links, die gerade heruntergeladen oder geparst werden.
+    """
+
+    source: SourcePlan
+    links: List[str]
+    articles: List[dict] = field(default_factory=list)
+    n_found: int = 0
+    in_flight: int = 0
+
+    def n_missing(self, n_articles: int | None) -> int:
+        """
+        Anzahl der Links, die noch gestartet werden sollen. Laufende Links werden
+        optimistisch als Treffer gezählt, schlagen sie fehl, wird nachgeladen.
+        """
+        if not n_articles:
+            return len(self.links)
+        return max(0, n_articles - self.n_found - self.in_flight)
+
+
+class ArticlePipeline:
+    """
+    Zweistufige Pipeline für Artikel: Der Download läuft über den AsyncFetcher, das Parsen
+    mit Newspaper3K in einem ProcessPoolExecutor mit Config.parse_workers Prozessen. Jeder
+    heruntergeladene Artikel wird sofort zum Parsen übergeben, sodass Netzwerk und CPU
+    gleichzeitig ausgelastet sind.
+
+    Zwischen den Stufen liegen höchstens Config.parse_queue_size Artikel (heruntergeladen
+    oder im Download, aber noch nicht geparst). Alle Downloads laufen über eine gemeinsame
+    Session des AsyncFetchers, sobald ein Artikel fertig ist, werden seine Ergebnisse
+    abgeholt und der nächste Download gestartet.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        fetcher (AsyncFetcher): Der Fetcher für die Downloads.
+        seen_store (SeenArticleStore | None): Speicher für den inkrementellen Crawl.
+        near_duplicates (NearDuplicateIndex | None): Index zum Erkennen von Beinahe-Duplikaten.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        fetcher: AsyncFetcher,
+        seen_store: SeenArticleStore = None,
+        near_duplicates: NearDuplicateIndex = None,
+    ):
+        """
+        Initialisiert die ArticlePipeline-Instanz.
+        """
+        self.config = config
+        self.fetcher = fetcher
+        self.seen_store = seen_store
+        self.near_duplicates = near_duplicates
+
+    def create_executor(self) -> Executor:
+        """
+        Erstellt den Pool für die Parse-Stufe. Mit parse_workers = 0 wird in einem einzelnen
+        Thread geparst (ohne Prozessstart, z. B. zum Debuggen).
+        """
+        if self.config.parse_workers == 0:
+            return ThreadPoolExecutor(max_workers=1)
+        # "spawn", da der Hauptprozess bereits Threads (Fetcher, Logger) laufen hat
+        return ProcessPoolExecutor(
+            max_workers=self.config.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def run(
+        self,
+        states: List[SourceState],
+        n_articles: int = None,
+        sink: ResultSink = None,
+        checkpoint: CheckpointStore = None,
+    ) -> None:
+        """
+        Lädt und parst die Artikel aller Quellen. Die Ergebnisse landen in state.articles oder,
+        falls ein ResultSink übergeben wird, direkt in dessen Ausgabedateien.
+
+        Args:
+            states (List[SourceState]): Die Quellen mit ihren Links.
+            n_articles (int): Die Anzahl der Artikel, die pro Quelle extrahiert werden sollen.
+            sink (ResultSink): Optionaler Sink, in den jeder Artikel sofort geschrieben wird.
+            checkpoint (CheckpointStore): Optionaler Checkpoint, der Links ohne Ergebnis vermerkt.
+        """
+        with self.create_executor() as executor:
+            asyncio.run(self._run(states, n_articles, sink, checkpoint, executor))
+
+    async def _run(
+        self,
+        states: List[SourceState],
+        n_articles: int | None,
+        sink: ResultSink | None,
+        checkpoint: CheckpointStore | None,
+        executor: Executor,
+    ) -> None:
+        """
+        Hält bis zu Config.parse_queue_size Artikel gleichzeitig in Download und Parse-Stufe.
+        Sobald ein Artikel fertig ist, werden seine Ergebnisse abgeholt und neue Downloads
+        gestartet, alle über dieselbe Session des AsyncFetchers.
+        """
+        in_flight: Set[asyncio.Task] = set()
+
+        async with self.fetcher.session() as fetch:
+            while True:
+                free_slots = self.config.parse_queue_size - len(in_flight)
+                for state in states:
+                    n_links = min(state.n_missing(n_articles), free_slots)
+                    if n_links <= 0:
+                        continue
+                    for link in state.links[:n_links]:
+                        in_flight.add(
+                            asyncio.create_task(self._process(fetch, executor, state, link, checkpoint))
+                        )
+                    del state.links[:n_links]
+                    state.in_flight += n_links
+                    free_slots -= n_links
+
+                if not in_flight:
+                    break
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                self._collect([task.result() for task in done], n_articles, sink, checkpoint)
+
+    async def _process(
+        self,
+        fetch: Callable[[str, bool], Awaitable[FetchResult | None]],
+        executor: Executor,
+        state: SourceState,
+        link: str,
+        checkpoint: CheckpointStore | None,
+    ) -> Tuple[SourceState, str, FetchResult | None, Future | None]:
+        """
+        Lädt einen Artikel herunter und wartet auf dessen Parse-Auftrag.
+
+        Returns:
+            Tuple: Quelle, Link, Download und das fertige Future des Parse-Auftrags
+            (None, falls nichts zu parsen war).
+        """
+        logger.info(f"downloading article : {link}")
+        result = await fetch(link, throttle=True)
+        future = self._submit(executor, state, link, result, checkpoint)
+        if future:
+            # Fehler des Parsers wertet _collect über future.result() aus
+            await asyncio.wait([asyncio.wrap_future(future)])
+        return state, link, result, future
+
+    def _submit(
+        self,
+        executor: Executor,
+        state: SourceState,
+        link: str,
+        result: FetchResult | None,
+        checkpoint: CheckpointStore | None,
+    ) -> Future | None:
+        """
+        Übergibt einen heruntergeladenen Artikel an die Parse-Stufe. Links, die endgültig
+        ohne Ergebnis bleiben (z. B. 404), werden im Checkpoint vermerkt, Fehler des Hosts
+        werden bei einer Fortsetzung erneut versucht.
+
+        Returns:
+            Future | None: Das Future des Parse-Auftrags oder None, falls nichts zu parsen ist.
+        """
+        if result is None or not result.ok:
+            status_code = result.status_code if result else None
+            logger.error(f"article could not be downloaded {link} - status code -> {status_code}")
+            if checkpoint and not is_host_failure(status_code):
+                checkpoint.record_link(state.source.name, link)
+            return None
+
+        if self.seen_store and self.seen_store.is_unchanged_body(link, result.content):
+            logger.info(f"article unchanged since last run : {link}")
+            if checkpoint:
+                checkpoint.record_link(state.source.name, link)
+            return None
+
+        try:
+            return executor.submit(parse_article_timed, state.source.name, link, result.text)
+        except RuntimeError as err:
+            # z. B. BrokenProcessPool, wenn ein Worker-Prozess abgestürzt ist
+            logger.error(f"article could not be passed to the parser {link} - Error: {err}")
+            return None
+
+    def _collect(
+        self,
+        done: List[Tuple[SourceState, str, FetchResult | None, Future | None]],
+        n_articles: int | None,
+        sink: ResultSink | None,
+        checkpoint: CheckpointStore | None,
+    ) -> None:
+        """
+        Wertet fertige Artikel aus und ordnet sie ihren Quellen zu.
+
+        Args:
+            done (List[Tuple]): Die fertigen Artikel aus _process.
+            n_articles (int | None): Die gewünschte Anzahl Artikel pro Quelle.
+            sink (ResultSink | None): Optionaler Sink für die Artikel.
+            checkpoint (CheckpointStore | None): Optionaler Checkpoint für Links ohne Ergebnis.
+        """
+        accepted = []
+        for state, link, result, future in done:
+            state.in_flight -= 1
+            if future is None:
+                continue
+            try:
+                article_dict, parse_seconds = future.result()
+            except Exception as err:
+                logger.error(f"Something went wrong while parsing {link} - Error: {err}")
+                continue
+            self.fetcher.metrics.record_parse("articles", parse_seconds)
+
+            if not article_dict:
+                logger.warning("article not found!")
+                if checkpoint:
+                    checkpoint.record_link(state.source.name, link)
+                continue
+            # Die Obergrenze greift vor Seen-Store und Duplikat-Index, damit dort nur Artikel
+            # landen, die auch geschrieben werden
+            if n_articles and state.n_found >= n_articles:
+                continue
+            if self.seen_store and self.seen_store.is_unchanged_text(link, article_dict["article"]):
+                logger.info(f"article text unchanged since last run : {link}")
+                if checkpoint:
+                    checkpoint.record_link(state.source.name, link)
+                continue
+            state.n_found += 1
+            accepted.append((state, (link, result.content, article_dict["article"]), article_dict))
+
+        if self.near_duplicates and accepted:
+            # Fingerabdrücke für alle fertigen Artikel in einem Durchlauf
+            kept = self.near_duplicates.filter([article_dict for _, _, article_dict in accepted])
+            kept_ids = {id(article_dict) for article_dict in kept}
+            for state, _, article_dict in accepted:
+                if id(article_dict) not in kept_ids:
+                    state.n_found -= 1
+                    if checkpoint:
+                        checkpoint.record_link(state.source.name, article_dict["article_link"])
+            accepted = [item for item in accepted if id(item[2]) in kept_ids]
+
+        by_source: Dict[int, Tuple[SourceState, List[tuple], List[dict]]] = {}
+        for state, seen_record, article_dict in accepted:
+            self.fetcher.metrics.incr("articles_extracted")
+            logger.success("downloading successful! article added to list")
+            _, seen_records, articles = by_source.setdefault(id(state), (state, [], []))
+            seen_records.append(seen_record)
+            articles.append(article_dict)
+
+        for state, seen_records, articles in by_source.values():
+            mark_seen = partial(self.seen_store.mark_seen, seen_records) if self.seen_store else None
+            if sink:
+                # Als gesehen gelten die Artikel erst, wenn der Sink sie geschrieben hat
+                sink.write(state.source.name, articles, on_written=mark_seen)
+            else:
+                state.articles += articles
+                if mark_seen:
+                    mark_seen()
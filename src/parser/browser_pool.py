@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
+
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config import Config
+
+
+@lru_cache(maxsize=1)
+def resolve_chromedriver_path() -> str:
+    """
+    Ermittelt den Pfad zum ChromeDriver einmal pro Prozess. ChromeDriverManager prüft sonst
+    bei jedem Start die installierte Chrome-Version und ggf. die Download-Quelle.
+    """
+    start = time.perf_counter()
+    driver_path = ChromeDriverManager().install()
+    logger.info(f"chromedriver resolved in {time.perf_counter() - start:.2f} s -> {driver_path}")
+    return driver_path
+
+
+@dataclass
+class PooledDriver:
+    """
+    Ein WebDriver aus dem BrowserPool mit Nutzungsstatistik.
+
+    Attributes:
+        driver (webdriver.Chrome): Die Browser-Instanz.
+        pages_served (int): Anzahl der geladenen Seiten seit dem Start.
+        started_at (float): Startzeitpunkt (time.monotonic).
+    """
+
+    driver: webdriver.Chrome
+    pages_served: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """
+    Pool wiederverwendbarer Chrome-Instanzen. Browser werden erst bei Bedarf gestartet,
+    vor der Ausgabe auf Funktionsfähigkeit geprüft und nach Config.browser_max_pages Seiten
+    oder nach einem Absturz durch neue ersetzt.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        startup_seconds (float): Summierte Zeit für das Starten von Browsern.
+        page_seconds (float): Summierte Zeit, in der Browser ausgeliehen waren (Seitenarbeit,
+            ohne Browserstarts).
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die BrowserPool-Instanz, ohne bereits Browser zu starten.
+        """
+        self.config = config
+        self.startup_seconds = 0.0
+        self.page_seconds = 0.0
+        self._idle: queue.Queue = queue.Queue()
+        self._n_drivers = 0
+        self._lock = threading.Lock()
+
+    def _start_driver(self) -> PooledDriver:
+        """
+        Startet eine neue Chrome-Instanz mit den Optionen aus der Config.
+        """
+        options = webdriver.ChromeOptions()
+        # Headless ist ein Ausführungsmodus für Firefox- und Chromium-basierte Browser.
+        # was bedeutet, dass das Browserfenster nicht sichtbar ist.
+        if self.config.start_headless:
+            options.add_argument("--headless")
+
+        start = time.perf_counter()
+        driver = webdriver.Chrome(
+            service=ChromeService(resolve_chromedriver_path()),
+            options=options,
+        )
+        driver.set_page_load_timeout(self.config.browser_page_load_timeout)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.startup_seconds += elapsed
+        logger.info(f"browser started in {elapsed:.2f} s")
+        return PooledDriver(driver=driver)
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            # Jeder Befehl an einen abgestürzten Browser löst eine WebDriverException aus
+            _ = pooled.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        with self._lock:
+            self._n_drivers -= 1
+        try:
+            pooled.driver.quit()
+        except WebDriverException as err:
+            logger.warning(f"browser could not be closed cleanly {err}")
+
+    @contextmanager
+    def acquire(self) -> Iterator[PooledDriver]:
+        """
+        Leiht einen Browser aus dem Pool aus. Ist keiner frei und der Pool noch nicht voll,
+        wird ein neuer gestartet, sonst wird auf einen freien Browser gewartet.
+
+        Tritt innerhalb des with-Blocks eine WebDriverException auf, wird der Browser
+        verworfen statt in den Pool zurückgelegt.
+
+        Yields:
+            PooledDriver: Der ausgeliehene Browser.
+        """
+        pooled = self._get_driver()
+        borrowed_at = time.perf_counter()
+        try:
+            yield pooled
+        except WebDriverException:
+            self._discard(pooled)
+            raise
+        except Exception:
+            self._release(pooled)
+            raise
+        else:
+            self._release(pooled)
+        finally:
+            with self._lock:
+                self.page_seconds += time.perf_counter() - borrowed_at
+
+    def _release(self, pooled: PooledDriver) -> None:
+        """
+        Legt einen Browser zurück in den Pool oder ersetzt ihn nach Config.browser_max_pages Seiten.
+        """
+        if pooled.pages_served >= self.config.browser_max_pages:
+            logger.info(f"recycling browser after {pooled.pages_served} pages")
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def _get_driver(self) -> PooledDriver:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_start = self._n_drivers < self.config.browser_pool_size
+                    if can_start:
+                        # Platz reservieren, bevor der (langsame) Start beginnt
+                        self._n_drivers += 1
+                if not can_start:
+                    try:
+                        # Mit Timeout, damit verworfene Browser den Platz wieder freigeben
+                        pooled = self._idle.get(timeout=1)
+                    except queue.Empty:
+                        continue
+                else:
+                    try:
+                        return self._start_driver()
+                    except Exception:
+                        with self._lock:
+                            self._n_drivers -= 1
+                        raise
+
+            if self._is_healthy(pooled):
+                return pooled
+            logger.warning("browser is not responding anymore, starting a new one")
+            self._discard(pooled)
+
+    def get_timing_stats(self) -> dict:
+        """
+        Gibt die Zeit für Browserstarts und für die eigentliche Seitenarbeit zurück.
+        """
+        with self._lock:
+            return {
+                "browser_startup_seconds": round(self.startup_seconds, 2),
+                "page_work_seconds": round(self.page_seconds, 2),
+            }
+
+    def close(self) -> None:
+        """
+        Beendet alle Browser des Pools.
+        """
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        logger.info(f"browser pool closed - {self.get_timing_stats()}")
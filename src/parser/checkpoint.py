@@ -0,0 +1,266 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from loguru import logger
+
+from config import Config
+from src.parser.source_spec import SourcePlan, SourceSpec
+
+
+def _hash(data) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def sources_hash(sources: List[SourcePlan]) -> str:
+    """
+    Fingerabdruck der Quellen-Konfiguration. Ein Lauf wird nur mit denselben Quellen fortgesetzt.
+    """
+    return _hash([source.spec.to_dict() for source in sources])
+
+
+class CheckpointStore:
+    """
+    Append-only Protokoll des Fortschritts eines Laufs, damit ein abgebrochener Lauf dort
+    fortgesetzt wird, wo er stehen geblieben ist, ohne Seiten erneut abzurufen. Pro Lauf
+    entsteht eine Datei "<run_id>.jsonl" unter Config.checkpoint_path mit einem Ereignis pro Zeile:
+
+        "run":      Start bzw. Fortsetzung des Laufs (mit dem Fingerabdruck der Quellen)
+        "source":   Die Paginierung einer Quelle ist abgeschlossen, mit allen Seiten und,
+                    falls schon extrahiert, allen Sublinks
+        "tables":   Die Tabellen einer Quelle sind geschrieben
+        "link":     Ein Artikel-Link ist ohne Ergebnis abgeschlossen (z. B. 404, kein Artikel,
+                    Duplikat). Geschriebene Artikel erkennt der ResultSink an seinen Dateien.
+        "finished": Der Lauf ist vollständig
+
+    Link-Ereignisse werden gepuffert und blockweise angehängt (Config.checkpoint_flush_records
+    bzw. Config.checkpoint_flush_interval), die seltenen übrigen Ereignisse sofort. Eine beim
+    Abbruch nur halb geschriebene letzte Zeile wird beim Einlesen übersprungen.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        run_id (str): Kennung des Laufs, dieselbe wie im ResultSink.
+        path (Path): Pfad der Checkpoint-Datei.
+    """
+
+    def __init__(self, config: Config, run_id: str, sources: List[SourcePlan]):
+        """
+        Initialisiert die CheckpointStore-Instanz, liest den bisherigen Fortschritt des Laufs
+        ein und vermerkt den (erneuten) Start.
+        """
+        self.config = config
+        self.run_id = run_id
+        self.path = Path(config.checkpoint_path).joinpath(f"{run_id}.jsonl")
+
+        self._sources: Dict[str, dict] = {}
+        self._tables: set = set()
+        self._links: Dict[str, set] = defaultdict(set)
+        if self.path.exists():
+            self._replay(self._read_events(self.path))
+
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding=config.encoding)
+        if self._file.tell() and not self.path.read_bytes().endswith(b"\n"):
+            # Die halb geschriebene letzte Zeile abschließen, statt das nächste Ereignis anzuhängen
+            self._file.write("\n")
+        self._append(
+            {"event": "run", "sources": sources_hash(sources), "started_at": time.time()}, flush=True
+        )
+
+    @classmethod
+    def open(cls, config: Config, sources: List[SourcePlan]) -> "CheckpointStore":
+        """
+        Öffnet den Checkpoint eines Laufs und übernimmt den gespeicherten Fortschritt in die
+        Quellen. Mit Config.result_run_id wird dieser Lauf verwendet, sonst der zuletzt
+        gestartete Lauf, falls er nicht abgeschlossen wurde, dieselben Quellen hat und nicht
+        älter als Config.checkpoint_max_age ist, und andernfalls ein neuer Lauf.
+
+        Args:
+            config (Config): Eine Instanz der Konfigurationsklasse.
+            sources (List[SourcePlan]): Die Quellen aus urls.json.
+
+        Returns:
+            CheckpointStore: Der Checkpoint, run_id ist an den ResultSink weiterzugeben.
+        """
+        run_id = (
+            config.result_run_id
+            or cls._find_unfinished(config, sources_hash(sources))
+            or cls._new_run_id(config)
+        )
+        store = cls(config=config, run_id=run_id, sources=sources)
+        store.restore(sources)
+        return store
+
+    @classmethod
+    def _find_unfinished(cls, config: Config, expected_hash: str) -> str | None:
+        paths = sorted(Path(config.checkpoint_path).glob("*.jsonl"), key=lambda path: path.stat().st_mtime)
+        if not paths:
+            return None
+        age = time.time() - paths[-1].stat().st_mtime
+        if config.checkpoint_max_age is not None and age > config.checkpoint_max_age:
+            logger.info(f"last run {paths[-1].stem} is {age / 3600:.1f} h old, starting a new run")
+            return None
+        events = cls._read_events(paths[-1])
+        if not events or events[-1].get("event") == "finished":
+            return None
+        runs = [event for event in events if event.get("event") == "run"]
+        if not runs or runs[-1].get("sources") != expected_hash:
+            logger.warning(f"run {paths[-1].stem} was not finished but its sources changed, starting a new run")
+            return None
+        logger.info(f"resuming unfinished run {paths[-1].stem}")
+        return paths[-1].stem
+
+    @staticmethod
+    def _new_run_id(config: Config) -> str:
+        run_id = datetime.datetime.now().strftime("%Y_%m_%d_%H%M%S")
+        # Ein neuer Lauf darf keinen vorhandenen Lauf derselben Sekunde fortsetzen
+        n = 1
+        while Path(config.checkpoint_path).joinpath(f"{run_id}.jsonl").exists():
+            run_id = f"{run_id.split('-')[0]}-{n}"
+            n += 1
+        return run_id
+
+    @staticmethod
+    def _read_events(path: Path) -> List[dict]:
+        events = []
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"skipping incomplete checkpoint line in {path.name}")
+        return events
+
+    def _replay(self, events: List[dict]) -> None:
+        for event in events:
+            kind = event.get("event")
+            if kind == "source":
+                self._sources[event["name"]] = event
+            elif kind == "tables":
+                self._tables.add(event["name"])
+            elif kind == "link":
+                self._links[event["name"]].add(event["url"])
+            elif kind == "finished":
+                # Ein abgeschlossener Lauf mit fester run_id beginnt von vorn
+                self._sources.clear()
+                self._tables.clear()
+                self._links.clear()
+
+    @staticmethod
+    def _spec_hash(spec: SourceSpec) -> str:
+        return _hash(spec.to_dict())
+
+    def restore(self, sources: List[SourcePlan]) -> None:
+        """
+        Übernimmt Seiten und Sublinks abgeschlossener Quellen. Diese Quellen werden nicht
+        erneut paginiert (pagination_strategy None), mit Sublinks auch nicht erneut ausgewertet.
+        Quellen, deren Konfiguration sich geändert hat, beginnen von vorn.
+        """
+        n_restored = 0
+        for source in sources:
+            event = self._sources.get(source.name)
+            if not event or event["spec"] != self._spec_hash(source.spec):
+                continue
+            source.pages = list(event["pages"])
+            source.sublinks = list(event["sublinks"]) if event["sublinks"] is not None else None
+            source.pagination_strategy = None
+            n_restored += 1
+        if n_restored or self._links or self._tables:
+            logger.info(
+                f"checkpoint {self.run_id}: {n_restored} sources, {len(self._tables)} table pages "
+                f"and {sum(map(len, self._links.values()))} finished links restored"
+            )
+
+    def record_source(self, source: SourcePlan) -> None:
+        """
+        Vermerkt eine Quelle, deren Paginierung abgeschlossen ist, mit source.pages und
+        source.sublinks.
+        """
+        if source.name in self._sources:
+            return
+        event = {
+            "event": "source",
+            "name": source.name,
+            "spec": self._spec_hash(source.spec),
+            "pages": source.pages,
+            "sublinks": source.sublinks,
+        }
+        self._sources[source.name] = event
+        self._append(event, flush=True)
+
+    def tables_done(self, name: str) -> bool:
+        return name in self._tables
+
+    def record_tables(self, name: str) -> None:
+        """
+        Vermerkt eine Quelle, deren Tabellen vollständig geschrieben sind.
+        """
+        self._tables.add(name)
+        self._append({"event": "tables", "name": name}, flush=True)
+
+    def done_links(self, name: str) -> set:
+        """
+        Die Links einer Quelle, die ohne Ergebnis abgeschlossen sind und nicht erneut geladen werden.
+        """
+        return self._links[name]
+
+    def record_link(self, name: str, link: str) -> None:
+        """
+        Vermerkt einen Artikel-Link, der ohne Ergebnis abgeschlossen ist (gepuffert).
+        """
+        self._links[name].add(link)
+        self._append({"event": "link", "name": name, "url": link})
+
+    def _append(self, event: dict, flush: bool = False) -> None:
+        with self._lock:
+            self._buffer.append(json.dumps(event, ensure_ascii=False))
+            if (
+                flush
+                or len(self._buffer) >= self.config.checkpoint_flush_records
+                or time.monotonic() - self._last_flush >= self.config.checkpoint_flush_interval
+            ):
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            # Ein Schreibzugriff und ein fsync pro Block statt pro Ereignis
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self, finished: bool = False) -> None:
+        """
+        Schreibt die gepufferten Ereignisse und schließt die Datei.
+
+        Args:
+            finished (bool): Vermerkt den Lauf als abgeschlossen, der nächste Start beginnt
+                dann einen neuen Lauf.
+        """
+        if finished:
+            self._append({"event": "finished", "finished_at": time.time()})
+        self.flush()
+        self._file.close()
+        if finished:
+            logger.success(f"run {self.run_id} finished, checkpoint closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # Nach einem Fehler bleibt der Lauf offen und wird beim nächsten Start fortgesetzt
+        self.close(finished=exc_type is None)
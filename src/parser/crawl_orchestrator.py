@@ -0,0 +1,568 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Dict, List
+from urllib.parse import urlsplit
+
+import pandas as pd
+from loguru import logger
+
+from config import Config
+from src.parser.article_pipeline import parse_article_timed
+from src.parser.checkpoint import CheckpointStore
+from src.parser.generic_html_parser import DynamicPageHandler
+from src.parser.html_parser import HtmlParser
+from src.parser.source_spec import SourcePlan, configure_sources
+from src.utils.host_health import is_host_failure
+from src.utils.result_sink import ResultSink
+
+# Markiert das Ende einer Warteschlange
+DONE = None
+
+
+@dataclass
+class SourceFlow:
+    """
+    Fortschritt einer Quelle im CrawlOrchestrator.
+
+    Attributes:
+        source (SourcePlan): Die Quelle.
+        seen_links (set): Alle bisher gefundenen Links (Duplikate über Seiten hinweg).
+        domains (set): Domains, für die Rate-Limit und Cache-TTL der Quelle gesetzt sind.
+        articles (List[dict]): Die extrahierten Artikel (leer, wenn in einen ResultSink
+            geschrieben wird).
+        n_found (int): Anzahl der bisher extrahierten Artikel.
+        in_flight (int): Anzahl der Links, die gerade heruntergeladen oder geparst werden.
+        changed (asyncio.Condition | None): Signalisiert Änderungen an n_found und in_flight.
+    """
+
+    source: SourcePlan
+    seen_links: set = field(default_factory=set)
+    domains: set = field(default_factory=set)
+    articles: List[dict] = field(default_factory=list)
+    n_found: int = 0
+    in_flight: int = 0
+    changed: asyncio.Condition | None = None
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    def is_complete(self, n_articles: int | None) -> bool:
+        return bool(n_articles) and self.n_found >= n_articles
+
+    async def acquire(self, n_articles: int | None) -> bool:
+        """
+        Wartet, bis für die Quelle ein weiterer Download gestartet werden darf. Laufende Links
+        werden optimistisch als Treffer gezählt, schlagen sie fehl, wird nachgeladen.
+
+        Returns:
+            bool: False, falls die Quelle bereits genug Artikel hat.
+        """
+        async with self.changed:
+            await self.changed.wait_for(
+                lambda: not n_articles or self.n_found + self.in_flight < n_articles
+                or self.is_complete(n_articles)
+            )
+            if self.is_complete(n_articles):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def release(self, found: bool = False) -> None:
+        async with self.changed:
+            self.in_flight -= 1
+            self.n_found += found
+            self.changed.notify_all()
+
+
+class CrawlOrchestrator:
+    """
+    Datenfluss-Pipeline über alle Stufen: Jede Seite einer Quelle durchläuft Paginierung,
+    Link-Extraktion, Artikel-Download, Parsen und Export, sobald sie verfügbar ist, statt
+    dass jede Stufe auf das Ende der vorherigen für alle Quellen wartet. Tabellen laufen
+    von Beginn an parallel.
+
+    Alle Stufen laufen in einer Event-Loop und teilen sich die Abrufe des AsyncFetcher
+    (globales Limit und Limit pro Host). Zwischen den Stufen liegen Warteschlangen mit
+    höchstens Config.stage_queue_size Einträgen (Parse-Stufe: Config.parse_queue_size),
+    sodass eine langsame Stufe die vorherigen bremst. Die Anzahl der Worker pro Stufe
+    wird über Config.page_workers, Config.download_workers, Config.parse_workers und
+    Config.table_workers gesetzt. Geschrieben wird nur aus einer Export-Stufe.
+
+    Mit einem CheckpointStore werden abgeschlossene Paginierungen, Tabellen und Links ohne
+    Ergebnis vermerkt, bei einer Fortsetzung gehen die Sublinks wiederhergestellter Quellen
+    direkt in den Download.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        html_parser (HtmlParser): Liefert Fetcher, Extraktoren, Parse-Pool und Messwerte.
+        dynamic_page_handler (DynamicPageHandler): Paginierung per HTTP bzw. Browser.
+    """
+
+    def __init__(
+        self, config: Config, html_parser: HtmlParser, dynamic_page_handler: DynamicPageHandler
+    ):
+        """
+        Initialisiert die CrawlOrchestrator-Instanz.
+        """
+        self.config = config
+        self.html_parser = html_parser
+        self.dynamic_page_handler = dynamic_page_handler
+        self.fetcher = html_parser.fetcher
+        self.metrics = html_parser.metrics
+        self.seen_store = html_parser.seen_store
+        self.near_duplicates = html_parser.near_duplicates
+
+        self._sink: ResultSink | None = None
+        self._checkpoint: CheckpointStore | None = None
+        self._started_at = 0.0
+        self._first_result_at: float | None = None
+        self._counts: Dict[str, int] = {}
+
+    def run(
+        self,
+        main_urls_list: List[SourcePlan],
+        n_articles: int = None,
+        sink: ResultSink = None,
+        checkpoint: CheckpointStore = None,
+    ) -> List:
+        """
+        Verarbeitet alle Quellen als Datenfluss.
+
+        Args:
+            main_urls_list (List[SourcePlan]): Die Quellen aus urls.json.
+            n_articles (int): Die Anzahl der Artikel, die pro Quelle extrahiert werden sollen.
+            sink (ResultSink): Optionaler Sink, in den Artikel und Tabellen direkt geschrieben
+                werden.
+            checkpoint (CheckpointStore): Optionaler Checkpoint des Laufs.
+
+        Returns:
+            List: Pandas DataFrames der Artikel pro Quelle und der Tabellen
+            (leer, wenn ein Sink übergeben wird).
+        """
+        self._sink = sink
+        self._checkpoint = checkpoint
+        self._started_at = time.perf_counter()
+        self._first_result_at = None
+        self._counts = dict.fromkeys(
+            ("pages", "links", "downloads", "parsed", "articles", "tables"), 0
+        )
+        configure_sources(self.fetcher, main_urls_list)
+
+        flows = [SourceFlow(source=source) for source in main_urls_list]
+        tables_list = asyncio.run(self._run(flows, n_articles, sink))
+
+        first_result = (
+            round(self._first_result_at - self._started_at, 4) if self._first_result_at else None
+        )
+        logger.info(f"dataflow finished, first result after {first_result} s -> {self._counts}")
+        self.metrics.add_section(
+            "dataflow", {"first_result_seconds": first_result, "items": dict(self._counts)}
+        )
+
+        if sink:
+            return []
+        return [
+            pd.DataFrame(flow.articles) for flow in flows if flow.source.spec.newspaper3K
+        ] + tables_list
+
+    async def _run(self, flows: List[SourceFlow], n_articles: int | None, sink: ResultSink | None) -> List:
+        page_queue = asyncio.Queue(self.config.stage_queue_size)
+        link_queue = asyncio.Queue(self.config.stage_queue_size)
+        table_queue = asyncio.Queue(self.config.stage_queue_size)
+        parse_queue = asyncio.Queue(self.config.parse_queue_size)
+        export_queue = asyncio.Queue(self.config.stage_queue_size)
+        tables_list = []
+        for flow in flows:
+            flow.changed = asyncio.Condition()
+
+        parse_workers = self.config.parse_workers
+        n_parse_workers = 1 if parse_workers == 0 else parse_workers or os.cpu_count()
+
+        with (
+            self.html_parser.article_pipeline.create_executor() as parse_executor,
+            ThreadPoolExecutor(max_workers=self.config.browser_pool_size) as browser_executor,
+        ):
+            async with self.fetcher.session() as fetch:
+
+                def start(n_workers: int, worker: Callable, *args) -> List[asyncio.Task]:
+                    return [asyncio.create_task(worker(*args)) for _ in range(max(1, n_workers))]
+
+                page_tasks = start(self.config.page_workers, self._page_worker, page_queue, link_queue, n_articles, fetch)
+                table_tasks = start(self.config.table_workers, self._table_worker, table_queue, export_queue, fetch)
+                download_tasks = start(self.config.download_workers, self._download_worker, link_queue, parse_queue, n_articles, fetch)
+                parse_tasks = start(n_parse_workers, self._parse_worker, parse_queue, export_queue, parse_executor)
+                export_task = asyncio.create_task(self._export(export_queue, n_articles, sink, tables_list))
+
+                async def produce() -> None:
+                    # Jede Stufe wird beendet, sobald alle Produzenten ihrer Warteschlange fertig sind
+                    await asyncio.gather(
+                        *(
+                            self._source(flow, page_queue, link_queue, table_queue, n_articles, fetch, browser_executor)
+                            for flow in flows
+                        )
+                    )
+                    await self._close(page_queue, page_tasks)
+                    await self._close(table_queue, table_tasks)
+                    await self._close(link_queue, download_tasks)
+                    await self._close(parse_queue, parse_tasks)
+                    await self._close(export_queue, [export_task])
+
+                await self._supervise(
+                    produce(), page_tasks + table_tasks + download_tasks + parse_tasks + [export_task]
+                )
+
+        return tables_list
+
+    @staticmethod
+    async def _supervise(main: Awaitable[None], workers: List[asyncio.Task]) -> None:
+        """
+        Wartet auf main und alle Worker. Endet ein Worker (oder main) mit einem Fehler, werden
+        alle übrigen abgebrochen und der Fehler weitergegeben, statt dass die anderen Stufen
+        an ihren begrenzten Warteschlangen für immer warten.
+        """
+        tasks = [asyncio.ensure_future(main), *workers]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        finally:
+            # Nach einem Fehler bzw. beim Abbruch des Laufs die übrigen Stufen beenden
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    async def _close(queue: asyncio.Queue, tasks: List[asyncio.Task]) -> None:
+        for _ in tasks:
+            await queue.put(DONE)
+        await asyncio.gather(*tasks)
+
+    def _mark_first_result(self) -> None:
+        if self._first_result_at is None:
+            self._first_result_at = time.perf_counter()
+            logger.info(
+                f"first result after {self._first_result_at - self._started_at:.2f} s"
+            )
+
+    async def _source(
+        self,
+        flow: SourceFlow,
+        page_queue: asyncio.Queue,
+        link_queue: asyncio.Queue,
+        table_queue: asyncio.Queue,
+        n_articles: int | None,
+        fetch: Callable,
+        browser_executor: ThreadPoolExecutor,
+    ) -> None:
+        """
+        Startet eine Quelle: Tabellen, Paginierung und Listenseiten.
+        """
+        source = flow.source
+        checkpoint = self._checkpoint
+        if source.spec.pandas and not (checkpoint and checkpoint.tables_done(source.name)):
+            await table_queue.put(flow)
+
+        link_discovery = self.dynamic_page_handler.link_discovery
+        if source.sublinks is None and source.spec.discovery and link_discovery:
+            if await link_discovery.discover(source, fetch) and checkpoint:
+                checkpoint.record_source(source)
+
+        if source.sublinks is not None:
+            # Aus Sitemaps/Feeds bzw. dem Checkpoint, Paginierung und Listenseiten entfallen
+            await self._emit_links(flow, source.sublinks, link_queue)
+            return
+
+        if source.needs_browser and self.dynamic_page_handler.strategy_probe:
+            await self.dynamic_page_handler.strategy_probe.probe(source, fetch)
+
+        if source.http_strategy:
+            # Die Sublinks jeder Seite gehen direkt in den Download
+            pages = self.dynamic_page_handler.http_paginator.iter_pages(source, fetch)
+            page_urls, sublinks = [], []
+            async for page_url, new_links in pages:
+                self._counts["pages"] += 1
+                page_urls.append(page_url)
+                sublinks += new_links
+                await self._emit_links(flow, new_links, link_queue)
+                if flow.is_complete(n_articles):
+                    logger.info(f"pagination stopped, enough articles for {flow.name}")
+                    break
+            else:
+                if checkpoint:
+                    # Nur vollständige Paginierungen, eine vorzeitig beendete wird fortgesetzt
+                    source.pages, source.sublinks = page_urls, sublinks
+                    checkpoint.record_source(source)
+            await pages.aclose()
+            return
+
+        if source.needs_browser:
+            # Selenium blockiert, daher in einem eigenen Thread pro Browser
+            page_urls = await asyncio.get_running_loop().run_in_executor(
+                browser_executor, self.dynamic_page_handler.paginate_with_browser, source
+            )
+            if page_urls is None:
+                page_urls = source.pages
+            elif checkpoint:
+                # Die Listenseiten werden bei einer Fortsetzung erneut gelesen, ohne Browser
+                checkpoint.record_source(source)
+        else:
+            page_urls = source.pages
+
+        if source.spec.bs4:
+            for page_url in page_urls:
+                await page_queue.put((flow, page_url))
+
+    async def _emit_links(self, flow: SourceFlow, links: List[str], link_queue: asyncio.Queue) -> None:
+        """
+        Übergibt die neuen Links einer Seite an den Download.
+        """
+        links = [link for link in links if link not in flow.seen_links]
+        flow.seen_links.update(links)
+        if not links or not flow.source.spec.newspaper3K:
+            return
+
+        # Rate-Limit und Cache-TTL der Quelle auch für neue Domains der Sublinks setzen
+        new_domains = {urlsplit(link).netloc: link for link in links}
+        new_domains = {domain: link for domain, link in new_domains.items() if domain not in flow.domains}
+        if new_domains:
+            flow.domains.update(new_domains)
+            flow.source.spec.configure_fetcher(self.fetcher, new_domains.values())
+
+        if self.seen_store:
+            links = self.seen_store.filter_unseen(
+                links, include_seen=self.config.incremental_recheck_seen
+            )
+        if self._sink:
+            # Beim Fortsetzen eines Laufs bereits geschriebene Artikel nicht erneut laden
+            written_keys = self._sink.written_keys(flow.name)
+            async with flow.changed:
+                flow.n_found += sum(link in written_keys for link in links)
+                flow.changed.notify_all()
+            links = [link for link in links if link not in written_keys]
+        if self._checkpoint:
+            done_links = self._checkpoint.done_links(flow.name)
+            links = [link for link in links if link not in done_links]
+
+        self._counts["links"] += len(links)
+        for link in links:
+            await link_queue.put((flow, link))
+
+    async def _page_worker(
+        self, page_queue: asyncio.Queue, link_queue: asyncio.Queue, n_articles: int | None, fetch: Callable
+    ) -> None:
+        """
+        Lädt Listenseiten und extrahiert ihre Sublinks.
+        """
+        loop = asyncio.get_running_loop()
+        while (item := await page_queue.get()) is not DONE:
+            flow, page_url = item
+            if flow.is_complete(n_articles):
+                continue
+            a_tag_location = flow.source.spec.a_tag_location_css
+            result = await fetch(page_url)
+            if result is None or not result.ok or not a_tag_location:
+                status_code = result.status_code if result else None
+                logger.error(
+                    f"the page cannot be parsed/a_tag_location key is missing - status code -> {status_code}"
+                )
+                continue
+
+            try:
+                logger.info(f"parsing url -> {page_url}")
+                start = time.perf_counter()
+                links = await loop.run_in_executor(
+                    None,
+                    self.html_parser.link_extractor.extract,
+                    result.content,
+                    result.final_url,
+                    a_tag_location,
+                )
+                self.metrics.record_parse("links", time.perf_counter() - start)
+            except Exception as err:
+                logger.error(f"sublink could not be found {err}")
+                continue
+            self._counts["pages"] += 1
+            await self._emit_links(flow, links, link_queue)
+
+    async def _download_worker(
+        self, link_queue: asyncio.Queue, parse_queue: asyncio.Queue, n_articles: int | None, fetch: Callable
+    ) -> None:
+        """
+        Lädt Artikel herunter, solange ihrer Quelle noch Artikel fehlen.
+        """
+        while (item := await link_queue.get()) is not DONE:
+            flow, link = item
+            if not await flow.acquire(n_articles):
+                continue
+
+            logger.info(f"downloading article : {link}")
+            result = await fetch(link, throttle=True)
+            self._counts["downloads"] += 1
+            if result is None or not result.ok:
+                status_code = result.status_code if result else None
+                logger.error(f"article could not be downloaded {link} - status code -> {status_code}")
+                if not is_host_failure(status_code):
+                    self._record_link(flow, link)
+                await flow.release()
+            elif self.seen_store and self.seen_store.is_unchanged_body(link, result.content):
+                logger.info(f"article unchanged since last run : {link}")
+                self._record_link(flow, link)
+                await flow.release()
+            else:
+                await parse_queue.put((flow, link, result))
+
+    async def _parse_worker(
+        self, parse_queue: asyncio.Queue, export_queue: asyncio.Queue, parse_executor
+    ) -> None:
+        """
+        Parst heruntergeladene Artikel im Prozess-Pool der ArticlePipeline.
+        """
+        loop = asyncio.get_running_loop()
+        while (item := await parse_queue.get()) is not DONE:
+            flow, link, result = item
+            try:
+                article_dict, parse_seconds = await loop.run_in_executor(
+                    parse_executor, parse_article_timed, flow.name, link, result.text
+                )
+            except Exception as err:
+                # z. B. BrokenProcessPool, wenn ein Worker-Prozess abgestürzt ist
+                logger.error(f"Something went wrong while parsing {link} - Error: {err}")
+                await flow.release()
+                continue
+            self._counts["parsed"] += 1
+            self.metrics.record_parse("articles", parse_seconds)
+            await export_queue.put(("article", flow, (link, result, article_dict)))
+
+    async def _table_worker(self, table_queue: asyncio.Queue, export_queue: asyncio.Queue, fetch: Callable) -> None:
+        """
+        Lädt Tabellenseiten und übergibt die ausgewählten Tabellen einzeln an den Export.
+        """
+        loop = asyncio.get_running_loop()
+        table_extractor = self.html_parser.table_extractor
+        while (flow := await table_queue.get()) is not DONE:
+            result = await fetch(flow.source.spec.urls[0])
+            if result is None or not result.ok:
+                status_code = result.status_code if result else None
+                logger.error(f"tables could not be extracted - status code -> {status_code}")
+                continue
+
+            try:
+                tables = table_extractor.extract(result.content, flow.source.spec.tables)
+                while True:
+                    start = time.perf_counter()
+                    index, table_df = await loop.run_in_executor(None, next, tables, (None, None))
+                    if table_df is None:
+                        break
+                    self.metrics.record_parse("tables", time.perf_counter() - start)
+                    table_df["name"] = f"{flow.name}_Table_{index}"
+                    await export_queue.put(("table", flow, table_df))
+                await export_queue.put(("tables_done", flow, None))
+            except Exception as err:
+                logger.error(f"tables could not be extracted - {err}")
+
+    async def _export(
+        self, export_queue: asyncio.Queue, n_articles: int | None, sink: ResultSink | None, tables_list: List
+    ) -> None:
+        """
+        Einzige Stufe, die schreibt: übernimmt Artikel und Tabellen in den ResultSink bzw. die
+        Listen und führt die Zählung der Artikel pro Quelle.
+
+        Artikel werden blockweise übernommen, damit der NearDuplicateIndex die Fingerabdrücke
+        vektorisiert und mit einem Commit pro Block berechnet. Ein Block endet, sobald die
+        Warteschlange leer ist (bei geringer Last also nach jedem Artikel) oder
+        Config.parse_queue_size Artikel enthält.
+        """
+        block = []
+        while (item := await export_queue.get()) is not DONE:
+            kind, flow, payload = item
+            if kind == "tables_done":
+                # Nach allen Tabellen der Quelle, die Export-Stufe schreibt in Reihenfolge
+                if self._checkpoint:
+                    self._checkpoint.record_tables(flow.name)
+            elif kind == "table":
+                self._counts["tables"] += 1
+                self.metrics.incr("tables_extracted")
+                self._mark_first_result()
+                if sink:
+                    sink.write_frame(payload)
+                else:
+                    tables_list.append(payload)
+            else:
+                block.append((flow, *payload))
+
+            if block and (export_queue.empty() or len(block) >= self.config.parse_queue_size):
+                await self._export_articles(block, n_articles, sink)
+                block = []
+        await self._export_articles(block, n_articles, sink)
+
+    async def _export_articles(self, block: List[tuple], n_articles: int | None, sink: ResultSink | None) -> None:
+        """
+        Prüft einen Block geparster Artikel (Obergrenze, Seen-Store, Beinahe-Duplikate) und
+        übernimmt die verbleibenden.
+        """
+        accepted, n_pending = [], {}
+        for flow, link, result, article_dict in block:
+            if self._accept_article(flow, link, article_dict, n_articles, n_pending.get(flow.name, 0)):
+                n_pending[flow.name] = n_pending.get(flow.name, 0) + 1
+                accepted.append((flow, link, result, article_dict))
+            else:
+                await flow.release()
+
+        if self.near_duplicates and accepted:
+            kept = self.near_duplicates.filter([article_dict for _, _, _, article_dict in accepted])
+            kept_ids = {id(article_dict) for article_dict in kept}
+            for flow, link, _, article_dict in accepted:
+                if id(article_dict) not in kept_ids:
+                    self._record_link(flow, link)
+                    await flow.release()
+            accepted = [item for item in accepted if id(item[3]) in kept_ids]
+
+        for flow, link, result, article_dict in accepted:
+            self._counts["articles"] += 1
+            self.metrics.incr("articles_extracted")
+            self._mark_first_result()
+            mark_seen = (
+                partial(self.seen_store.mark_seen, [(link, result.content, article_dict["article"])])
+                if self.seen_store
+                else None
+            )
+            if sink:
+                # Als gesehen gilt der Artikel erst, wenn der Sink ihn geschrieben hat
+                sink.write(flow.name, [article_dict], on_written=mark_seen)
+            else:
+                flow.articles.append(article_dict)
+                if mark_seen:
+                    mark_seen()
+            logger.success("downloading successful! article added to list")
+            await flow.release(found=True)
+
+    def _accept_article(
+        self, flow: SourceFlow, link: str, article_dict: dict | None, n_articles: int | None, n_pending: int
+    ) -> bool:
+        if not article_dict:
+            logger.warning("article not found!")
+            self._record_link(flow, link)
+            return False
+        # Die Obergrenze greift vor Seen-Store und Duplikat-Index, samt der Artikel im Block
+        if n_articles and flow.n_found + n_pending >= n_articles:
+            return False
+        if self.seen_store and self.seen_store.is_unchanged_text(link, article_dict["article"]):
+            logger.info(f"article text unchanged since last run : {link}")
+            self._record_link(flow, link)
+            return False
+        return True
+
+    def _record_link(self, flow: SourceFlow, link: str) -> None:
+        """
+        Vermerkt einen Link, der ohne Ergebnis abgeschlossen ist, damit er bei einer
+        Fortsetzung nicht erneut geladen wird.
+        """
+        if self._checkpoint:
+            self._checkpoint.record_link(flow.name, link)
@@ -0,0 +1,299 @@
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from loguru import logger
+
+from config import Config
+from src.parser.article_pipeline import parse_article_timed
+from src.parser.generic_html_parser import DynamicPageHandler
+from src.parser.html_parser import HtmlParser
+from src.parser.source_spec import SourcePlan, SourceSpec
+from src.utils.async_fetcher import FetchResult
+from src.utils.host_health import is_host_failure
+from src.utils.result_sink import ResultSink
+from src.utils.seen_store import normalize_url
+from src.utils.task_queue import Task, open_task_queue
+
+# Einstellungen einer Quelle, die ein Worker für die Artikel-Downloads benötigt
+ARTICLE_SOURCE_KEYS = ("name", "url", "requests_per_second", "burst", "cache_ttl")
+
+
+class CrawlCoordinator:
+    """
+    Legt pro Quelle aus urls.json eine Aufgabe in der gemeinsamen TaskQueue an. Die Worker
+    paginieren die Quellen, extrahieren Links und Tabellen und legen pro Artikel-URL eine
+    weitere Aufgabe an.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die CrawlCoordinator-Instanz.
+        """
+        self.config = config
+        self.queue = open_task_queue(config)
+
+    def enqueue(self, main_urls_list: List[SourcePlan], n_articles: int = None, reset: bool = False) -> int:
+        """
+        Legt die Quell-Aufgaben an. Bereits angelegte Quellen werden übersprungen, sodass
+        ein erneuter Aufruf einen laufenden Crawl nicht verdoppelt.
+
+        Args:
+            main_urls_list (List[SourcePlan]): Die Quellen aus urls.json.
+            n_articles (int): Höchstzahl der Artikel-Aufgaben pro Quelle (None = alle Links).
+            reset (bool): Entfernt vorher alle Aufgaben eines früheren Crawls.
+
+        Returns:
+            int: Anzahl der neu angelegten Aufgaben.
+        """
+        if reset:
+            self.queue.clear()
+        n_new = self.queue.put_many(
+            "source",
+            [{"source": source.spec.to_dict(), "n_articles": n_articles} for source in main_urls_list],
+            dedup_keys=[f"source:{source.name}" for source in main_urls_list],
+        )
+        logger.info(f"{n_new} source tasks enqueued -> {self.queue.stats()}")
+        return n_new
+
+
+class CrawlWorker:
+    """
+    Zustandsloser Worker für den verteilten Crawl. Übernimmt Aufgaben aus der TaskQueue
+    per Lease, bearbeitet sie und bestätigt sie anschließend:
+
+        "source":  Paginierung, Link-Extraktion und Tabellen einer Quelle. Die gefundenen
+                   Links werden als "article"-Aufgaben angelegt, dedupliziert über die
+                   normalisierte URL, sodass jeder Artikel nur von einem Worker geladen wird.
+        "article": Download und Parsen eines Artikels, Artikel-Aufgaben werden blockweise
+                   (Config.task_lease_batch) übernommen.
+
+    Ein Heartbeat-Thread verlängert die Leases laufender Aufgaben. Fehlgeschlagene Downloads
+    (Verbindungsfehler, 429, 5xx) werden zurückgegeben und nach einer Wartezeit, mindestens
+    der Pause des Circuit Breakers ihres Hosts, erneut vergeben. Jeder Worker
+    schreibt in eigene Dateien (run_id "<Config.result_run_id>_<worker_id>").
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        worker_id (str): Kennung des Workers (Standard: "<hostname>-<pid>").
+        html_parser (HtmlParser): Fetcher, Extraktoren und Parse-Pool.
+    """
+
+    def __init__(self, config: Config, worker_id: str = None):
+        """
+        Initialisiert die CrawlWorker-Instanz.
+        """
+        self.config = config
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.queue = open_task_queue(config)
+        self.html_parser = HtmlParser(config=config)
+        self._dynamic_page_handler: DynamicPageHandler | None = None
+        self._held: Dict[str, Task] = {}
+        self._held_lock = threading.Lock()
+
+    @property
+    def dynamic_page_handler(self) -> DynamicPageHandler:
+        # Browser werden erst bei der ersten paginierten Quelle benötigt
+        if self._dynamic_page_handler is None:
+            self._dynamic_page_handler = DynamicPageHandler(
+                config=self.config, fetcher=self.html_parser.fetcher
+            )
+        return self._dynamic_page_handler
+
+    def run(self, keep_alive: bool = False) -> Dict[str, int]:
+        """
+        Bearbeitet Aufgaben, bis die Warteschlange leer ist.
+
+        Args:
+            keep_alive (bool): Bei True wartet der Worker auf neue Aufgaben, statt sich bei
+                leerer Warteschlange zu beenden.
+
+        Returns:
+            Dict[str, int]: Anzahl der bearbeiteten Aufgaben pro Art.
+        """
+        processed = defaultdict(int)
+        run_id = self.config.result_run_id or time.strftime("%Y_%m_%d_%H%M%S")
+        logger.info(f"worker {self.worker_id} started on {self.config.task_queue_url}")
+
+        with (
+            ResultSink(config=self.config, run_id=f"{run_id}_{self.worker_id}") as sink,
+            self.html_parser.article_pipeline.create_executor() as executor,
+            self._heartbeat(),
+        ):
+            while True:
+                # Quellen zuerst, damit früh viele Artikel-Aufgaben für alle Worker entstehen
+                tasks = self._lease(["source"], limit=1) or self._lease(
+                    ["article"], limit=self.config.task_lease_batch
+                )
+                if not tasks:
+                    if not keep_alive and self.queue.pending() == 0:
+                        break
+                    time.sleep(self.config.task_poll_interval)
+                    continue
+
+                if tasks[0].kind == "source":
+                    self._process_source(tasks[0], sink)
+                else:
+                    self._process_articles(tasks, sink, executor)
+                processed[tasks[0].kind] += len(tasks)
+
+        if self._dynamic_page_handler:
+            self._dynamic_page_handler.close()
+        self.html_parser.fetcher.host_health.log_summary()
+        logger.success(f"worker {self.worker_id} finished -> {dict(processed)}")
+        return dict(processed)
+
+    def _lease(self, kinds: List[str], limit: int) -> List[Task]:
+        tasks = self.queue.lease(self.worker_id, kinds=kinds, limit=limit)
+        with self._held_lock:
+            self._held.update({task.id: task for task in tasks})
+        return tasks
+
+    def _ack(self, task: Task, error: str = None, delay: float = None) -> None:
+        with self._held_lock:
+            self._held.pop(task.id, None)
+        if error:
+            self.queue.fail(task, error, delay=delay)
+        else:
+            self.queue.ack(task)
+
+    @contextmanager
+    def _heartbeat(self) -> Iterator[None]:
+        """
+        Verlängert die Leases laufender Aufgaben, z. B. während einer langen Paginierung.
+        """
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.config.task_visibility_timeout / 3):
+                with self._held_lock:
+                    tasks = list(self._held.values())
+                if tasks:
+                    self.queue.extend(tasks)
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _process_source(self, task: Task, sink: ResultSink) -> None:
+        """
+        Paginiert eine Quelle, extrahiert Links und Tabellen und legt die Artikel-Aufgaben an.
+        """
+        n_articles = task.payload.get("n_articles")
+        try:
+            source = SourcePlan.from_dict(task.payload["source"])
+            logger.info(f"processing source {source.name} (attempt {task.attempts})")
+            if source.pagination_strategy or source.spec.discovery:
+                self.dynamic_page_handler.get_paginated_links(main_urls_list=[source])
+            self.html_parser.get_links_from_main_urls(main_urls_list=[source])
+            if source.spec.pandas:
+                self.html_parser.get_tables_from_html(main_urls_list=[source], sink=sink)
+                # Bestätigt wird erst, wenn die Tabellen in der Datei stehen
+                sink.flush()
+        except Exception as err:
+            logger.error(f"source {task.payload['source'].get('name')} could not be processed - {err}")
+            self._ack(task, error=str(err))
+            return
+
+        links = list(source.sublinks or []) if source.spec.newspaper3K else []
+        if self.html_parser.seen_store:
+            links = self.html_parser.seen_store.filter_unseen(
+                links, include_seen=self.config.incremental_recheck_seen
+            )
+        links = links[:n_articles] if n_articles else links
+
+        spec = source.spec.to_dict()
+        article_source = {key: spec[key] for key in ARTICLE_SOURCE_KEYS}
+        n_new = self.queue.put_many(
+            "article",
+            [{"source": article_source, "link": link} for link in links],
+            dedup_keys=[normalize_url(link) for link in links],
+        )
+        logger.info(f"{n_new} of {len(links)} article tasks enqueued for {source.name}")
+        self._ack(task)
+
+    def _process_articles(self, tasks: List[Task], sink: ResultSink, executor) -> None:
+        """
+        Lädt und parst einen Block von Artikeln.
+        """
+        sources = [SourceSpec.from_dict(task.payload["source"]) for task in tasks]
+        for source, task in zip(sources, tasks):
+            source.configure_fetcher(self.html_parser.fetcher, [task.payload["link"]])
+        results = self.html_parser.fetcher.fetch_all(
+            [task.payload["link"] for task in tasks], throttle=True
+        )
+
+        futures = {}
+        for task, source, result in zip(tasks, sources, results):
+            error = self._download_error(result)
+            if error:
+                # Bei geöffnetem Circuit Breaker erst nach dessen Pause erneut vergeben
+                delay = self.html_parser.fetcher.host_health.remaining_cooldown(task.payload["link"])
+                self._ack(task, error=error, delay=delay)
+            elif result.ok:
+                futures[task.id] = executor.submit(
+                    parse_article_timed, source.name, task.payload["link"], result.text
+                )
+            else:
+                # z. B. 404: erneute Versuche sind zwecklos
+                logger.warning(f"article skipped {task.payload['link']} - status code -> {result.status_code}")
+                self._ack(task)
+
+        seen_records, parsed = [], []
+        for task, source, result in zip(tasks, sources, results):
+            if task.id not in futures:
+                continue
+            try:
+                article_dict, parse_seconds = futures[task.id].result()
+            except Exception as err:
+                logger.error(f"Something went wrong while parsing {task.payload['link']} - Error: {err}")
+                self._ack(task, error=str(err))
+                continue
+            self.html_parser.metrics.record_parse("articles", parse_seconds)
+            if article_dict:
+                parsed.append((task, source.name, article_dict))
+                seen_records.append((task.payload["link"], result.content, article_dict["article"]))
+            else:
+                logger.warning("article not found!")
+                self._ack(task)
+
+        kept_ids = {id(article_dict) for _, _, article_dict in parsed}
+        if self.html_parser.near_duplicates and parsed:
+            # Worker auf demselben Rechner teilen sich den Index (Config.dedup_index_path)
+            kept = self.html_parser.near_duplicates.filter([article_dict for _, _, article_dict in parsed])
+            kept_ids = {id(article_dict) for article_dict in kept}
+        for task, name, article_dict in parsed:
+            if id(article_dict) in kept_ids:
+                sink.write(name, [article_dict])
+                logger.success(f"article added : {task.payload['link']}")
+
+        # Bestätigt und als gesehen vermerkt wird erst, wenn die Artikel in der Datei stehen,
+        # stirbt der Worker vorher, vergibt die Warteschlange die Aufgaben nach dem Lease erneut
+        sink.flush()
+        for task, _, _ in parsed:
+            self._ack(task)
+        if self.html_parser.seen_store and seen_records:
+            self.html_parser.seen_store.mark_seen(seen_records)
+
+    @staticmethod
+    def _download_error(result: FetchResult | None) -> str | None:
+        """
+        Gibt den Fehler eines Downloads zurück, falls er wiederholt werden sollte.
+        """
+        if result is None:
+            # auch bei geöffnetem Circuit Breaker, die Aufgabe wartet dann dessen Pause ab
+            return "request failed"
+        if is_host_failure(result.status_code):
+            return f"status code {result.status_code}"
+        return None
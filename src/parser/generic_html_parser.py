@@ -1,25 +1,27 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from loguru import logger
-from selenium import webdriver
 from selenium.common.exceptions import (
     NoSuchElementException,
     ElementNotInteractableException,
     ElementClickInterceptedException,
     TimeoutException,
+    WebDriverException,
 )
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-
-# OPTIONAL - Cache Management
-
 
 from config import Config
+from src.parser.browser_pool import BrowserPool
+from src.parser.pagination import HttpPaginator
+from src.parser.source_spec import SourcePlan
+from src.parser.link_discovery import LinkDiscovery
+from src.parser.strategy_probe import StrategyProbe
+from src.utils.async_fetcher import AsyncFetcher
 
 
 class DynamicPageHandler:
@@ -28,125 +30,184 @@ class DynamicPageHandler:
 
     Attributes:
         config (Config): Eine Instanz der Konfigurationsklasse.
+        browser_pool (BrowserPool): Pool wiederverwendbarer Browser-Instanzen.
+        http_paginator (HttpPaginator): Paginierung per HTTP ohne Browser.
+        strategy_probe (StrategyProbe | None): Stellt Quellen, die keinen Browser benötigen,
+            auf HTTP um (None falls Config.strategy_probe_enabled False ist).
+        link_discovery (LinkDiscovery | None): Liest die Links aus Sitemaps und Feeds statt aus
+            den Listenseiten (None falls Config.discovery_enabled False ist).
     """
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, fetcher: AsyncFetcher = None):
         """
         Initialisiert die DynamicPageHandler-Instanz und setzt die Logger-Konfiguration.
+        Der Fetcher kann mit dem HtmlParser geteilt werden, damit dieselbe Session genutzt wird.
         """
         self.config = config
-
-    def get_paginated_links(self, main_urls_list: List) -> List:
+        # Browser werden erst gestartet, wenn eine paginierte Quelle sie benötigt
+        self.browser_pool = BrowserPool(config=config)
+        fetcher = fetcher or AsyncFetcher(config=config)
+        self.http_paginator = HttpPaginator(config=config, fetcher=fetcher)
+        self.strategy_probe = (
+            StrategyProbe(config=config, fetcher=fetcher) if config.strategy_probe_enabled else None
+        )
+        self.link_discovery = (
+            LinkDiscovery(config=config, fetcher=fetcher) if config.discovery_enabled else None
+        )
+
+    def get_paginated_links(self, main_urls_list: List[SourcePlan]) -> List[SourcePlan]:
         """
         Extrahiert Links von paginierten Webseiten.
 
         Geht durch eine Liste von URLs und extrahiert Links von Seiten, die eine Paginierung aufweisen.
+        Quellen mit einer HTTP-Strategie unter "pagination" (url_template, query_param, rel_next)
+        werden ohne Browser paginiert, alle anderen parallel mit Browsern aus dem BrowserPool.
+        Vorher übernimmt die LinkDiscovery die Links von Quellen mit "discovery" aus Sitemaps
+        und Feeds (diese werden nicht paginiert) und die StrategyProbe prüft, welche der
+        übrigen Quellen auch per HTTP lesbar sind.
 
         Args:
-            main_urls_list (List): Eine Liste von Dictionaries, die URLs und Paginierungs-Informationen enthalten.
+            main_urls_list (List[SourcePlan]): Die Quellen aus urls.json.
 
         Returns:
-            List: Die aktualisierte Liste mit den extrahierten URLs für jede Seite.
+            List[SourcePlan]: Die Quellen, bei paginierten Quellen mit allen Seiten in pages.
         """
+        if self.link_discovery:
+            self.link_discovery.resolve(main_urls_list)
+        if self.strategy_probe:
+            self.strategy_probe.resolve(main_urls_list)
+
+        browser_sources = []
+        for source in main_urls_list:
+            if source.http_strategy:
+                self.http_paginator.paginate(source)
+            elif source.needs_browser:
+                browser_sources.append(source)
+
+        with ThreadPoolExecutor(max_workers=self.config.browser_pool_size) as executor:
+            for _ in executor.map(self.paginate_with_browser, browser_sources):
+                pass
+
+        logger.info(f"browser timing -> {self.browser_pool.get_timing_stats()}")
+        return main_urls_list
 
-        options = webdriver.ChromeOptions()
-        # Headless ist ein Ausführungsmodus für Firefox- und Chromium-basierte Browser.
-        # was bedeutet, dass das Browserfenster nicht sichtbar ist.
-        if self.config.start_headless:
-            options.add_argument("--headless")
+    def paginate_with_browser(self, source: SourcePlan) -> List[str] | None:
+        """
+        Paginiert eine Quelle mit einem Browser aus dem Pool. Blockiert bis zum Ende der
+        Paginierung und kann daher parallel in mehreren Threads aufgerufen werden.
+
+        Args:
+            source (SourcePlan): Eine per Selenium paginierte Quelle.
 
-        # Definiert die Ladestrategie für den Seiteninhalt
-        # options.page_load_strategy = "eager"
-        # driver = webdriver.Chrome(options=options)
+        Returns:
+            List[str] | None: Die besuchten Seiten (auch in source.pages), None, falls der
+            Browser abgestürzt ist (source.pages bleibt dann unverändert).
+        """
+        try:
+            self._paginate_source(source)
+        except WebDriverException as err:
+            logger.error(f"browser crashed while paginating {source.spec.urls[0]} - {err}")
+            return None
+        return source.pages
+
+    def _paginate_source(self, source: SourcePlan) -> None:
+        """
+        Klickt sich mit einem Browser aus dem Pool durch die Seiten einer Quelle und
+        speichert die besuchten URLs in source.pages.
 
+        Args:
+            source (SourcePlan): Eine per Selenium paginierte Quelle.
         """
-        
+        with self.browser_pool.acquire() as pooled:
+            driver = pooled.driver
+
+            # Initialisierung des Wartevorgangs
+            wait = WebDriverWait(driver, 10)
+
+            """
+            Besserer Ansatz wäre die direkte Generierung der URLs, da es ein klares Muster gibt
+            (siehe "pagination": {"strategy": "url_template"} in urls.json und HttpPaginator).
+
+            Ohne HTTP-Strategie wird zu Demonstrationszwecken folgend Selenium verwendet
+            """
+
+            first_url = source.spec.urls[0]
+            pages_links = [first_url]
+            logger.info(
+                f"The Method driver.get navigates to page {first_url}"
+            )
+            driver.get(first_url)
+            pooled.pages_served += 1
+
+            # POP-UP BUTTON
+            popup_location = source.spec.popup_button_id if not self.config.start_headless else None
+            if popup_location:
+                try:
+                    popup_button = driver.find_element(By.ID, popup_location)
+                    wait.until(EC.element_to_be_clickable(popup_button))
+                    popup_button.click()
+                except (Exception, ElementNotInteractableException) as err:
+                    logger.error(f"Pop-up Button not clickable -> {err}")
+
+            # Schleife zur Durchquerung der paginierten Seiten
+            pagination_stop = False
+            page_count = 0
+            # Extrahiere "Next" Button Locations vom URL-DICT
+
+            pagination_button_location_css = source.spec.page_button_location
+
+            max_pages = source.spec.pagination.get("max_pages", self.config.selenium_max_pages)
+
+            while not pagination_stop and len(pages_links) < max_pages:
+
+                logging.info(f"scraping page - {page_count}")
+
+                try:
+
+                    pagination_button = driver.find_element(By.CLASS_NAME, pagination_button_location_css)
+                    # Scrollt zum Button
+                    driver.execute_script(
+                        "arguments[0].scrollIntoView();", pagination_button
+                    )
+                    logger.info("waiting for button element...")
+                    time.sleep(1)
+
+                    wait.until(EC.element_to_be_clickable(pagination_button))
+
+                    # Klick auf die nächste Seite
+                    pagination_button.click()
+                    logger.success("button clicked!")
+                    # Aktuelle Seite:
+                    new_page = driver.current_url
+
+                    pages_links.append(new_page)
+                    page_count += 1
+                    pooled.pages_served += 1
+                    logger.info(f"page {page_count} crawled.")
+                except (
+                    NoSuchElementException,
+                    ElementNotInteractableException,
+                    ElementClickInterceptedException,
+                    TimeoutException,
+                ) as err:
+                    logger.error(f"pagination button not found {err}")
+                    pagination_stop = True
+
+            source.pages = pages_links
+            logger.info(
+                f"{len(pages_links) - 1} new pages added to {first_url}"
+            )
+
+    def close(self) -> None:
         """
-        driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=options,
-        )  # cache_manager=self.cache_manager
-
-        # Initialisierung des Wartevorgangs
-        wait = WebDriverWait(driver, 10)
-
-        for url_dict in main_urls_list:
-
-            # Überprüfung, ob Paginierungsinformationen vorhanden sind
-            if url_dict["paginated"] and url_dict["page_button_location"]:
-
-                """
-                Besserer Ansatz wäre die direkte Generierung der URLs, da es ein klares Muster gibt:
-                # paginated_links = [f"{url_dict['url']}page/{page_nr}/" for page_nr in range(1, 5)]
-                
-                Es wird aber zu Demonstrationszwecken trotzdem folgend Selenium verwendet
-                """
-
-                pages_links = [url_dict["url"]]
-                logger.info(
-                    f"The Method driver.get navigates to page {url_dict['url']}"
-                )
-                driver.get(url_dict["url"])
-
-                # POP-UP BUTTON
-                popup_location = url_dict.get("pop-up-button-id", None) if not self.config.start_headless else None
-                if popup_location:
-                    try:
-                        popup_button = driver.find_element(By.ID, popup_location)
-                        wait.until(EC.element_to_be_clickable(popup_button))
-                        popup_button.click()
-                    except (Exception, ElementNotInteractableException) as err:
-                        logger.error(f"Pop-up Button not clickable -> {err}")
-
-                # Schleife zur Durchquerung der paginierten Seiten
-                pagination_stop = False
-                page_count = 0
-                # Extrahiere "Next" Button Locations vom URL-DICT
-
-                pagination_button_location_css = url_dict.get("page_button_location", "")
-
-                while not pagination_stop and page_count < 2:
-
-                    logging.info(f"scraping page - {page_count}")
-
-                    try:
-
-                        pagination_button = driver.find_element(By.CLASS_NAME, pagination_button_location_css)
-                        # Scrollt zum Button
-                        driver.execute_script(
-                            "arguments[0].scrollIntoView();", pagination_button
-                        )
-                        logger.info("waiting for button element...")
-                        time.sleep(1)
-
-                        wait.until(EC.element_to_be_clickable(pagination_button))
-
-                        # Klick auf die nächste Seite
-                        pagination_button.click()
-                        logger.success("button clicked!")
-                        # Aktuelle Seite:
-                        new_page = driver.current_url
-
-                        pages_links.append(new_page)
-                        page_count += 1
-                        logger.info(f"page {page_count} crawled.")
-                    except (
-                        NoSuchElementException,
-                        ElementNotInteractableException,
-                        ElementClickInterceptedException,
-                        TimeoutException,
-                    ) as err:
-                        logger.error(f"pagination button not found {err}")
-                        pagination_stop = True
-
-                url_dict["url"] = pages_links
-                logger.info(
-                    f"{len(url_dict['url']) - 1} new pages added to {url_dict['url']}"
-                )
-                # Browser schließen
-                driver.quit()
-
-            else:
-                logger.warning("There is no pagination button information is missing")
+        Beendet alle Browser des Pools.
+        """
+        self.browser_pool.close()
+        if self.strategy_probe:
+            self.strategy_probe.close()
 
-        return main_urls_list
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,15 +1,21 @@
-import random
 import time
 from typing import List
 
-import newspaper
 import pandas as pd
-import requests as rq
-from bs4 import BeautifulSoup
 from loguru import logger
-from newspaper import Article
 
 from config import Config
+from src.parser.article_pipeline import ArticlePipeline, SourceState
+from src.parser.checkpoint import CheckpointStore
+from src.parser.link_extractor import LinkExtractor
+from src.parser.source_spec import SourcePlan, configure_sources
+from src.parser.table_extractor import TableExtractor
+from src.utils.async_fetcher import AsyncFetcher
+from src.utils.http_client import HttpClient
+from src.utils.metrics import Metrics
+from src.utils.near_duplicates import NearDuplicateIndex
+from src.utils.result_sink import ResultSink
+from src.utils.seen_store import SeenArticleStore
 
 
 class HtmlParser:
@@ -23,160 +29,206 @@ class HtmlParser:
         Initialisiert die HtmlParser-Instanz und konfiguriert den Logger.
         """
         self.config = config
+        # Messwerte des Laufs (ohne Config.metrics_enabled ohne Wirkung)
+        self.metrics = Metrics(config=config)
+        # Eine gemeinsame Session für Listen-, Artikel- und Tabellenseiten
+        self.http_client = HttpClient(config=config)
+        self.fetcher = AsyncFetcher(
+            config=config, http_client=self.http_client, metrics=self.metrics
+        )
+        self.link_extractor = LinkExtractor(config=config)
+        self.table_extractor = TableExtractor(config=config)
+        # Gedächtnis zwischen den Läufen für den inkrementellen Crawl
+        self.seen_store = SeenArticleStore(config=config) if config.incremental_crawl else None
+        # Fingerabdrücke exportierter Artikel gegen syndizierte Mehrfachkopien
+        self.near_duplicates = (
+            NearDuplicateIndex(config=config, metrics=self.metrics) if config.dedup_enabled else None
+        )
+        self.article_pipeline = ArticlePipeline(
+            config=config,
+            fetcher=self.fetcher,
+            seen_store=self.seen_store,
+            near_duplicates=self.near_duplicates,
+        )
         # self.config.initialize_logger()
 
-    def _get_soup(self, url: str) -> BeautifulSoup | None:
-        """
-        Erzeugt ein BeautifulSoup-Objekt aus dem Inhalt einer gegebenen URL.
-
-        Args:
-            url (str): URL der Webseite, die geparst werden soll.
-
-        Returns:
-            BeautifulSoup: Ein BeautifulSoup-Objekt oder None, falls ein Fehler auftritt.
-        """
-        req = rq.get(url, headers=self.config.headers)
-        if req.status_code == 200:
-            logger.info(f"parsing url -> {url}")
-            soup = BeautifulSoup(req.content, "html.parser")
-            return soup
-        else:
-            logger.error(f"the page cannot be parsed. status code -> {req.status_code}")
-            return None
-
-    def get_links_from_main_urls(self, main_urls_list: List) -> List:
+    def get_links_from_main_urls(self, main_urls_list: List[SourcePlan]) -> List[SourcePlan]:
         """
         Extrahiert Links von Webseiten, die in der übergebenen Liste spezifiziert sind.
+        Alle Seiten aller Quellen werden vorab nebenläufig abgerufen. Quellen, deren Sublinks
+        bereits bei der HTTP-Paginierung bzw. aus Sitemaps und Feeds gesammelt wurden, werden
+        übersprungen.
+
+        Die Links werden über den LinkExtractor (Backend aus Config.link_extractor_backend)
+        extrahiert, als absolute URLs aufgelöst und pro Seite dedupliziert.
 
         Args:
-            main_urls_list (List): Eine Liste von URLs und zugehörigen Informationen.
+            main_urls_list (List[SourcePlan]): Die Quellen aus urls.json.
 
         Returns:
-            List: Die aktualisierte Liste mit extrahierten Links.
+            List[SourcePlan]: Die Quellen mit den extrahierten Links in sublinks.
         """
-        for url_dict in main_urls_list:
-            if url_dict.get("bs4", None):
-                sub_urls_list = []
-                for url in url_dict["url"]:
-                    soup = self._get_soup(url=url)
-                    a_tag_location = url_dict.get("a_tag_location_css")
-                    if soup and a_tag_location:
-
-                        try:
-                            sub_links_raw = soup.findAll("a", class_=a_tag_location)
-                            sub_links = [a["href"] for a in sub_links_raw]
-                            sub_urls_list += sub_links
-                            logger.info(
-                                f"the number of sublink added -> {len(sub_urls_list)} for url {url}"
-                            )
-                        except (AttributeError, Exception) as err:
-                            logger.error(f"sublink could not be found {err}")
-                    else:
-                        logger.error(
-                            f"the page cannot be parsed/a_tag_location key is missing"
+        configure_sources(self.fetcher, main_urls_list)
+
+        bs4_sources = [
+            source
+            for source in main_urls_list
+            if source.spec.bs4 and source.sublinks is None
+        ]
+        page_urls = [url for source in bs4_sources for url in source.pages]
+        results = iter(self.fetcher.fetch_all(page_urls))
+
+        for source in bs4_sources:
+            sub_urls_list = []
+            for url in source.pages:
+                result = next(results)
+                if result is not None and not result.ok:
+                    logger.error(f"the page cannot be parsed. status code -> {result.status_code}")
+                    result = None
+                a_tag_location = source.spec.a_tag_location_css
+                if result and a_tag_location:
+
+                    try:
+                        logger.info(f"parsing url -> {url}")
+                        start = time.perf_counter()
+                        sub_links = self.link_extractor.extract(
+                            result.content, result.final_url, a_tag_location
                         )
-                url_dict["sublinks"] = sub_urls_list
+                        self.metrics.record_parse("links", time.perf_counter() - start)
+                        sub_urls_list += sub_links
+                        logger.info(
+                            f"the number of sublink added -> {len(sub_urls_list)} for url {url}"
+                        )
+                    except (AttributeError, Exception) as err:
+                        logger.error(f"sublink could not be found {err}")
+                else:
+                    logger.error(
+                        f"the page cannot be parsed/a_tag_location key is missing"
+                    )
+            source.sublinks = sub_urls_list
         return main_urls_list
 
-    @staticmethod
     def get_articles_with_newspaper(
-        main_urls_list: List, n_articles: int = None
+        self,
+        main_urls_list: List[SourcePlan],
+        n_articles: int = None,
+        sink: ResultSink = None,
+        checkpoint: CheckpointStore = None,
     ) -> List:
         """
         Verwendet die Newspaper3K-Bibliothek, um Artikel von Webseiten zu extrahieren.
 
+        Download und Parsen laufen entkoppelt in der ArticlePipeline: Verschiedene Quellen
+        werden parallel heruntergeladen (pro Domain gilt die Rate aus `requests_per_second`/
+        `burst` der Quelle, siehe DomainRateLimiter), geparst wird in einem Prozess-Pool.
+
+        Im inkrementellen Modus (Config.incremental_crawl) werden bereits extrahierte Artikel
+        übersprungen, n_articles zählt dann nur neue bzw. geänderte Artikel.
+
         Args:
-            main_urls_list (List): Eine Liste von Dictionaries, die URLs und relevante Informationen enthalten.
+            main_urls_list (List[SourcePlan]): Die Quellen mit ihren Sublinks.
             n_articles (int): Die Anzahl der Links, die von jeder Liste gescraped werden sollen
+            sink (ResultSink): Optionaler Sink, in den die Artikel direkt geschrieben werden,
+                statt sie im Speicher zu sammeln.
+            checkpoint (CheckpointStore): Optionaler Checkpoint, Links ohne Ergebnis aus einem
+                abgebrochenen Lauf werden nicht erneut geladen.
 
         Returns:
-            List: Eine Liste von Pandas DataFrames, die Informationen zu den extrahierten Artikeln enthalten.
+            List: Eine Liste von Pandas DataFrames, die Informationen zu den extrahierten Artikeln enthalten
+            (leer, wenn ein Sink übergeben wird).
         """
-        articles_final_list = []
+        configure_sources(self.fetcher, main_urls_list)
 
-        for url_dict in main_urls_list:
-            articles_list = []
-
-            if url_dict.get("newspaper3K", None) and len(url_dict.get("sublinks", [])) > 0:
+        states = []
+        for source in main_urls_list:
+            if source.spec.newspaper3K and source.sublinks:
                 logger.info(
-                    f"articles found : {len(url_dict['sublinks'])} for url {url_dict['url']}"
+                    f"articles found : {len(source.sublinks)} for url {source.spec.urls[0]}"
                 )
-                # Anzahl der Links werden manuell bestimmt
+                links = list(source.sublinks)
+                if self.seen_store:
+                    links = self.seen_store.filter_unseen(
+                        links, include_seen=self.config.incremental_recheck_seen
+                    )
+                    logger.info(f"new article candidates : {len(links)} for url {source.spec.urls[0]}")
 
-                for link in url_dict["sublinks"]:
-                    logger.info(f"downloading article : {link}")
+                n_found = 0
+                if sink:
+                    # Beim Fortsetzen eines Laufs bereits geschriebene Artikel nicht erneut laden
+                    written_keys = sink.written_keys(source.name)
+                    n_found = sum(link in written_keys for link in links)
+                    links = [link for link in links if link not in written_keys]
+                if checkpoint:
+                    done_links = checkpoint.done_links(source.name)
+                    links = [link for link in links if link not in done_links]
 
-                    try:
-                        article = Article(link)
-
-                        # random sleep mit einem Minimum Sleep Wert von 2 Sekunden
-                        time.sleep(2 + random.randint(0, 2))
-
-                        article.download()
-                        article.parse()
-
-                        # Erstellen eines Dictionaries mit Artikelinformationen
-                        article_dict = {
-                            "name": url_dict["name"],
-                            "article_link": link,
-                            "title": article.title,
-                            "date": article.publish_date,
-                            "article": article.text,
-                            "tags": (
-                                "#" + " #".join(article.tags) if article.tags else ""
-                            ),
-                        }
-
-                        # Überprüfen, ob der Artikelinhalt gefunden wurde
-                        article_found = article_dict.get("article")
-                        if article_found:
-                            articles_list.append(article_dict)
-                            logger.success(
-                                "downloading successful! article added to list"
-                            )
-                        else:
-                            logger.warning("article not found!")
-
-                        if n_articles and len(articles_list) >= n_articles:
-                            break
-
-                    except (Exception, newspaper.ArticleException) as err:
-                        logger.error(
-                            f"Something went wrong while parsing {link} - Error: {err}"
-                        )
+                states.append(SourceState(source=source, links=links, n_found=n_found))
 
-                articles_final_list.append(pd.DataFrame(articles_list))
+        self.article_pipeline.run(states, n_articles=n_articles, sink=sink, checkpoint=checkpoint)
 
-        return articles_final_list
+        for domain, seconds in self.fetcher.rate_limiter.get_throttle_stats().items():
+            logger.info(f"time spent throttled for {domain}: {seconds:.1f} s")
 
-    @staticmethod
-    def get_tables_from_html(main_urls_list: List) -> List:
+        if sink:
+            return []
+        return [pd.DataFrame(state.articles) for state in states]
+
+    def get_tables_from_html(
+        self, main_urls_list: List[SourcePlan], sink: ResultSink = None, checkpoint: CheckpointStore = None
+    ) -> List:
         """
-        Extrahiert Tabellen von Webseiten unter Verwendung von Panda's read_html.
+        Extrahiert Tabellen von Webseiten über den TableExtractor. Die Seiten werden vorab
+        nebenläufig über den AsyncFetcher abgerufen, umgewandelt werden nur die Tabellen, die
+        der Auswahl unter "tables" in urls.json entsprechen (ohne Auswahl alle Tabellen).
 
         Args:
-            main_urls_list (List): Eine Liste von Dictionaries, die URLs und relevante Informationen enthalten.
+            main_urls_list (List[SourcePlan]): Die Quellen aus urls.json.
+            sink (ResultSink): Optionaler Sink, in den jede Tabelle direkt geschrieben wird.
+            checkpoint (CheckpointStore): Optionaler Checkpoint, Quellen, deren Tabellen in einem
+                abgebrochenen Lauf bereits geschrieben wurden, werden nicht erneut abgerufen.
 
         Returns:
-            List: Eine Liste von Pandas DataFrames, die die extrahierten Tabellen enthalten.
+            List: Eine Liste von Pandas DataFrames, die die extrahierten Tabellen enthalten
+            (leer, wenn ein Sink übergeben wird).
         """
-        tables_list = []
-        for url_dict in main_urls_list:
-            if url_dict["pandas"]:
-                try:
+        configure_sources(self.fetcher, main_urls_list)
 
-                    table_dfs_list = pd.read_html(url_dict["url"])
-                    logger.info(f"Total tables: {len(table_dfs_list)}")
+        tables_list = []
+        pandas_sources = []
+        for source in main_urls_list:
+            if not source.spec.pandas:
+                logger.warning("Pandas key not found in config dict or the value is not valid")
+            elif not (checkpoint and checkpoint.tables_done(source.name)):
+                pandas_sources.append(source)
+        results = self.fetcher.fetch_all([source.spec.urls[0] for source in pandas_sources])
+
+        for source, result in zip(pandas_sources, results):
+            try:
+                if result is None or not result.ok:
+                    status_code = result.status_code if result else None
+                    raise ValueError(f"status code -> {status_code}")
+
+                tables = self.table_extractor.extract(result.content, source.spec.tables)
+                while True:
+                    # Die Tabellen werden einzeln erzeugt, gemessen wird nur das Parsen
+                    start = time.perf_counter()
+                    index, table_df = next(tables, (None, None))
+                    if table_df is None:
+                        break
+                    self.metrics.record_parse("tables", time.perf_counter() - start)
+                    self.metrics.incr("tables_extracted")
 
                     # Hinzufügen des Namens der Quellseite zu jeder Tabelle
-                    for index, table_df in enumerate(table_dfs_list):
-                        table_df["name"] = f"{url_dict['name']}_Table_{index}"
+                    table_df["name"] = f"{source.name}_Table_{index}"
+                    if sink:
+                        sink.write_frame(table_df)
+                    else:
                         tables_list.append(table_df)
-                except Exception as e:
-                    logger.error(
-                        f"Error reading HTML tables from {url_dict['url']}: {e}"
-                    )
-            else:
-                logger.warning("Pandas key not found in config dict or the value is not valid")
+                if checkpoint:
+                    checkpoint.record_tables(source.name)
+            except Exception as e:
+                logger.error(
+                    f"Error reading HTML tables from {source.spec.urls[0]}: {e}"
+                )
 
         return tables_list
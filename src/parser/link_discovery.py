@@ -0,0 +1,282 @@
+import asyncio
+import datetime
+import email.utils
+import gzip
+import io
+import re
+from typing import Awaitable, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from loguru import logger
+from lxml import etree, html
+
+from config import Config
+from src.parser.source_spec import SourcePlan
+from src.utils.async_fetcher import AsyncFetcher, FetchResult
+
+GZIP_MAGIC = b"\x1f\x8b"
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+# Elemente, die einen Eintrag umschließen: Sitemap, Sitemap-Index, RSS und Atom
+ENTRY_TAGS = {"url": "link", "sitemap": "sitemap", "item": "link", "entry": "link"}
+# Das Veröffentlichungsdatum ist genauer als die letzte Änderung
+DATE_TAGS = ("publication_date", "pubDate", "published", "date", "lastmod", "updated")
+
+
+def _local_name(tag) -> str:
+    # Tags ohne Namespace, z. B. "{http://www.sitemaps.org/schemas/sitemap/0.9}loc" -> "loc"
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def parse_date(value: str | None) -> datetime.datetime | None:
+    """
+    Liest ein Datum im W3C-Format (Sitemaps, Atom) oder nach RFC 822 (RSS). Ohne Zeitzone
+    gilt UTC.
+
+    Args:
+        value (str | None): Der Text des Elements.
+
+    Returns:
+        datetime.datetime | None: Das Datum oder None, falls es nicht lesbar ist.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def iter_entries(content: bytes) -> Iterator[Tuple[str, str, datetime.datetime | None]]:
+    """
+    Liest eine Sitemap, einen Sitemap-Index oder einen RSS/Atom-Feed ereignisbasiert und
+    verwirft abgeschlossene Einträge sofort, sodass auch Sitemaps mit 50.000 URLs nie als
+    vollständiger Baum im Speicher liegen. gzip-komprimierte Inhalte werden beim Lesen entpackt.
+
+    Args:
+        content (bytes): Der Inhalt der Datei.
+
+    Yields:
+        Tuple[str, str, datetime | None]: "sitemap" für Verweise eines Sitemap-Index, sonst
+        "link", dazu die URL und das Datum (lastmod, publication_date, pubDate bzw. published).
+    """
+    stream = gzip.GzipFile(fileobj=io.BytesIO(content)) if content[:2] == GZIP_MAGIC else io.BytesIO(content)
+    url, dates = None, {}
+    events = etree.iterparse(
+        stream, events=("start", "end"), resolve_entities=False, no_network=True, recover=True
+    )
+    try:
+        for event, element in events:
+            tag = _local_name(element.tag)
+            if event == "start":
+                if tag in ENTRY_TAGS:
+                    url, dates = None, {}
+                continue
+
+            parent = element.getparent()
+            if tag in ("loc", "link") and (parent is None or _local_name(parent.tag) not in ENTRY_TAGS):
+                # Nur die URL des Eintrags selbst, nicht z. B. <image:loc> bzw. <video:loc>
+                # einer Erweiterung, die ohne Namespace ebenfalls "loc" heißt
+                continue
+            text = (element.text or "").strip()
+            if tag == "loc" or (tag == "link" and text):
+                url = text
+            elif tag == "link" and element.get("rel", "alternate") == "alternate" and element.get("href"):
+                # Atom: <link rel="alternate" href="..."/>
+                url = element.get("href")
+            elif tag in DATE_TAGS:
+                dates[tag] = text
+            elif tag in ENTRY_TAGS:
+                if url:
+                    date = next((dates[key] for key in DATE_TAGS if key in dates), None)
+                    yield ENTRY_TAGS[tag], url, parse_date(date)
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    except (etree.XMLSyntaxError, OSError, EOFError) as err:
+        # z. B. abgeschnittene gzip-Datei, die bis dahin gelesenen Einträge bleiben gültig
+        logger.warning(f"sitemap/feed could not be read completely - {err}")
+
+
+class LinkDiscovery:
+    """
+    Findet die Artikel-Links einer Quelle über Sitemaps und RSS/Atom-Feeds, statt ihre
+    Listenseiten abzurufen und (ggf. mit einem Browser) zu paginieren. Eine Sitemap liefert
+    mit ein, zwei Abrufen tausende Links samt Datum. Konfiguriert wird pro Quelle in
+    urls.json unter "discovery":
+
+        "sitemaps":     URLs (auch relativ zur Quelle) von Sitemaps bzw. Sitemap-Indizes oder
+                        "auto" (Einträge "Sitemap:" der robots.txt, sonst /sitemap.xml)
+        "feeds":        URLs von RSS/Atom-Feeds oder "auto" (<link rel="alternate"> der ersten Seite)
+        "max_age_days": Nur Links, deren Datum höchstens so alt ist (Standard
+                        Config.discovery_max_age_days, null für alle)
+        "max_links":    Höchstzahl der Links, die neuesten zuerst (Standard Config.discovery_max_links)
+        "match":        Regulärer Ausdruck, den die URL eines Artikels enthalten muss
+
+    Ein Sitemap-Index wird rekursiv gelesen, Teil-Sitemaps außerhalb des Zeitfensters werden
+    nicht geladen. Einträge ohne Datum werden übernommen und nach den datierten einsortiert.
+    Liefert die Discovery Links, ersetzen sie Paginierung und Listenseiten der Quelle,
+    andernfalls wird die Quelle wie bisher gelesen.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        fetcher (AsyncFetcher): Der Fetcher für Sitemaps und Feeds.
+    """
+
+    def __init__(self, config: Config, fetcher: AsyncFetcher):
+        """
+        Initialisiert die LinkDiscovery-Instanz.
+        """
+        self.config = config
+        self.fetcher = fetcher
+
+    def resolve(self, sources: List[SourcePlan]) -> None:
+        """
+        Liest Sitemaps und Feeds aller Quellen mit "discovery" nebenläufig und übernimmt die
+        Links in source.sublinks.
+
+        Args:
+            sources (List[SourcePlan]): Die Quellen aus urls.json.
+        """
+        discovery_sources = [source for source in sources if source.spec.discovery and source.sublinks is None]
+        if discovery_sources:
+            asyncio.run(self._resolve(discovery_sources))
+
+    async def _resolve(self, sources: List[SourcePlan]) -> None:
+        async with self.fetcher.session() as fetch:
+            await asyncio.gather(*(self.discover(source, fetch) for source in sources))
+
+    async def discover(
+        self, source: SourcePlan, fetch: Callable[[str], Awaitable[FetchResult | None]]
+    ) -> bool:
+        """
+        Liest Sitemaps und Feeds einer Quelle, z. B. innerhalb des CrawlOrchestrator.
+
+        Args:
+            source (SourcePlan): Die Quelle. Bei Erfolg enthalten source.sublinks die Links und
+                source.pages die gelesenen Sitemaps und Feeds, paginiert wird nicht mehr.
+            fetch (Callable): Die Abruffunktion aus AsyncFetcher.session.
+
+        Returns:
+            bool: True, falls Links gefunden wurden.
+        """
+        options = source.spec.discovery
+        if not options:
+            return False
+        max_age_days = options.get("max_age_days", self.config.discovery_max_age_days)
+        since = (
+            datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=max_age_days)
+            if max_age_days is not None
+            else None
+        )
+
+        sitemap_urls, feed_urls = await asyncio.gather(
+            self._sitemap_urls(source, options.get("sitemaps"), fetch),
+            self._feed_urls(source, options.get("feeds"), fetch),
+        )
+        links: Dict[str, datetime.datetime | None] = {}
+        documents = await self._read(sitemap_urls + feed_urls, since, links, fetch)
+
+        match = re.compile(options["match"]) if options.get("match") else None
+        oldest = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+        ranked = sorted(
+            (link for link in links if not match or match.search(link)),
+            key=lambda link: links[link] or oldest,
+            reverse=True,
+        )
+        ranked = ranked[: options.get("max_links", self.config.discovery_max_links)]
+
+        if not ranked:
+            logger.warning(f"no links discovered for {source.name}, reading its listing pages instead")
+            return False
+        self.fetcher.metrics.incr("discovery_links", len(ranked))
+        source.pages, source.sublinks = documents, ranked
+        source.pagination_strategy = None
+        logger.success(
+            f"{len(ranked)} links discovered for {source.name} from {len(documents)} sitemaps/feeds"
+        )
+        return True
+
+    async def _read(
+        self,
+        urls: List[str],
+        since: datetime.datetime | None,
+        links: Dict[str, datetime.datetime | None],
+        fetch: Callable,
+    ) -> List[str]:
+        """
+        Liest Sitemaps und Feeds ebenenweise nebenläufig, die Teil-Sitemaps eines Index in der
+        nächsten Ebene, höchstens Config.discovery_max_documents Dateien.
+
+        Returns:
+            List[str]: Die gelesenen Dateien.
+        """
+        documents, seen = [], set(urls)
+        while urls and len(documents) < self.config.discovery_max_documents:
+            urls = urls[: self.config.discovery_max_documents - len(documents)]
+            results = await asyncio.gather(*(fetch(url) for url in urls))
+            next_urls = []
+            for url, result in zip(urls, results):
+                if result is None or not result.ok:
+                    status_code = result.status_code if result else None
+                    logger.warning(f"sitemap/feed {url} could not be loaded - status code -> {status_code}")
+                    continue
+                documents.append(url)
+                for kind, entry_url, date in iter_entries(result.content):
+                    if since and date and date < since:
+                        continue
+                    # Relative Angaben gegen die Datei auflösen
+                    entry_url = urljoin(result.final_url, entry_url)
+                    if kind == "sitemap":
+                        if entry_url not in seen:
+                            seen.add(entry_url)
+                            next_urls.append(entry_url)
+                    elif entry_url not in links or (date and (links[entry_url] or date) <= date):
+                        links[entry_url] = date
+            urls = next_urls
+        return documents
+
+    @staticmethod
+    def _root(source: SourcePlan) -> str:
+        parts = urlsplit(source.spec.urls[0])
+        return f"{parts.scheme}://{parts.netloc}"
+
+    @staticmethod
+    def _configured_urls(source: SourcePlan, urls) -> List[str]:
+        urls = [urls] if isinstance(urls, str) else list(urls or [])
+        return [urljoin(source.spec.urls[0], url) for url in urls]
+
+    async def _sitemap_urls(self, source: SourcePlan, sitemaps, fetch: Callable) -> List[str]:
+        if sitemaps != "auto":
+            return self._configured_urls(source, sitemaps)
+        result = await fetch(f"{self._root(source)}/robots.txt")
+        urls = []
+        if result is not None and result.ok:
+            urls = [
+                urljoin(result.final_url, line.split(":", 1)[1].strip())
+                for line in result.text.splitlines()
+                if line.lower().startswith("sitemap:")
+            ]
+        return urls or [f"{self._root(source)}/sitemap.xml"]
+
+    async def _feed_urls(self, source: SourcePlan, feeds, fetch: Callable) -> List[str]:
+        if feeds != "auto":
+            return self._configured_urls(source, feeds)
+        result = await fetch(source.spec.urls[0])
+        if result is None or not result.ok:
+            return []
+        try:
+            tree = html.fromstring(result.content)
+        except (etree.ParserError, ValueError):
+            return []
+        return [
+            urljoin(result.final_url, element.get("href"))
+            for element in tree.iter("link")
+            if element.get("rel") == "alternate" and element.get("type") in FEED_TYPES and element.get("href")
+        ]
@@ -0,0 +1,135 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+
+from config import Config
+
+# Ein einfacher Klassenname (bisheriges Format von a_tag_location_css), alles andere
+# wird als vollständiger CSS-Selektor behandelt
+CLASS_NAME_PATTERN = re.compile(r"^[\w-]+$")
+
+
+def to_css_selector(a_tag_location: str) -> str:
+    """
+    Wandelt a_tag_location_css in einen CSS-Selektor um. Ein einfacher Klassenname wie
+    "loop-card__title-link" wird zu "a.loop-card__title-link".
+    """
+    a_tag_location = a_tag_location.strip()
+    if CLASS_NAME_PATTERN.match(a_tag_location):
+        return f"a.{a_tag_location}"
+    return a_tag_location
+
+
+@lru_cache(maxsize=256)
+def compile_selector(css_selector: str) -> CSSSelector:
+    """
+    Kompiliert einen CSS-Selektor einmalig zu einem XPath-Ausdruck für lxml.
+    """
+    return CSSSelector(css_selector, translator="html")
+
+
+def _extract_with_bs4(content: bytes, a_tag_location: str) -> Iterable[str]:
+    soup = BeautifulSoup(content, "html.parser")
+    if CLASS_NAME_PATTERN.match(a_tag_location.strip()):
+        anchors = soup.findAll("a", class_=a_tag_location.strip())
+    else:
+        anchors = soup.select(a_tag_location)
+    return (a.get("href") for a in anchors)
+
+
+def _extract_with_lxml(content: bytes, a_tag_location: str) -> Iterable[str]:
+    tree = html.fromstring(content)
+    selector = compile_selector(to_css_selector(a_tag_location))
+    return (element.get("href") for element in selector(tree))
+
+
+def _extract_with_stream(content: bytes, a_tag_location: str) -> Iterable[str]:
+    """
+    Liest die Seite ereignisbasiert und verwirft abgeschlossene Elemente sofort, sodass nie
+    der vollständige Baum im Speicher liegt. Unterstützt nur einfache Klassennamen.
+    """
+    class_name = a_tag_location.strip()
+    if not CLASS_NAME_PATTERN.match(class_name):
+        # Vollständige CSS-Selektoren benötigen den Baum
+        yield from _extract_with_lxml(content, a_tag_location)
+        return
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    chunk_size = 64 * 1024
+    for offset in range(0, len(content), chunk_size):
+        parser.feed(content[offset:offset + chunk_size])
+        for event, element in parser.read_events():
+            if event == "start":
+                if element.tag == "a" and class_name in (element.get("class") or "").split():
+                    yield element.get("href")
+            else:
+                element.clear(keep_tail=True)
+                # Bereits verarbeitete Geschwister-Elemente aus dem Baum entfernen
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    parser.close()
+
+
+BACKENDS: Dict[str, Callable[[bytes, str], Iterable[str]]] = {
+    "bs4": _extract_with_bs4,
+    "lxml": _extract_with_lxml,
+    "stream": _extract_with_stream,
+}
+
+
+class LinkExtractor:
+    """
+    Extrahiert die Artikel-Links einer Listenseite über ein austauschbares Parser-Backend:
+
+        "bs4":    BeautifulSoup mit "html.parser" (bisheriges Verhalten, langsam)
+        "lxml":   lxml mit einmalig kompilierten CSS-Selektoren (Standard)
+        "stream": ereignisbasiertes Lesen mit lxml ohne vollständigen Baum
+
+    a_tag_location_css kann ein einfacher Klassenname oder ein vollständiger CSS-Selektor sein.
+    Relative Links werden gegen die URL der Seite aufgelöst, Duplikate entfernt.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        backend (str): Name des verwendeten Backends.
+    """
+
+    def __init__(self, config: Config, backend: str = None):
+        """
+        Initialisiert die LinkExtractor-Instanz. Standardmäßig wird Config.link_extractor_backend verwendet.
+        """
+        self.config = config
+        self.backend = backend or config.link_extractor_backend
+        if self.backend not in BACKENDS:
+            raise ValueError(
+                f"unknown link extractor backend '{self.backend}', choose from {list(BACKENDS)}"
+            )
+
+    def extract(self, content: bytes, base_url: str, a_tag_location: str) -> List[str]:
+        """
+        Extrahiert die Links einer Seite.
+
+        Args:
+            content (bytes): Der HTML-Inhalt der Seite.
+            base_url (str): Die URL der Seite zum Auflösen relativer Links.
+            a_tag_location (str): Klassenname oder CSS-Selektor der gesuchten a-Tags.
+
+        Returns:
+            List[str]: Die absoluten Links ohne Duplikate in der Reihenfolge des Auftretens.
+        """
+        links, seen_links = [], set()
+        if not content:
+            return links
+        for href in BACKENDS[self.backend](content, a_tag_location):
+            href = (href or "").strip()
+            if not href or href.startswith(("#", "javascript:", "mailto:")):
+                continue
+            link = urljoin(base_url, href)
+            if link not in seen_links:
+                seen_links.add(link)
+                links.append(link)
+        return links
@@ -0,0 +1,205 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from config import Config
+from src.parser.link_extractor import LinkExtractor
+from src.parser.source_spec import SourcePlan
+from src.utils.async_fetcher import AsyncFetcher, FetchResult
+
+
+class HttpPaginator:
+    """
+    Paginierung per HTTP ohne Selenium. Die Strategie wird pro Quelle in urls.json unter
+    "pagination" festgelegt:
+
+        "url_template": Seiten-URLs nach Muster, z. B. {"template": "{url}page/{page}/"}
+        "query_param":  Hochzählen eines Query-Parameters, z. B. {"param": "page"}
+        "rel_next":     Folgen des rel="next"-Links bzw. des Buttons aus page_button_location
+
+    Die Paginierung endet nach "max_pages" Seiten, bei einem Fehler (z. B. 404) oder wenn eine
+    Seite keine neuen Sublinks mehr enthält. Die dabei gefundenen Sublinks werden direkt
+    übernommen, sodass die Seiten für get_links_from_main_urls nicht erneut geladen werden.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        fetcher (AsyncFetcher): Der Fetcher für die Seitenabrufe.
+        link_extractor (LinkExtractor): Extrahiert die Sublinks der Seiten.
+    """
+
+    def __init__(self, config: Config, fetcher: AsyncFetcher):
+        """
+        Initialisiert die HttpPaginator-Instanz.
+        """
+        self.config = config
+        self.fetcher = fetcher
+        self.link_extractor = LinkExtractor(config=config)
+
+    def paginate(self, source: SourcePlan) -> None:
+        """
+        Paginiert eine Quelle und speichert die Seiten in source.pages und die gefundenen
+        Links in source.sublinks.
+
+        Args:
+            source (SourcePlan): Eine Quelle mit HTTP-Strategie.
+        """
+        pages_links, sublinks = asyncio.run(self._collect_pages(source))
+
+        source.pages = pages_links
+        source.sublinks = sublinks
+        logger.info(
+            f"{len(pages_links)} pages and {len(sublinks)} sublinks found via "
+            f"{source.pagination_strategy} for {pages_links[0] if pages_links else source.name}"
+        )
+
+    async def _collect_pages(self, source: SourcePlan) -> Tuple[List, List]:
+        pages_links, sublinks = [], []
+        async with self.fetcher.session() as fetch:
+            async for page_url, new_links in self.iter_pages(source, fetch):
+                pages_links.append(page_url)
+                sublinks += new_links
+        return pages_links, sublinks
+
+    async def iter_pages(
+        self, source: SourcePlan, fetch: Callable[[str], Awaitable[FetchResult | None]]
+    ) -> AsyncIterator[Tuple[str, List]]:
+        """
+        Paginiert eine Quelle und gibt jede Seite mit ihren neuen Sublinks zurück, sobald sie
+        geladen ist, z. B. damit der CrawlOrchestrator die Artikel schon während der
+        Paginierung herunterlädt.
+
+        Args:
+            source (SourcePlan): Eine Quelle mit HTTP-Strategie.
+            fetch (Callable): Die Abruffunktion aus AsyncFetcher.session.
+
+        Yields:
+            Tuple[str, List]: Die URL der Seite und die darauf neu gefundenen Sublinks.
+        """
+        # Von der StrategyProbe auf HTTP umgestellte Browser-Quellen behalten das Selenium-Limit
+        if source.spec.pagination.get("strategy") is None:
+            default_max_pages = self.config.selenium_max_pages
+        else:
+            default_max_pages = self.config.pagination_max_pages
+        max_pages = source.spec.pagination.get("max_pages", default_max_pages)
+
+        if source.pagination_strategy == "rel_next":
+            pages = self._follow_next_links(source, max_pages, fetch)
+        else:
+            pages = self._crawl_generated_pages(source, max_pages, fetch)
+        async for page in pages:
+            yield page
+
+    async def _crawl_generated_pages(
+        self, source: SourcePlan, max_pages: int, fetch: Callable
+    ) -> AsyncIterator[Tuple[str, List]]:
+        """
+        Lädt die generierten Seiten-URLs blockweise nebenläufig, bis eine Abbruchbedingung greift.
+        """
+        page_urls = self._generate_page_urls(source)
+        seen_links = set()
+        batch_size = self.config.max_requests_per_host
+        n_pages = 0
+
+        while n_pages < max_pages:
+            batch = [
+                next(page_urls)
+                for _ in range(min(batch_size, max_pages - n_pages))
+            ]
+            results = await asyncio.gather(*(fetch(page_url) for page_url in batch))
+            for page_url, result in zip(batch, results):
+                new_links = self._new_sublinks(source, result, seen_links)
+                if new_links is None:
+                    return
+                n_pages += 1
+                yield page_url, new_links
+
+    async def _follow_next_links(
+        self, source: SourcePlan, max_pages: int, fetch: Callable
+    ) -> AsyncIterator[Tuple[str, List]]:
+        """
+        Folgt Seite für Seite dem Link zur nächsten Seite.
+        """
+        pages_links, seen_links = [], set()
+        page_url = source.spec.urls[0]
+
+        while page_url and page_url not in pages_links and len(pages_links) < max_pages:
+            result = await fetch(page_url)
+            new_links = self._new_sublinks(source, result, seen_links)
+            if new_links is None:
+                break
+            pages_links.append(page_url)
+            yield page_url, new_links
+            page_url = self.find_next_url(
+                BeautifulSoup(result.content, "html.parser"),
+                result.final_url,
+                source.spec.page_button_location,
+            )
+
+    def _generate_page_urls(self, source: SourcePlan) -> Iterator[str]:
+        """
+        Erzeugt die URLs der Folgeseiten. Die erste Seite ist immer die konfigurierte URL.
+        """
+        options = source.spec.pagination
+        first_url = source.spec.urls[0]
+        page_nr = options.get("start", 2)
+        step = options.get("step", 1)
+
+        yield first_url
+        while True:
+            if source.pagination_strategy == "url_template":
+                yield options["template"].format(url=first_url, page=page_nr)
+            else:
+                split_url = urlsplit(first_url)
+                query = dict(parse_qsl(split_url.query, keep_blank_values=True))
+                query[options.get("param", "page")] = str(page_nr)
+                yield urlunsplit(split_url._replace(query=urlencode(query)))
+            page_nr += step
+
+    def _new_sublinks(self, source: SourcePlan, result: FetchResult | None, seen_links: set) -> List | None:
+        """
+        Extrahiert die neuen Sublinks einer Seite.
+
+        Returns:
+            List | None: Die neuen Links oder None, falls die Paginierung enden soll
+            (Seite nicht ladbar oder ohne neue Sublinks).
+        """
+        if result is None or not result.ok:
+            status_code = result.status_code if result else None
+            logger.info(f"pagination stopped, status code -> {status_code}")
+            return None
+
+        a_tag_location = source.spec.a_tag_location_css
+        if not a_tag_location:
+            return []
+
+        start = time.perf_counter()
+        page_links = self.link_extractor.extract(result.content, result.final_url, a_tag_location)
+        self.fetcher.metrics.record_parse("links", time.perf_counter() - start)
+
+        new_links = [link for link in page_links if link not in seen_links]
+        if not new_links:
+            logger.info(f"pagination stopped, no new sublinks on {result.url}")
+            return None
+
+        seen_links.update(new_links)
+        return new_links
+
+    @staticmethod
+    def find_next_url(soup: BeautifulSoup, page_url: str, button_location: str) -> str | None:
+        """
+        Sucht den Link zur nächsten Seite: zuerst rel="next", dann das Element mit der
+        CSS-Klasse aus page_button_location.
+        """
+        next_tag = soup.find(["link", "a"], rel="next")
+        if not next_tag and button_location:
+            next_tag = soup.find(class_=button_location)
+            if next_tag and not next_tag.get("href"):
+                next_tag = next_tag.find("a", href=True)
+
+        if next_tag and next_tag.get("href"):
+            return urljoin(page_url, next_tag["href"])
+        return None
@@ -0,0 +1,371 @@
+import json
+import re
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import pandas as pd
+
+from src.parser.link_extractor import compile_selector, to_css_selector
+from src.utils.async_fetcher import AsyncFetcher
+
+# Strategien, die ohne Browser per HTTP paginieren
+HTTP_STRATEGIES = ("url_template", "query_param", "rel_next")
+# Schlüssel aus urls.json, die kein gültiger Python-Name sind
+FIELD_ALIASES = {"pop-up-button-id": "popup_button_id", "url": "urls"}
+
+BOOL_FIELDS = {"selenium", "bs4", "pandas", "newspaper3K", "paginated"}
+NUMBER_FIELDS = {"requests_per_second": float, "burst": int, "cache_ttl": float}
+DICT_FIELDS = {"pagination", "tables", "discovery"}
+
+PAGINATION_KEYS = {"strategy", "template", "param", "start", "step", "max_pages"}
+TABLE_KEYS = {"selector", "index", "match", "thousands", "dtypes"}
+DISCOVERY_KEYS = {"sitemaps", "feeds", "max_age_days", "max_links", "match"}
+
+
+def _freeze(value):
+    # Verschachtelte Optionen unveränderlich: dict -> MappingProxyType, list -> tuple
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    # Umkehrung von _freeze, z. B. für json.dumps
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class SourceSpec:
+    """
+    Geprüfte Konfiguration einer Quelle aus urls.json bzw. urls.csv. Unbekannte Schlüssel
+    und falsche Typen werden beim Laden gemeldet, nicht erst beim ersten Zugriff im Crawl.
+    Die Optionen (pagination, tables, discovery) sind wie die übrigen Felder unveränderlich
+    (MappingProxyType, Listen als Tupel).
+
+    Attributes:
+        name (str): Name der Quelle, Teil der Ausgabedateien.
+        urls (Tuple[str, ...]): Die Start-URL(s) ("url" in urls.json, String oder Liste).
+        selenium (bool): Quelle benötigt einen Browser.
+        bs4 (bool): Sublinks werden aus den Listenseiten extrahiert.
+        pandas (bool): Tabellen der Seite werden extrahiert.
+        newspaper3K (bool): Artikel der Sublinks werden mit Newspaper3K extrahiert.
+        paginated (bool): Die Listenseiten sind paginiert.
+        a_tag_location_css (str): Klassenname oder CSS-Selektor der Artikel-Links.
+        page_button_location (str): Klassenname des Buttons zur nächsten Seite.
+        popup_button_id (str): ID eines Pop-up-Buttons ("pop-up-button-id" in urls.json).
+        date_tag (str): Tag des Datums.
+        date_location (str): Klasse des Datums.
+        pagination (Mapping): Paginierungs-Optionen (siehe HttpPaginator).
+        tables (Mapping): Tabellen-Optionen (siehe TableExtractor).
+        discovery (Mapping): Links aus Sitemaps und Feeds statt aus den Listenseiten (siehe LinkDiscovery).
+        requests_per_second (float | None): Rate-Limit der Quelle.
+        burst (int | None): Burst des Rate-Limits der Quelle.
+        cache_ttl (float | None): Gültigkeit der Cache-Einträge der Quelle in Sekunden.
+    """
+
+    name: str
+    urls: Tuple[str, ...]
+    selenium: bool = False
+    bs4: bool = False
+    pandas: bool = False
+    newspaper3K: bool = False
+    paginated: bool = False
+    a_tag_location_css: str = ""
+    page_button_location: str = ""
+    popup_button_id: str = ""
+    date_tag: str = ""
+    date_location: str = ""
+    pagination: Mapping = field(default_factory=dict)
+    tables: Mapping = field(default_factory=dict)
+    discovery: Mapping = field(default_factory=dict)
+    requests_per_second: float | None = None
+    burst: int | None = None
+    cache_ttl: float | None = None
+
+    def __post_init__(self):
+        for name in DICT_FIELDS:
+            object.__setattr__(self, name, _freeze(getattr(self, name)))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SourceSpec":
+        """
+        Erstellt eine Quelle aus einem Eintrag aus urls.json.
+
+        Args:
+            data (dict): Der Eintrag mit den Schlüsseln aus urls.json.
+
+        Returns:
+            SourceSpec: Die geprüfte Quelle.
+
+        Raises:
+            ValueError: Mit allen Fehlern des Eintrags.
+        """
+        names = {spec_field.name for spec_field in fields(cls)}
+        values, errors = {}, []
+        for key, value in data.items():
+            name = FIELD_ALIASES.get(key, key)
+            if name not in names:
+                errors.append(f"unknown key {key!r}")
+                continue
+            if name == "urls" and isinstance(value, str):
+                value = [value]
+            if name == "page_button_location" and value == {}:
+                # Leeres Objekt in urls.json für Quellen ohne Button
+                value = None
+            if value is None:
+                continue
+            if not cls._has_type(name, value):
+                errors.append(f"{key!r} has an invalid value {value!r}")
+                continue
+            values[name] = tuple(value) if name == "urls" else value
+
+        for key in ("name", "url"):
+            if data.get(key) is None:
+                errors.append(f"missing key {key!r}")
+        if errors:
+            raise ValueError("; ".join(errors))
+        return cls(**values)
+
+    @staticmethod
+    def _has_type(name: str, value) -> bool:
+        if name == "name":
+            return isinstance(value, str) and bool(value.strip())
+        if name == "urls":
+            return isinstance(value, list) and bool(value) and all(isinstance(url, str) and url for url in value)
+        if name in BOOL_FIELDS:
+            return isinstance(value, bool)
+        if name in NUMBER_FIELDS:
+            return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+        if name in DICT_FIELDS:
+            return isinstance(value, dict)
+        return isinstance(value, str)
+
+    def configure_fetcher(self, fetcher: AsyncFetcher, urls: Iterable[str]) -> None:
+        """
+        Übernimmt Rate-Limit und Cache-TTL der Quelle für die Domains der übergebenen URLs,
+        z. B. für Sublinks auf weiteren Domains.
+        """
+        fetcher.configure_urls(urls, rate=self.requests_per_second, burst=self.burst, cache_ttl=self.cache_ttl)
+
+    def to_dict(self) -> dict:
+        """
+        Gibt die Quelle im Format von urls.json zurück, z. B. für die Aufgaben der TaskQueue.
+        """
+        keys = {name: key for key, name in FIELD_ALIASES.items()}
+        return {
+            keys.get(spec_field.name, spec_field.name): _thaw(getattr(self, spec_field.name))
+            for spec_field in fields(self)
+        }
+
+
+@dataclass(slots=True)
+class SourcePlan:
+    """
+    Vorbereitete Quelle für den Crawl: Strategie und Selektoren werden einmal beim Laden
+    festgelegt bzw. kompiliert, sodass Fehler vor dem ersten Abruf auffallen und pro Seite
+    nichts mehr nachgeschlagen werden muss. Die Felder pages und sublinks sind der
+    Fortschritt der Quelle im Lauf.
+
+    Attributes:
+        spec (SourceSpec): Die Konfiguration der Quelle.
+        pagination_strategy (str | None): "url_template", "query_param", "rel_next",
+            "selenium" oder None für nicht paginierte Quellen.
+        pages (List[str]): Die Listenseiten (nach der Paginierung alle besuchten Seiten).
+        sublinks (List[str] | None): Die gefundenen Artikel-Links, None solange die
+            Listenseiten noch nicht ausgewertet wurden.
+    """
+
+    spec: SourceSpec
+    pagination_strategy: str | None = None
+    pages: List[str] = field(default_factory=list)
+    sublinks: List[str] | None = None
+
+    @classmethod
+    def compile(cls, spec: SourceSpec) -> "SourcePlan":
+        """
+        Prüft Selektoren, reguläre Ausdrücke und Optionen einer Quelle und legt die
+        Paginierungs-Strategie fest.
+
+        Raises:
+            ValueError: Mit allen Fehlern der Quelle.
+        """
+        errors = []
+        if spec.a_tag_location_css:
+            try:
+                compile_selector(to_css_selector(spec.a_tag_location_css))
+            except Exception as err:
+                errors.append(f"invalid a_tag_location_css {spec.a_tag_location_css!r} - {err}")
+
+        strategy = None
+        if spec.paginated:
+            strategy = spec.pagination.get("strategy")
+            if strategy is None and spec.page_button_location:
+                strategy = "selenium"
+            elif strategy not in HTTP_STRATEGIES:
+                errors.append(
+                    f"paginated source needs 'pagination.strategy' in {HTTP_STRATEGIES} or 'page_button_location'"
+                )
+        errors += cls._pagination_errors(spec.pagination)
+        errors += cls._table_errors(spec.tables)
+        errors += cls._discovery_errors(spec.discovery)
+
+        if errors:
+            raise ValueError("; ".join(errors))
+        return cls(spec=spec, pagination_strategy=strategy, pages=list(spec.urls))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SourcePlan":
+        return cls.compile(SourceSpec.from_dict(data))
+
+    @staticmethod
+    def _pagination_errors(options: Mapping) -> List[str]:
+        errors = [f"unknown pagination key {key!r}" for key in options.keys() - PAGINATION_KEYS]
+        if options.get("strategy") == "url_template" and "{page}" not in options.get("template", ""):
+            errors.append("pagination strategy 'url_template' needs a 'template' containing {page}")
+        for key in ("start", "step", "max_pages"):
+            if key in options and (not isinstance(options[key], int) or options[key] < 1):
+                errors.append(f"pagination {key!r} must be a positive integer")
+        return errors
+
+    @staticmethod
+    def _table_errors(options: Mapping) -> List[str]:
+        errors = [f"unknown tables key {key!r}" for key in options.keys() - TABLE_KEYS]
+        if options.get("selector"):
+            try:
+                compile_selector(options["selector"])
+            except Exception as err:
+                errors.append(f"invalid tables selector {options['selector']!r} - {err}")
+        if options.get("match"):
+            try:
+                re.compile(options["match"])
+            except re.error as err:
+                errors.append(f"invalid tables match {options['match']!r} - {err}")
+        index = options.get("index")
+        if index is not None and not (
+            isinstance(index, int) or (isinstance(index, tuple) and all(isinstance(i, int) for i in index))
+        ):
+            errors.append("tables 'index' must be an integer or a list of integers")
+        for column, dtype in (options.get("dtypes") or {}).items():
+            try:
+                pd.api.types.pandas_dtype(dtype)
+            except TypeError:
+                errors.append(f"unknown dtype {dtype!r} for column {column!r}")
+        return errors
+
+    @staticmethod
+    def _discovery_errors(options: Mapping) -> List[str]:
+        errors = [f"unknown discovery key {key!r}" for key in options.keys() - DISCOVERY_KEYS]
+        if options and not (options.get("sitemaps") or options.get("feeds")):
+            errors.append("discovery needs 'sitemaps' or 'feeds'")
+        for key in ("sitemaps", "feeds"):
+            value = options.get(key)
+            if value is not None and not (
+                isinstance(value, str) or (isinstance(value, tuple) and all(isinstance(url, str) for url in value))
+            ):
+                errors.append(f"discovery {key!r} must be \"auto\", a URL or a list of URLs")
+        max_age_days = options.get("max_age_days")
+        if max_age_days is not None and (
+            not isinstance(max_age_days, (int, float)) or isinstance(max_age_days, bool) or max_age_days < 0
+        ):
+            errors.append("discovery 'max_age_days' must be a non-negative number or null")
+        if "max_links" in options and (not isinstance(options["max_links"], int) or options["max_links"] < 1):
+            errors.append("discovery 'max_links' must be a positive integer")
+        if options.get("match"):
+            try:
+                re.compile(options["match"])
+            except re.error as err:
+                errors.append(f"invalid discovery match {options['match']!r} - {err}")
+        return errors
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def http_strategy(self) -> str | None:
+        """
+        Die HTTP-Strategie der Quelle, None falls sie nicht oder per Selenium paginiert wird.
+        """
+        return self.pagination_strategy if self.pagination_strategy in HTTP_STRATEGIES else None
+
+    @property
+    def needs_browser(self) -> bool:
+        return self.pagination_strategy == "selenium"
+
+
+def compile_sources(entries: List[dict]) -> List[SourcePlan]:
+    """
+    Prüft alle Quellen und bereitet sie vor. Fehler aller Quellen werden gesammelt und
+    gemeinsam gemeldet, bevor irgendeine Seite abgerufen wird.
+
+    Args:
+        entries (List[dict]): Die Einträge aus urls.json bzw. urls.csv.
+
+    Returns:
+        List[SourcePlan]: Die vorbereiteten Quellen in der Reihenfolge der Datei.
+
+    Raises:
+        ValueError: Falls eine Quelle ungültig ist oder ein Name doppelt vorkommt.
+    """
+    plans, errors, names = [], [], set()
+    for position, entry in enumerate(entries):
+        label = entry.get("name") if isinstance(entry, dict) else None
+        label = label or f"entry {position}"
+        if not isinstance(entry, dict):
+            errors.append(f"{label}: must be an object")
+            continue
+        try:
+            plan = SourcePlan.from_dict(entry)
+        except ValueError as err:
+            errors.append(f"{label}: {err}")
+            continue
+        if plan.name in names:
+            errors.append(f"{label}: duplicate name")
+        names.add(plan.name)
+        plans.append(plan)
+
+    if errors:
+        raise ValueError("invalid source configuration:\n  " + "\n  ".join(errors))
+    return plans
+
+
+def configure_sources(fetcher: AsyncFetcher, sources: Iterable[SourcePlan]) -> None:
+    """
+    Übernimmt die quellenspezifischen Einstellungen (Rate-Limit, Cache-TTL) aus urls.json
+    für die Seiten und bereits gefundenen Sublinks der Quellen.
+
+    Args:
+        fetcher (AsyncFetcher): Der Fetcher des Laufs.
+        sources (Iterable[SourcePlan]): Die Quellen.
+    """
+    for source in sources:
+        source.spec.configure_fetcher(fetcher, source.pages + (source.sublinks or []))
+
+
+def parse_csv_row(row: Dict[str, str]) -> dict:
+    """
+    Wandelt eine Zeile aus urls.csv in einen Eintrag wie in urls.json um: leere Zellen
+    entfallen, Wahrheitswerte und Zahlen werden umgewandelt, "pagination", "tables" und
+    "discovery" enthalten JSON.
+    """
+    entry = {}
+    for key, value in row.items():
+        value = (value or "").strip()
+        if not key or not value:
+            continue
+        if key in BOOL_FIELDS:
+            entry[key] = value.lower() in ("true", "1", "yes")
+        elif key in NUMBER_FIELDS:
+            entry[key] = NUMBER_FIELDS[key](value)
+        elif key in DICT_FIELDS:
+            entry[key] = json.loads(value)
+        else:
+            entry[key] = value
+    return entry
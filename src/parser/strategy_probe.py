@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from config import Config
+from src.parser.link_extractor import LinkExtractor
+from src.parser.pagination import HttpPaginator
+from src.parser.source_spec import SourcePlan, SourceSpec
+from src.utils.async_fetcher import AsyncFetcher, FetchResult
+
+
+class StrategyProbe:
+    """
+    Prüft vor dem Start eines Browsers, ob eine per Selenium paginierte Quelle auch per HTTP
+    gelesen werden kann. Die erste Seite wird einfach abgerufen: Findet a_tag_location_css im
+    rohen HTML Artikel-Links und hat der Button aus page_button_location (bzw. ein rel="next")
+    einen Link zur nächsten Seite, wird die Quelle über die Strategie "rel_next" des
+    HttpPaginator paginiert. Nur wenn die Inhalte erst per JavaScript entstehen, bleibt es beim
+    Browser, der ein Vielfaches an CPU und Speicher benötigt.
+
+    Die Entscheidung wird pro Quelle in einer Datenbank gespeichert und erst nach
+    Config.strategy_probe_ttl Sekunden oder bei geänderten Selektoren erneut geprüft. Die
+    Datenbank wird erst angelegt, wenn eine Quelle tatsächlich geprüft wird.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        fetcher (AsyncFetcher): Der Fetcher für die Probe-Abrufe.
+        link_extractor (LinkExtractor): Prüft a_tag_location_css auf der abgerufenen Seite.
+    """
+
+    def __init__(self, config: Config, fetcher: AsyncFetcher):
+        """
+        Initialisiert die StrategyProbe-Instanz.
+        """
+        self.config = config
+        self.fetcher = fetcher
+        self.link_extractor = LinkExtractor(config=config)
+        self._connection: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        """
+        Öffnet die Datenbank beim ersten Zugriff und legt sie bei Bedarf an.
+        """
+        if self._connection is not None:
+            return self._connection
+        Path(self.config.strategy_probe_path).parent.mkdir(parents=True, exist_ok=True)
+        # Worker des verteilten Crawls auf demselben Rechner teilen sich die Datenbank
+        self._connection = sqlite3.connect(self.config.strategy_probe_path, timeout=30)
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS strategy_decisions (
+                name TEXT PRIMARY KEY,
+                spec_hash TEXT,
+                strategy TEXT,
+                decided_at REAL
+            );
+            """
+        )
+        return self._connection
+
+    def resolve(self, sources: List[SourcePlan]) -> None:
+        """
+        Prüft alle per Selenium paginierten Quellen nebenläufig und stellt die Quellen, die
+        ohne Browser auskommen, auf HTTP um.
+
+        Args:
+            sources (List[SourcePlan]): Die Quellen aus urls.json.
+        """
+        browser_sources = [source for source in sources if source.needs_browser]
+        if browser_sources:
+            asyncio.run(self._resolve(browser_sources))
+
+    async def _resolve(self, sources: List[SourcePlan]) -> None:
+        async with self.fetcher.session() as fetch:
+            await asyncio.gather(*(self.probe(source, fetch) for source in sources))
+
+    async def probe(
+        self, source: SourcePlan, fetch: Callable[[str], Awaitable[FetchResult | None]]
+    ) -> None:
+        """
+        Legt die Paginierungs-Strategie einer Quelle fest, die bisher einen Browser benötigt,
+        z. B. innerhalb des CrawlOrchestrator kurz vor ihrer Paginierung.
+
+        Args:
+            source (SourcePlan): Die Quelle, source.pagination_strategy wird ggf. angepasst.
+            fetch (Callable): Die Abruffunktion aus AsyncFetcher.session.
+        """
+        if not source.needs_browser:
+            return
+        spec_hash = self._spec_hash(source.spec)
+        strategy = self._cached(source.name, spec_hash)
+        if strategy is None:
+            result = await fetch(source.spec.urls[0])
+            if result is None or not result.ok:
+                # Keine Aussage möglich, die Quelle bleibt beim Browser und wird beim nächsten Mal geprüft
+                status_code = result.status_code if result else None
+                logger.warning(f"strategy probe failed for {source.name} - status code -> {status_code}")
+                return
+            strategy = self._decide(source, result)
+            self._store(source.name, spec_hash, strategy)
+
+        self.fetcher.metrics.incr("strategy_http" if strategy != "selenium" else "strategy_browser")
+        source.pagination_strategy = strategy
+
+    def _decide(self, source: SourcePlan, result: FetchResult) -> str:
+        """
+        Prüft die Selektoren der Quelle auf dem rohen HTML der ersten Seite.
+        """
+        spec = source.spec
+        if spec.a_tag_location_css and not self.link_extractor.extract(
+            result.content, result.final_url, spec.a_tag_location_css
+        ):
+            logger.info(f"{source.name} needs a browser, a_tag_location_css matches no links in the raw HTML")
+            return "selenium"
+
+        next_url = HttpPaginator.find_next_url(
+            BeautifulSoup(result.content, "html.parser"), result.final_url, spec.page_button_location
+        )
+        if not next_url or next_url == result.final_url:
+            logger.info(f"{source.name} needs a browser, no link to the next page in the raw HTML")
+            return "selenium"
+
+        logger.success(f"{source.name} can be paginated without a browser (rel_next)")
+        return "rel_next"
+
+    @staticmethod
+    def _spec_hash(spec: SourceSpec) -> str:
+        # Nur die Angaben, von denen die Entscheidung abhängt
+        key = [spec.urls[0], spec.a_tag_location_css, spec.page_button_location]
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+    def _cached(self, name: str, spec_hash: str) -> str | None:
+        row = self._db().execute(
+            "SELECT strategy FROM strategy_decisions WHERE name = ? AND spec_hash = ? AND decided_at > ?",
+            (name, spec_hash, time.time() - self.config.strategy_probe_ttl),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store(self, name: str, spec_hash: str, strategy: str) -> None:
+        self._db().execute(
+            "INSERT OR REPLACE INTO strategy_decisions VALUES (?, ?, ?, ?)",
+            (name, spec_hash, strategy, time.time()),
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,122 @@
+import re
+from io import StringIO
+from typing import Iterator, Tuple
+
+import pandas as pd
+from loguru import logger
+from lxml import etree, html
+
+from config import Config
+from src.parser.link_extractor import compile_selector
+
+NUMERIC_DTYPE_KINDS = "iuf"
+
+
+class TableExtractor:
+    """
+    Extrahiert Tabellen aus einer bereits abgerufenen Seite. Die Seite wird einmal mit lxml
+    geparst, anschließend werden nur die ausgewählten Tabellen mit Pandas in DataFrames
+    umgewandelt. Die Auswahl wird pro Quelle in urls.json unter "tables" festgelegt:
+
+        "selector": CSS-Selektor der Tabellen (oder ihres Containers), z. B. "table#medals"
+        "match":    Regulärer Ausdruck, der im Tabellenkopf (th) vorkommen muss, z. B. "Gold"
+        "index":    Position(en) unter allen Tabellen der Seite, z. B. 0 oder [0, 2]
+        "dtypes":   Datentypen pro Spalte, z. B. {"Gold": "Int64", "Country": "string"}
+        "thousands": Tausendertrennzeichen für numerische Spalten (Standard ",")
+
+    Ohne "tables" werden wie bisher alle Tabellen extrahiert. Die Tabellen werden einzeln
+    erzeugt, sodass immer nur eine Tabelle als DataFrame im Speicher liegt.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die TableExtractor-Instanz.
+        """
+        self.config = config
+
+    def extract(self, content: bytes, options: dict) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Extrahiert die ausgewählten Tabellen einer Seite.
+
+        Args:
+            content (bytes): Der HTML-Inhalt der Seite.
+            options (dict): Die Tabellen-Optionen der Quelle (siehe Klassenbeschreibung).
+
+        Yields:
+            Tuple[int, pd.DataFrame]: Position der Tabelle unter allen Tabellen der Seite und
+            die Tabelle als DataFrame.
+        """
+        if not content:
+            return
+        tree = html.fromstring(content)
+        # Die Position bezieht sich immer auf alle Tabellen, damit die Namen der Ausgabe
+        # unabhängig von der Auswahl stabil bleiben
+        positions = {table: index for index, table in enumerate(tree.iter("table"))}
+
+        if options.get("selector"):
+            # Trifft der Selektor einen Container, werden dessen Tabellen verwendet
+            tables = []
+            for element in compile_selector(options["selector"])(tree):
+                tables.extend([element] if element.tag == "table" else element.iter("table"))
+        else:
+            tables = list(positions)
+
+        index = options.get("index")
+        if index is not None:
+            indices = set(index) if isinstance(index, (list, tuple)) else {index}
+            tables = [table for table in tables if positions[table] in indices]
+
+        if options.get("match"):
+            pattern = re.compile(options["match"])
+            tables = [table for table in tables if pattern.search(self._header_text(table))]
+
+        logger.info(f"tables selected: {len(tables)} of {len(positions)}")
+        for table in tables:
+            table_df = self._read_table(table, options.get("thousands", ","))
+            if table_df is not None:
+                yield positions[table], self._apply_dtypes(table_df, options.get("dtypes") or {})
+
+    @staticmethod
+    def _header_text(table: html.HtmlElement) -> str:
+        headers = table.xpath(".//th")
+        # Tabellen ohne th: erste Zeile als Kopf verwenden
+        if not headers:
+            headers = table.xpath(".//tr[1]/td")
+        return " ".join(header.text_content().strip() for header in headers)
+
+    @staticmethod
+    def _read_table(table: html.HtmlElement, thousands: str) -> pd.DataFrame | None:
+        """
+        Wandelt eine einzelne Tabelle mit read_html um (übernimmt colspan/rowspan und Kopfzeilen).
+        """
+        table_html = etree.tostring(table, encoding="unicode", with_tail=False)
+        try:
+            return pd.read_html(StringIO(table_html), flavor="lxml", thousands=thousands)[0]
+        except (ValueError, IndexError) as err:
+            logger.warning(f"table could not be read - {err}")
+            return None
+
+    @staticmethod
+    def _apply_dtypes(table_df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+        """
+        Wendet die Datentypen aus "dtypes" spaltenweise an. Numerische Spalten werden vorher
+        bereinigt, nicht umwandelbare Werte werden zu fehlenden Werten.
+        """
+        for column, dtype in dtypes.items():
+            if column not in table_df.columns:
+                logger.warning(f"dtype hint for unknown column '{column}'")
+                continue
+            try:
+                if pd.api.types.pandas_dtype(dtype).kind in NUMERIC_DTYPE_KINDS:
+                    values = table_df[column]
+                    if not pd.api.types.is_numeric_dtype(values):
+                        values = values.astype("string").str.replace(r"[^\d.eE+-]", "", regex=True)
+                    table_df[column] = pd.to_numeric(values, errors="coerce").astype(dtype)
+                else:
+                    table_df[column] = table_df[column].astype(dtype)
+            except (TypeError, ValueError) as err:
+                logger.warning(f"column '{column}' could not be converted to {dtype} - {err}")
+        return table_df
@@ -0,0 +1,148 @@
+import datetime
+from pathlib import Path
+from typing import List
+from urllib.parse import quote
+
+import pandas as pd
+
+from config import Config
+
+# pyarrow ist optional und wird nur für export_format "parquet" bzw. "arrow" benötigt
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def article_schema() -> "pa.Schema":
+    """
+    Festes Schema der Artikel-Ausgabe, damit alle Dateien eines Datasets dasselbe Schema haben,
+    auch wenn z. B. in einem Block kein Artikel ein Datum hat. "name" steckt im Partitionspfad.
+    """
+    return pa.schema(
+        [
+            ("article_link", pa.string()),
+            ("title", pa.string()),
+            ("date", pa.timestamp("us", tz="UTC")),
+            ("article", pa.string()),
+            ("tags", pa.string()),
+            # Nur mit Config.dedup_action = "tag" gefüllt
+            ("duplicate_of", pa.string()),
+        ]
+    )
+
+
+class ArrowWriter:
+    """
+    Schreibt Ergebnisse spaltenorientiert als Parquet oder Arrow IPC (Feather v2), komprimiert
+    mit Config.export_compression. Die Dateien werden nach Quelle und Crawl-Datum partitioniert
+    (Hive-Layout), Artikel und Tabellen liegen in getrennten Datasets:
+
+        output/articles/name=<quelle>/crawl_date=<YYYY-MM-DD>/part-<run_id>-<nr>.parquet
+        output/tables/name=<tabelle>/crawl_date=<YYYY-MM-DD>/part-<run_id>-<nr>.parquet
+
+    Artikel haben ein festes Schema (article_schema), Tabellen behalten die von Pandas
+    erkannten Typen, die Spaltennamen werden als Strings gespeichert.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        run_id (str): Kennung des Laufs, Teil der Dateinamen.
+        file_format (str): "parquet" oder "arrow".
+    """
+
+    def __init__(self, config: Config, run_id: str, file_format: str):
+        """
+        Initialisiert die ArrowWriter-Instanz.
+        """
+        if pa is None:
+            raise ImportError(
+                f"export_format '{file_format}' requires the optional package pyarrow (pip install pyarrow)"
+            )
+        self.config = config
+        self.run_id = run_id
+        self.file_format = file_format
+        self.extension = FILE_EXTENSIONS[file_format]
+        self.crawl_date = datetime.date.today().isoformat()
+        self._schema = article_schema()
+        self._n_parts = {}
+
+    def _source_path(self, dataset: str, name: str) -> Path:
+        return self.config.output_path.joinpath(dataset, f"name={quote(str(name), safe='')}")
+
+    def _existing_parts(self, dataset: str, name: str) -> List[Path]:
+        """
+        Die Dateien dieses Laufs für eine Quelle, auch aus früheren Crawl-Daten.
+        """
+        return sorted(
+            self._source_path(dataset, name).glob(f"crawl_date=*/part-{self.run_id}-*.{self.extension}")
+        )
+
+    def exists(self, name: str) -> bool:
+        return bool(self._existing_parts("articles", name) or self._existing_parts("tables", name))
+
+    def read_keys(self, name: str, key_column: str) -> set:
+        """
+        Liest die Schlüssel der bereits geschriebenen Artikel einer Quelle.
+        """
+        keys = set()
+        for path in self._existing_parts("articles", name):
+            keys.update(self._read(path, columns=[key_column]).column(key_column).to_pylist())
+        return keys
+
+    def _read(self, path: Path, columns: List[str]) -> "pa.Table":
+        if self.file_format == "parquet":
+            return pq.read_table(path, columns=columns)
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all().select(columns)
+
+    def write_records(self, name: str, records: List[dict]) -> None:
+        """
+        Schreibt einen Block Artikel mit festem Schema.
+        """
+        self._write(
+            "articles", name, pa.Table.from_pylist(records, schema=self._schema)
+        )
+
+    def write_frame(self, name: str, frame: pd.DataFrame) -> None:
+        """
+        Schreibt eine Tabelle. Die Spalte "name" steckt im Partitionspfad und entfällt.
+        """
+        frame = frame.drop(columns="name", errors="ignore")
+        # read_html liefert teils Zahlen oder Tupel als Spaltennamen
+        frame.columns = [" ".join(map(str, col)) if isinstance(col, tuple) else str(col) for col in frame.columns]
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Gemischte Werte in einer Spalte (z. B. Zahlen und Text) als Text speichern
+            object_columns = frame.select_dtypes(include="object").columns
+            table = pa.Table.from_pandas(frame.astype({col: "string" for col in object_columns}), preserve_index=False)
+        self._write("tables", name, table)
+
+    def _write(self, dataset: str, name: str, table: "pa.Table") -> None:
+        partition_path = self._source_path(dataset, name).joinpath(f"crawl_date={self.crawl_date}")
+        partition_path.mkdir(parents=True, exist_ok=True)
+
+        # Beim Fortsetzen nach den Dateien des abgebrochenen Laufs weiterzählen
+        if (dataset, name) not in self._n_parts:
+            self._n_parts[(dataset, name)] = len(self._existing_parts(dataset, name))
+        part_nr = self._n_parts[(dataset, name)]
+        self._n_parts[(dataset, name)] += 1
+
+        path = partition_path.joinpath(f"part-{self.run_id}-{part_nr:05d}.{self.extension}")
+        # Erst vollständig schreiben, dann umbenennen, damit nach einem Absturz keine
+        # unlesbaren Dateien im Dataset liegen
+        tmp_path = path.with_suffix(".tmp")
+        if self.file_format == "parquet":
+            pq.write_table(table, tmp_path, compression=self.config.export_compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.config.export_compression)
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        tmp_path.replace(path)
+
+    def close(self) -> None:
+        pass
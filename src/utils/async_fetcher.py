@@ -0,0 +1,351 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+import requests as rq
+from loguru import logger
+
+from config import Config
+from src.utils.http_cache import CacheEntry, HttpCache
+from src.utils.host_health import HostHealth
+from src.utils.http_client import HttpClient
+from src.utils.metrics import Metrics
+from src.utils.rate_limiter import THROTTLE_STATUS_CODES, DomainRateLimiter
+
+
+@dataclass
+class FetchResult:
+    """
+    Ergebnis eines einzelnen HTTP-Abrufs.
+
+    Attributes:
+        url (str): Die angefragte URL.
+        final_url (str): Die URL nach eventuellen Weiterleitungen.
+        status_code (int): Der HTTP-Statuscode der Antwort.
+        content (bytes): Der unverarbeitete Inhalt der Antwort.
+        text (str): Der dekodierte Inhalt der Antwort.
+        headers (dict): Die Header der Antwort.
+        from_cache (bool): True, falls der Inhalt aus dem HttpCache stammt.
+        timings (Dict[str, float]): Dauer von Verbindungsaufbau, Time to First Byte und
+            Download in Sekunden (leer bei Cache-Treffern).
+    """
+
+    url: str
+    final_url: str
+    status_code: int
+    content: bytes
+    text: str
+    headers: dict = field(default_factory=dict)
+    from_cache: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_cache_entry(cls, entry: CacheEntry) -> "FetchResult":
+        return cls(
+            url=entry.url,
+            final_url=entry.final_url,
+            status_code=entry.status_code,
+            content=entry.content,
+            text=entry.text,
+            headers=entry.headers,
+            from_cache=True,
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+class AsyncFetcher:
+    """
+    Ruft viele URLs nebenläufig ab. Die Anzahl gleichzeitiger Anfragen wird global
+    und pro Host begrenzt, die Ergebnisse werden in der Reihenfolge der Eingabe zurückgegeben.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        http_client (HttpClient): Die gemeinsam genutzte HTTP-Schicht.
+        rate_limiter (DomainRateLimiter): Der Rate-Limiter pro Domain.
+        cache (HttpCache | None): Der persistente HTTP-Cache, None falls deaktiviert.
+        metrics (Metrics): Sammelt die Messwerte der Abrufe.
+        host_health (HostHealth): Backoff und Circuit Breaker pro Host.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        http_client: HttpClient = None,
+        rate_limiter: DomainRateLimiter = None,
+        cache: HttpCache = None,
+        metrics: Metrics = None,
+    ):
+        """
+        Initialisiert die AsyncFetcher-Instanz. Ohne übergebenen HttpClient, DomainRateLimiter,
+        HttpCache bzw. Metrics werden eigene erzeugt (der Cache nur, falls Config.cache_enabled).
+        """
+        self.config = config
+        self.http_client = http_client or HttpClient(config=config)
+        self.rate_limiter = rate_limiter or DomainRateLimiter(
+            config=config, http_client=self.http_client
+        )
+        if cache is None and config.cache_enabled:
+            cache = HttpCache(config=config)
+        self.cache = cache
+        self.metrics = metrics or Metrics(config=config)
+        self.host_health = HostHealth(config=config)
+
+    def configure_urls(
+        self, urls: Iterable[str], rate: float = None, burst: int = None, cache_ttl: float = None
+    ) -> None:
+        """
+        Setzt Rate-Limit und Cache-TTL für die Domains der übergebenen URLs, z. B. die
+        Einstellungen einer Quelle aus urls.json (siehe configure_sources in source_spec.py).
+
+        Args:
+            urls (Iterable[str]): Die URLs.
+            rate (float): Anfragen pro Sekunde (None = Standard aus der Config).
+            burst (int): Größe des Bursts (None = Standard aus der Config).
+            cache_ttl (float): Gültigkeit der Cache-Einträge in Sekunden (None = Config.cache_ttl).
+        """
+        urls = list(urls)
+        self.rate_limiter.configure_urls(urls, rate, burst)
+        if self.cache:
+            self.cache.configure_urls(urls, cache_ttl)
+
+    def fetch_all(
+        self,
+        urls: List[str],
+        per_host_limit: int = None,
+        throttle: bool = False,
+        on_result: Callable[[int, FetchResult | None], None] = None,
+    ) -> List[FetchResult | None]:
+        """
+        Ruft alle übergebenen URLs nebenläufig ab.
+
+        Antworten mit 429/503 werden an den Rate-Limiter gemeldet und bis zu
+        Config.http_retries mal wiederholt, sobald der Host wieder angefragt werden darf.
+        Verbindungsfehler und Statuscodes aus Config.http_retry_status_codes werden nach
+        einem Backoff mit Jitter wiederholt (siehe HostHealth). Ist der Circuit Breaker eines
+        Hosts geöffnet, werden seine URLs ohne Anfrage mit None beantwortet.
+
+        Args:
+            urls (List[str]): Die abzurufenden URLs.
+            per_host_limit (int): Maximale Anzahl gleichzeitiger Anfragen pro Host.
+                Standardmäßig Config.max_requests_per_host.
+            throttle (bool): Bei True wird die Rate pro Domain über den DomainRateLimiter
+                eingehalten (Höflichkeitspausen, z. B. für Artikel-Downloads).
+            on_result (Callable[[int, FetchResult | None], None]): Optionale Funktion, die
+                sofort nach jedem einzelnen Abruf mit Index und Ergebnis aufgerufen wird,
+                z. B. um die Weiterverarbeitung zu starten, bevor alle Abrufe fertig sind.
+
+        Returns:
+            List[FetchResult | None]: Ein Ergebnis pro URL in der Reihenfolge der Eingabe,
+            None falls die Anfrage fehlgeschlagen ist.
+        """
+        if not urls:
+            return []
+        return asyncio.run(self._fetch_all(urls, per_host_limit, throttle, on_result))
+
+    async def _fetch_all(
+        self,
+        urls: List[str],
+        per_host_limit: int | None,
+        throttle: bool,
+        on_result: Callable[[int, FetchResult | None], None] | None,
+    ) -> List[FetchResult | None]:
+        async with self.session(per_host_limit) as fetch_url:
+
+            async def fetch(index: int, url: str) -> FetchResult | None:
+                result = await fetch_url(url, throttle)
+                if on_result:
+                    on_result(index, result)
+                return result
+
+            return await asyncio.gather(
+                *(fetch(index, url) for index, url in enumerate(urls))
+            )
+
+    @asynccontextmanager
+    async def session(
+        self, per_host_limit: int = None
+    ) -> AsyncIterator[Callable[[str, bool], Awaitable[FetchResult | None]]]:
+        """
+        Stellt innerhalb einer laufenden Event-Loop eine Funktion `fetch(url, throttle=False)`
+        bereit. Alle Abrufe darüber teilen sich Thread-Pool sowie globales Limit und Limit pro
+        Host, sodass mehrere Stufen gleichzeitig abrufen können (siehe CrawlOrchestrator).
+
+        Args:
+            per_host_limit (int): Maximale Anzahl gleichzeitiger Anfragen pro Host.
+                Standardmäßig Config.max_requests_per_host.
+
+        Yields:
+            Callable[[str, bool], Awaitable[FetchResult | None]]: Die Abruffunktion.
+        """
+        max_workers = self.config.max_concurrent_requests
+        global_limit = asyncio.Semaphore(max_workers)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        per_host_limit = per_host_limit or self.config.max_requests_per_host
+        loop = asyncio.get_running_loop()
+        prepared: Dict[str, asyncio.Future] = {}
+
+        # requests ist blockierend, daher laufen die Anfragen in einem eigenen Thread-Pool
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            async def fetch(url: str, throttle: bool = False) -> FetchResult | None:
+                # robots.txt und Bucket einmal pro Host vorbereiten, ohne die Loop zu blockieren
+                host = urlsplit(url).netloc
+                if host not in prepared:
+                    prepared[host] = loop.run_in_executor(
+                        executor, self.rate_limiter.prepare, [url]
+                    )
+                await prepared[host]
+                return await self._fetch_one(
+                    url, executor, global_limit, host_limits, per_host_limit, throttle
+                )
+
+            yield fetch
+
+    async def _fetch_one(
+        self,
+        url: str,
+        executor: ThreadPoolExecutor,
+        global_limit: asyncio.Semaphore,
+        host_limits: Dict[str, asyncio.Semaphore],
+        per_host_limit: int,
+        throttle: bool,
+    ) -> FetchResult | None:
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            self.metrics.record_fetch(url, entry.status_code, cache="hit")
+            return FetchResult.from_cache_entry(entry)
+        if self.config.cache_only:
+            logger.warning(f"url not found in cache (cache-only mode) -> {url}")
+            self.metrics.record_fetch(url, 504, cache="miss")
+            return FetchResult(
+                url=url, final_url=url, status_code=504, content=b"", text="", from_cache=True
+            )
+
+        host = urlsplit(url).netloc
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host_limit))
+        loop = asyncio.get_running_loop()
+        cache_state = "off" if not self.cache else "miss"
+        throttle_wait, retries = 0.0, 0
+        result = None
+
+        for attempt in range(self.config.http_retries + 1):
+            # Erst den Host-Slot, dann den globalen Slot belegen, damit wartende Anfragen
+            # an einen ausgelasteten Host keine globalen Slots blockieren
+            async with host_limit:
+                # Erst mit dem Slot prüfen, damit auch wartende Anfragen den Breaker beachten
+                if not self.host_health.allow(url):
+                    logger.warning(f"circuit open for {host}, skipping {url}")
+                    if attempt == 0:
+                        return None
+                    break
+                wait = self.rate_limiter.reserve(url, throttle=throttle)
+                if wait > 0:
+                    throttle_wait += wait
+                    await asyncio.sleep(wait)
+                async with global_limit:
+                    try:
+                        result = await loop.run_in_executor(
+                            executor, self._get, url, entry
+                        )
+                    except rq.RequestException as err:
+                        logger.error(f"request failed for url {url} - Error: {err}")
+                        result = None
+
+            status_code = result.status_code if result else None
+            self.host_health.record(url, status_code)
+            if result is not None:
+                self.rate_limiter.report(url, status_code, result.headers.get("Retry-After"))
+            retryable = (
+                status_code is None
+                or status_code in THROTTLE_STATUS_CODES
+                or status_code in self.config.http_retry_status_codes
+            )
+            if not retryable or attempt == self.config.http_retries:
+                break
+
+            retries += 1
+            self.host_health.record_retry(url)
+            # Bei 429/503 wartet der Rate-Limiter (Retry-After), sonst Backoff mit Jitter
+            # außerhalb der Slots, damit andere Hosts weiter abgerufen werden
+            delay = 0.0 if status_code in THROTTLE_STATUS_CODES else self.host_health.backoff(url, attempt)
+            logger.warning(
+                f"retrying {url} in {delay:.1f} s ({attempt + 1}/{self.config.http_retries}) "
+                f"- status code -> {status_code}"
+            )
+            if delay:
+                await asyncio.sleep(delay)
+
+        if result is None:
+            self.metrics.record_fetch(
+                url, None, cache_state, retries=retries, throttle_wait=throttle_wait
+            )
+            return None
+        self.metrics.record_fetch(
+            url,
+            result.status_code,
+            "revalidated" if result.from_cache else cache_state,
+            timings=result.timings,
+            n_bytes=0 if result.from_cache else len(result.content),
+            retries=retries,
+            throttle_wait=throttle_wait,
+        )
+        return result
+
+    def _get(self, url: str, entry: CacheEntry | None = None) -> FetchResult:
+        """
+        Führt die eigentliche Anfrage aus (im Thread-Pool). Liegt ein abgelaufener Cache-Eintrag
+        vor, wird bedingt angefragt und bei 304 der gespeicherte Inhalt verwendet.
+        """
+        start = time.perf_counter()
+        if not self.cache:
+            req = self.http_client.get(url)
+        else:
+            req = self.http_client.get(url, headers=self.cache.conditional_headers(entry))
+        timings = self._timings(req, time.perf_counter() - start)
+
+        if self.cache:
+            if req.status_code == 304 and entry:
+                self.cache.touch(url)
+                result = FetchResult.from_cache_entry(entry)
+                result.timings = timings
+                return result
+            self.cache.store(
+                url=url,
+                final_url=req.url,
+                status_code=req.status_code,
+                headers=req.headers,
+                encoding=req.encoding or req.apparent_encoding,
+                content=req.content,
+            )
+
+        return FetchResult(
+            url=url,
+            final_url=req.url,
+            status_code=req.status_code,
+            content=req.content,
+            text=req.text,
+            headers=req.headers,
+            timings=timings,
+        )
+
+    @staticmethod
+    def _timings(req: rq.Response, total: float) -> Dict[str, float]:
+        """
+        Teilt die Dauer einer Anfrage in Verbindungsaufbau, Time to First Byte und Download auf.
+        response.elapsed reicht vom Senden bis zum Empfang der Header.
+        """
+        connect = getattr(req, "connect_seconds", 0.0)
+        elapsed = req.elapsed.total_seconds()
+        return {
+            "connect": connect,
+            "ttfb": max(0.0, elapsed - connect),
+            "download": max(0.0, total - elapsed),
+        }
+
@@ -1,16 +1,20 @@
-import datetime
+import csv
+import json
+import warnings
 from typing import List
 from loguru import logger
-import numpy as np
-import pandas as pd
 
 from config import Config
+from src.parser.checkpoint import CheckpointStore
+from src.parser.source_spec import SourcePlan, compile_sources, parse_csv_row
+from src.utils.result_sink import ResultSink
 
 
 class FileHandler:
     """
     Eine Klasse zur Handhabung der Konfigurationsdateien im CSV- und JSON-Format.
-    Sie liest Konfigurationsdaten aus diesen Dateien und konvertiert sie in eine nutzbare Form.
+    Sie liest Konfigurationsdaten aus diesen Dateien und prüft sie, bevor eine Seite
+    abgerufen wird.
     """
 
     def __init__(self, config: Config):
@@ -19,43 +23,106 @@ class FileHandler:
         """
         self.config = config
 
-    def create_main_url_dict_from_json(self) -> List:
+    def load_sources_from_json(self) -> List[SourcePlan]:
         """
-        Liest eine JSON-Konfigurationsdatei ein und konvertiert sie in eine Liste von Dictionaries.
+        Liest die Quellen aus der JSON-Konfigurationsdatei (Config.urls_json_path).
 
         Returns:
-            List: Eine Liste von Dictionaries, die Konfigurationsdaten enthalten.
+            List[SourcePlan]: Die geprüften und vorbereiteten Quellen.
+
+        Raises:
+            ValueError: Falls eine Quelle ungültig ist.
+        """
+        with open(self.config.urls_json_path, encoding=self.config.encoding) as file:
+            entries = json.load(file)
+        if not isinstance(entries, list):
+            raise ValueError(f"{self.config.urls_json_path} must contain a list of sources")
+        return self._compile(entries, self.config.urls_json_path)
+
+    def load_sources_from_csv(self) -> List[SourcePlan]:
         """
-        main_urls_df = pd.read_json(self.config.urls_json_path)
+        Liest die Quellen aus der CSV-Konfigurationsdatei (Config.urls_csv_path). Die Spalten
+        entsprechen den Schlüsseln aus urls.json.
 
-        main_urls_list = main_urls_df.to_dict("records")
-        return main_urls_list
+        Returns:
+            List[SourcePlan]: Die geprüften und vorbereiteten Quellen.
+
+        Raises:
+            ValueError: Falls eine Quelle ungültig ist.
+        """
+        # "utf-8-sig" entfernt ein BOM am Dateianfang (z. B. aus Excel)
+        encoding = "utf-8-sig" if self.config.encoding.lower() == "utf-8" else self.config.encoding
+        with open(self.config.urls_csv_path, encoding=encoding, newline="") as file:
+            entries = [parse_csv_row(row) for row in csv.DictReader(file, delimiter=self.config.delimiter)]
+        return self._compile(entries, self.config.urls_csv_path)
 
-    def create_main_url_dict_from_csv(self) -> List:
+    def create_main_url_dict_from_json(self) -> List[dict]:
         """
-        Liest eine CSV-Konfigurationsdatei ein und konvertiert sie in eine Liste von Dictionaries.
+        Veraltet, stattdessen load_sources_from_json verwenden.
 
         Returns:
-            List: Eine Liste von Dictionaries, die Konfigurationsdaten enthalten.
+            List[dict]: Die geprüften Quellen im Format von urls.json.
         """
-        main_urls_df = pd.read_csv(
-            self.config.urls_csv_path,
-            delimiter=self.config.delimiter,
-            encoding=self.config.encoding,
-        ).reset_index(drop=True)
+        warnings.warn(
+            "create_main_url_dict_from_json is deprecated, use load_sources_from_json",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return [source.spec.to_dict() for source in self.load_sources_from_json()]
+
+    def create_main_url_dict_from_csv(self) -> List[dict]:
+        """
+        Veraltet, stattdessen load_sources_from_csv verwenden.
 
-        # Stellt sicher, dass URLs als Listen formatiert sind
-        main_urls_df["url"] = main_urls_df["url"].apply(
-            lambda x: [x] if not isinstance(x, list) else x
+        Returns:
+            List[dict]: Die geprüften Quellen im Format von urls.json.
+        """
+        warnings.warn(
+            "create_main_url_dict_from_csv is deprecated, use load_sources_from_csv",
+            DeprecationWarning,
+            stacklevel=2,
         )
+        return [source.spec.to_dict() for source in self.load_sources_from_csv()]
+
+    @staticmethod
+    def _compile(entries: List[dict], path) -> List[SourcePlan]:
+        try:
+            sources = compile_sources(entries)
+        except ValueError as err:
+            raise ValueError(f"{path}: {err}") from None
+        logger.info(f"{len(sources)} sources loaded from {path}")
+        return sources
+
+    def open_result_sink(self, run_id: str = None, export_format: str = None) -> ResultSink:
+        """
+        Öffnet einen ResultSink, über den Artikel und Tabellen direkt bei ihrer Extraktion
+        pro Quelle geschrieben werden.
+
+        Args:
+            run_id (str): Kennung des Laufs für die Dateinamen. Mit der run_id eines
+                abgebrochenen Laufs werden dessen Dateien fortgesetzt.
+            export_format (str): "csv", "parquet" oder "arrow" (Standard: Config.export_format).
 
-        # Konvertiert boolesche Werte
-        main_urls_df[self.config.boolean_cols] = main_urls_df[
-            self.config.boolean_cols
-        ].astype("bool")
+        Returns:
+            ResultSink: Der Sink, der nach Gebrauch geschlossen werden muss (Kontextmanager).
+        """
+        return ResultSink(config=self.config, run_id=run_id, export_format=export_format)
 
-        main_urls_list = main_urls_df.to_dict("records")
-        return main_urls_list
+    def open_checkpoint(self, sources: List[SourcePlan]) -> CheckpointStore | None:
+        """
+        Öffnet den Checkpoint des Laufs und setzt einen abgebrochenen Lauf mit denselben
+        Quellen fort (siehe CheckpointStore.open).
+
+        Args:
+            sources (List[SourcePlan]): Die Quellen aus urls.json, bereits abgeschlossene
+                Quellen erhalten ihre Seiten und Sublinks aus dem Checkpoint.
+
+        Returns:
+            CheckpointStore | None: Der Checkpoint (Kontextmanager), None ohne Config.checkpoint_enabled.
+        """
+        if not self.config.checkpoint_enabled:
+            return None
+        return CheckpointStore.open(config=self.config, sources=sources)
 
     def export_collection_to_csv(self, output_df_list: List) -> None:
         """
@@ -69,23 +136,9 @@ class FileHandler:
         """
         if output_df_list:
             logger.success("data is being exported as csv...")
-            for output in output_df_list:
-                if isinstance(output, pd.DataFrame) and not output.empty:
-                    name = output["name"].iloc[0]
-                    output = output.replace({np.nan: None}).reset_index(drop=True)
-                    output.to_csv(
-                        self.config.output_path.joinpath(
-                            f"{name}_{datetime.datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-                        ),
-                        encoding=self.config.encoding,
-                        sep=self.config.delimiter,
-                        index=False,
-                    )
-                    logger.success(f"dataframe {name} exported successfully")
-                else:
-                    logger.warning(
-                        "dataframe is empty or the output is not a dataframe"
-                    )
+            with self.open_result_sink(export_format="csv") as sink:
+                for output in output_df_list:
+                    sink.write_frame(output)
 
         else:
             logger.warning("the output list is empty")
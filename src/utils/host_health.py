@@ -0,0 +1,230 @@
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import Config
+from src.utils.rate_limiter import THROTTLE_STATUS_CODES
+
+
+def is_host_failure(status_code: int | None) -> bool:
+    """
+    Gibt an, ob eine Antwort auf ein Problem des Hosts hindeutet: keine Antwort
+    (Verbindungsfehler, Timeout), 429/503 oder ein Serverfehler. Antworten wie 404
+    betreffen nur die einzelne URL, der Host selbst ist erreichbar.
+    """
+    return status_code is None or status_code in THROTTLE_STATUS_CODES or status_code >= 500
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit Breaker für einen einzelnen Host.
+
+    "closed": Anfragen werden gestellt, die Ergebnisse der letzten Anfragen werden gezählt.
+    "open": Der Anteil der Fehler hat die Schwelle überschritten, Anfragen werden bis
+        open_until sofort abgewiesen.
+    "half_open": Nach Ablauf der Pause darf eine einzelne Anfrage den Host prüfen. Bei Erfolg
+        wird der Breaker geschlossen, bei einem Fehler erneut und doppelt so lange geöffnet.
+
+    Attributes:
+        outcomes (Deque[bool]): Ergebnisse der letzten Anfragen (True = Fehler).
+        state (str): "closed", "open" oder "half_open".
+        open_until (float): Bis zu diesem Zeitpunkt werden Anfragen abgewiesen (time.monotonic).
+        consecutive_failures (int): Anzahl der Fehler in Folge, bestimmt den Backoff.
+        trips (int): Anzahl der Öffnungen seit dem letzten Schließen, bestimmt die Pause.
+        requests (int): Anzahl der Anfragen insgesamt.
+        failures (int): Anzahl der Fehler insgesamt.
+        retries (int): Anzahl der Wiederholungen insgesamt.
+        rejected (int): Anzahl der abgewiesenen Anfragen insgesamt.
+        total_trips (int): Anzahl der Öffnungen insgesamt.
+    """
+
+    outcomes: Deque[bool]
+    state: str = "closed"
+    open_until: float = 0.0
+    consecutive_failures: int = 0
+    trips: int = 0
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    rejected: int = 0
+    total_trips: int = 0
+
+
+class HostHealth:
+    """
+    Überwacht die Erreichbarkeit jedes Hosts für den AsyncFetcher: Wiederholungen erhalten
+    einen exponentiellen Backoff mit Jitter, der mit den Fehlern in Folge eines Hosts wächst,
+    sodass ein gestörter Host für alle seiner Anfragen seltener angefragt wird. Überschreitet
+    der Anteil der Fehler unter den letzten Config.breaker_window Anfragen die Schwelle
+    Config.breaker_failure_rate, öffnet der Circuit Breaker des Hosts: Weitere Anfragen werden
+    sofort abgewiesen, statt Zeit und Rate-Limit zu verbrauchen, und nach einer Pause prüft
+    eine einzelne Anfrage, ob der Host wieder antwortet.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die HostHealth-Instanz.
+        """
+        self.config = config
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # fetch_all kann aus mehreren Threads mit je eigener Event-Loop aufgerufen werden
+        self._lock = threading.Lock()
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(outcomes=deque(maxlen=self.config.breaker_window))
+        return self._breakers[host]
+
+    def allow(self, url: str) -> bool:
+        """
+        Prüft, ob eine Anfrage an den Host der URL gestellt werden darf.
+
+        Args:
+            url (str): Die anzufragende URL.
+
+        Returns:
+            bool: False, solange der Circuit Breaker des Hosts geöffnet ist.
+        """
+        if not self.config.breaker_enabled:
+            return True
+        with self._lock:
+            breaker = self._breaker(urlsplit(url).netloc)
+            if breaker.state == "closed":
+                return True
+            now = time.monotonic()
+            if now < breaker.open_until:
+                breaker.rejected += 1
+                return False
+            # Eine einzelne Probe-Anfrage, bis zu ihrem Ergebnis werden weitere abgewiesen.
+            # Kommt es nie an (z. B. abgebrochener Abruf), folgt nach der Pause die nächste Probe.
+            breaker.state = "half_open"
+            breaker.open_until = now + self._cooldown(breaker)
+            return True
+
+    def record(self, url: str, status_code: int | None) -> None:
+        """
+        Nimmt das Ergebnis einer Anfrage auf und öffnet bzw. schließt den Circuit Breaker.
+
+        Args:
+            url (str): Die angefragte URL.
+            status_code (int | None): Der HTTP-Statuscode, None bei einem Verbindungsfehler.
+        """
+        host = urlsplit(url).netloc
+        failed = is_host_failure(status_code)
+        with self._lock:
+            breaker = self._breaker(host)
+            breaker.requests += 1
+            breaker.outcomes.append(failed)
+            if not failed:
+                breaker.consecutive_failures = 0
+                if breaker.state != "closed":
+                    logger.info(f"{host} answered again, circuit closed")
+                    breaker.state, breaker.trips = "closed", 0
+                    breaker.outcomes.clear()
+                return
+
+            breaker.failures += 1
+            breaker.consecutive_failures += 1
+            if not self.config.breaker_enabled:
+                return
+            n_failures = sum(breaker.outcomes)
+            if breaker.state == "half_open" or (
+                breaker.state == "closed"
+                and len(breaker.outcomes) >= self.config.breaker_min_requests
+                and n_failures / len(breaker.outcomes) >= self.config.breaker_failure_rate
+            ):
+                breaker.trips += 1
+                breaker.total_trips += 1
+                cooldown = self._cooldown(breaker)
+                breaker.state, breaker.open_until = "open", time.monotonic() + cooldown
+                logger.warning(
+                    f"circuit opened for {host} ({n_failures} of the last {len(breaker.outcomes)} "
+                    f"requests failed), pausing {cooldown:.0f} s"
+                )
+
+    def remaining_cooldown(self, url: str) -> float:
+        """
+        Sekunden, bis der Circuit Breaker des Hosts wieder eine Anfrage zulässt (0, solange
+        er geschlossen ist), z. B. als Wartezeit einer zurückgegebenen Aufgabe.
+        """
+        with self._lock:
+            breaker = self._breaker(urlsplit(url).netloc)
+            if breaker.state == "closed":
+                return 0.0
+            return max(0.0, breaker.open_until - time.monotonic())
+
+    def record_retry(self, url: str) -> None:
+        with self._lock:
+            self._breaker(urlsplit(url).netloc).retries += 1
+
+    def backoff(self, url: str, attempt: int) -> float:
+        """
+        Wartezeit vor einer Wiederholung: exponentieller Backoff mit vollem Jitter, damit
+        gleichzeitig fehlgeschlagene Anfragen nicht gemeinsam wiederholt werden. Der Exponent
+        ist der größere Wert aus Versuch und Fehlern in Folge des Hosts, höchstens
+        Config.http_retries.
+
+        Args:
+            url (str): Die angefragte URL.
+            attempt (int): Der bisherige Versuch (0 für die erste Wiederholung).
+
+        Returns:
+            float: Die Wartezeit in Sekunden.
+        """
+        with self._lock:
+            consecutive_failures = self._breaker(urlsplit(url).netloc).consecutive_failures
+        exponent = max(attempt, min(consecutive_failures - 1, self.config.http_retries))
+        ceiling = min(self.config.http_backoff_max, self.config.http_backoff_factor * 2**exponent)
+        return random.uniform(0, ceiling)
+
+    def _cooldown(self, breaker: CircuitBreaker) -> float:
+        # Pause verdoppelt sich mit jeder erneuten Öffnung
+        return min(
+            self.config.breaker_max_cooldown,
+            self.config.breaker_cooldown * 2 ** max(0, breaker.trips - 1),
+        )
+
+    def get_health_stats(self) -> Dict[str, dict]:
+        """
+        Gibt den Zustand jedes Hosts zurück, z. B. für den Run-Report.
+
+        Returns:
+            Dict[str, dict]: Pro Host Zustand des Circuit Breakers, Anfragen, Fehler,
+            Fehlerquote, Wiederholungen, abgewiesene Anfragen und Öffnungen.
+        """
+        with self._lock:
+            return {
+                host: {
+                    "state": breaker.state,
+                    "requests": breaker.requests,
+                    "failures": breaker.failures,
+                    "failure_rate": round(breaker.failures / breaker.requests, 3) if breaker.requests else 0.0,
+                    "retries": breaker.retries,
+                    "rejected": breaker.rejected,
+                    "trips": breaker.total_trips,
+                }
+                for host, breaker in self._breakers.items()
+            }
+
+    def log_summary(self) -> None:
+        """
+        Meldet am Ende eines Laufs alle Hosts mit Fehlern oder abgewiesenen Anfragen.
+        """
+        for host, stats in self.get_health_stats().items():
+            if stats["state"] != "closed" or stats["rejected"]:
+                logger.warning(
+                    f"{host} is unhealthy: circuit {stats['state']}, {stats['failures']} of "
+                    f"{stats['requests']} requests failed, {stats['rejected']} requests skipped"
+                )
+            elif stats["failures"]:
+                logger.info(f"{host}: {stats['failures']} of {stats['requests']} requests failed")
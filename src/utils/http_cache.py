@@ -0,0 +1,291 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import Config
+
+
+@dataclass
+class CacheEntry:
+    """
+    Ein Eintrag im HTTP-Cache.
+
+    Attributes:
+        url (str): Die angefragte URL.
+        final_url (str): Die URL nach eventuellen Weiterleitungen.
+        status_code (int): Der HTTP-Statuscode der gespeicherten Antwort.
+        headers (dict): Die Header der gespeicherten Antwort.
+        encoding (str): Die Zeichenkodierung des Inhalts.
+        content (bytes): Der unverarbeitete Inhalt der Antwort.
+        stored_at (float): Zeitpunkt der letzten Speicherung oder Revalidierung (Unix-Zeit).
+    """
+
+    url: str
+    final_url: str
+    status_code: int
+    headers: dict
+    encoding: str
+    content: bytes
+    stored_at: float
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpCache:
+    """
+    Persistenter HTTP-Cache auf der Festplatte. Der Index liegt in einer SQLite-Datenbank,
+    die Inhalte werden komprimiert und inhaltsadressiert (SHA-256) als Dateien gespeichert,
+    sodass identische Antworten nur einmal abgelegt werden.
+
+    Abgelaufene Einträge werden über ETag/Last-Modified per bedingter Anfrage revalidiert.
+    Überschreitet der Cache Config.cache_max_bytes, werden die am längsten nicht genutzten
+    Einträge entfernt (LRU). Die Gesamtgröße wird beim Öffnen einmal berechnet und danach
+    bei jedem Speichern und Entfernen fortgeschrieben.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        cache_path (Path): Verzeichnis des Caches.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die HttpCache-Instanz und legt Verzeichnis und Index bei Bedarf an.
+        """
+        self.config = config
+        self.cache_path = Path(config.cache_path)
+        self.cache_path.joinpath("bodies").mkdir(parents=True, exist_ok=True)
+        self._ttls: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Die Abrufe laufen in mehreren Threads, daher eine Verbindung mit Lock
+        self._connection = sqlite3.connect(
+            self.cache_path.joinpath("index.sqlite"), check_same_thread=False
+        )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                encoding TEXT,
+                body_hash TEXT,
+                size INTEGER,
+                stored_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_body_hash ON responses (body_hash)"
+        )
+        self._connection.commit()
+        # Gleiche Inhalte werden nur einmal gespeichert, daher pro Hash zählen
+        self._total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT body_hash, MAX(size) AS size FROM responses GROUP BY body_hash)"
+        ).fetchone()[0]
+
+    def configure_urls(self, urls: Iterable[str], ttl: float = None) -> None:
+        """
+        Setzt die Gültigkeit (Sekunden) für die Domains der übergebenen URLs, z. B.
+        `cache_ttl` einer Quelle.
+
+        Args:
+            urls (Iterable[str]): Die URLs.
+            ttl (float): Gültigkeit in Sekunden (None = Config.cache_ttl).
+        """
+        if ttl is None:
+            return
+        for url in urls:
+            self._ttls[urlsplit(url).netloc] = float(ttl)
+
+    def ttl(self, url: str) -> float:
+        return self._ttls.get(urlsplit(url).netloc, self.config.cache_ttl)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Prüft, ob ein Eintrag ohne Revalidierung verwendet werden darf.
+        Im Offline-Modus (Config.cache_only) ist jeder Eintrag gültig.
+        """
+        if self.config.cache_only:
+            return True
+        return time.time() - entry.stored_at < self.ttl(entry.url)
+
+    def get(self, url: str) -> CacheEntry | None:
+        """
+        Liest einen Eintrag aus dem Cache und aktualisiert den Zugriffszeitpunkt.
+
+        Args:
+            url (str): Die angefragte URL.
+
+        Returns:
+            CacheEntry | None: Der Eintrag oder None, falls nicht vorhanden.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT final_url, status_code, headers, encoding, body_hash, stored_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._connection.commit()
+
+        final_url, status_code, headers, encoding, body_hash, stored_at = row
+        try:
+            content = zlib.decompress(self._body_path(body_hash).read_bytes())
+        except (OSError, zlib.error) as err:
+            logger.warning(f"cached body for {url} could not be read - Error: {err}")
+            return None
+
+        return CacheEntry(
+            url=url,
+            final_url=final_url,
+            status_code=status_code,
+            headers=json.loads(headers),
+            encoding=encoding,
+            content=content,
+            stored_at=stored_at,
+        )
+
+    def conditional_headers(self, entry: CacheEntry | None) -> dict:
+        """
+        Erzeugt die Header für eine bedingte Anfrage (If-None-Match/If-Modified-Since).
+        """
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        url: str,
+        final_url: str,
+        status_code: int,
+        headers: dict,
+        encoding: str | None,
+        content: bytes,
+    ) -> None:
+        """
+        Speichert eine Antwort im Cache. Nur erfolgreiche Antworten (200) werden gespeichert.
+        """
+        if status_code != 200:
+            return
+
+        body_hash = hashlib.sha256(content).hexdigest()
+        body_path = self._body_path(body_hash)
+        # Header-Namen klein speichern, damit der Zugriff unabhängig von der Schreibweise ist
+        headers = {key.lower(): value for key, value in headers.items()}
+        now = time.time()
+        with self._lock:
+            # Unter dem Lock, damit _evict die Datei nicht zwischen Schreiben und Eintrag löscht
+            previous = self._connection.execute(
+                "SELECT body_hash, size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if not self._is_referenced(body_hash):
+                if not body_path.exists():
+                    body_path.parent.mkdir(parents=True, exist_ok=True)
+                    body_path.write_bytes(zlib.compress(content))
+                self._total_size += body_path.stat().st_size
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    final_url,
+                    status_code,
+                    json.dumps(headers),
+                    encoding,
+                    body_hash,
+                    body_path.stat().st_size,
+                    now,
+                    now,
+                ),
+            )
+            if previous and previous[0] != body_hash:
+                # Die URL hat einen neuen Inhalt, der alte wird ggf. nicht mehr benötigt
+                self._release(*previous)
+            n_removed = self._evict()
+            self._connection.commit()
+        if n_removed:
+            logger.info(f"http cache evicted {n_removed} bodies")
+
+    def touch(self, url: str) -> None:
+        """
+        Markiert einen Eintrag nach erfolgreicher Revalidierung (304) wieder als frisch.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self._connection.commit()
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.cache_path.joinpath("bodies", body_hash[:2], f"{body_hash}.z")
+
+    def _is_referenced(self, body_hash: str) -> bool:
+        return self._connection.execute(
+            "SELECT 1 FROM responses WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone() is not None
+
+    def _release(self, body_hash: str, size: int) -> bool:
+        """
+        Löscht eine Inhaltsdatei, sobald kein Eintrag mehr auf sie verweist. Nur unter self._lock.
+        """
+        if self._is_referenced(body_hash):
+            return False
+        self._body_path(body_hash).unlink(missing_ok=True)
+        self._total_size -= size
+        return True
+
+    def _evict(self) -> int:
+        """
+        Entfernt die am längsten nicht genutzten Einträge, bis der Cache wieder unter
+        Config.cache_max_bytes liegt. Inhaltsdateien werden erst gelöscht, wenn kein
+        Eintrag mehr auf sie verweist. Nur unter self._lock.
+
+        Returns:
+            int: Anzahl der gelöschten Inhaltsdateien.
+        """
+        if self._total_size <= self.config.cache_max_bytes:
+            return 0
+        n_removed = 0
+        rows = self._connection.execute("SELECT url, body_hash, size FROM responses ORDER BY accessed_at")
+        for url, body_hash, size in rows.fetchall():
+            if self._total_size <= self.config.cache_max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            n_removed += self._release(body_hash, size)
+        return n_removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,149 @@
+import threading
+import time
+
+import requests as rq
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from config import Config
+
+# Brotli ist optional: Nur wenn das Paket installiert ist, kann urllib3 "br" dekodieren
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Dauer des Verbindungsaufbaus der letzten Anfrage pro Thread (nur mit Config.metrics_enabled)
+_connect_timing = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # Enthält DNS-Auflösung, TCP- und TLS-Handshake
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, der die Dauer neuer Verbindungen misst. Wiederverwendete Keep-Alive-Verbindungen
+    haben keinen Verbindungsaufbau und zählen mit 0 Sekunden.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """
+    Gemeinsame HTTP-Schicht für alle Abrufe. Kapselt eine requests.Session mit
+    Connection-Pool pro Host, Keep-Alive, komprimierter Übertragung und Timeouts.
+    Wiederholungen übernimmt der AsyncFetcher pro Host (siehe HostHealth), damit jeder
+    Fehlversuch im Circuit Breaker zählt und kein Thread während des Backoffs blockiert.
+
+    Die Session ist für die gleichzeitige Nutzung aus mehreren Threads gedacht
+    (z. B. aus dem AsyncFetcher), der Connection-Pool von urllib3 ist threadsicher.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        session (requests.Session): Die gemeinsam genutzte Session.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die HttpClient-Instanz und baut die Session auf.
+        """
+        self.config = config
+        self.session = self._create_session()
+
+    def _create_session(self) -> rq.Session:
+        """
+        Erstellt eine Session mit Connection-Pool aus der Config.
+
+        Returns:
+            requests.Session: Die konfigurierte Session.
+        """
+        # Keine Wiederholungen in urllib3, Fehler gehen direkt an den AsyncFetcher zurück
+        retry = Retry(total=0, raise_on_status=False)
+        # Die Zeitmessung des Verbindungsaufbaus kostet nur bei aktivierten Metriken
+        adapter_cls = TimedHTTPAdapter if self.config.metrics_enabled else HTTPAdapter
+        adapter = adapter_cls(
+            pool_connections=self.config.http_pool_connections,
+            pool_maxsize=self.config.http_pool_maxsize,
+            max_retries=retry,
+        )
+
+        session = rq.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.config.headers)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def get(self, url: str, **kwargs) -> rq.Response:
+        """
+        Führt eine GET-Anfrage über die gemeinsame Session aus.
+
+        Args:
+            url (str): Die abzurufende URL.
+            **kwargs: Weitere Argumente für requests.Session.get.
+
+        Returns:
+            requests.Response: Die Antwort des Servers. response.connect_seconds enthält die
+            Dauer des Verbindungsaufbaus (0, falls eine bestehende Verbindung genutzt wurde
+            oder die Metriken deaktiviert sind).
+        """
+        kwargs.setdefault(
+            "timeout",
+            (self.config.http_connect_timeout, self.config.http_read_timeout),
+        )
+        _connect_timing.seconds = 0.0
+        response = self.session.get(url, **kwargs)
+        response.connect_seconds = _connect_timing.seconds
+        return response
+
+    def close(self) -> None:
+        """
+        Schließt die Session und alle offenen Verbindungen.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,264 @@
+import datetime
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import Config
+
+# Phasen eines Abrufs, siehe HttpClient.get und AsyncFetcher._get
+FETCH_PHASES = ("connect", "ttfb", "download")
+
+
+class Metrics:
+    """
+    Sammelt strukturierte Messwerte eines Laufs: Laufzeit pro Stufe, pro URL die Phasen des
+    Abrufs (Verbindungsaufbau inkl. DNS und TLS, Time to First Byte, Download), übertragene
+    Bytes, Cache-Treffer, Wiederholungen, Wartezeit durch das Rate-Limit sowie Parse-Zeiten.
+
+    Am Ende des Laufs wird ein JSON-Report und optional eine Datei im Textformat von Prometheus
+    geschrieben. Ist Config.metrics_enabled False, kehren alle Methoden sofort zurück.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        enabled (bool): True, falls Messwerte gesammelt werden.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die Metrics-Instanz.
+        """
+        self.config = config
+        self.enabled = config.metrics_enabled
+        self.started_at = datetime.datetime.now()
+
+        self._lock = threading.Lock()
+        self._stages: Dict[str, float] = defaultdict(float)
+        self._fetches: List[dict] = []
+        self._parses: Dict[str, List[float]] = defaultdict(list)
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._sections: Dict[str, dict] = {}
+
+    def stage(self, name: str):
+        """
+        Kontextmanager, der die Laufzeit einer Stufe misst, z. B.
+        `with metrics.stage("articles"): ...`.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timed_stage(name)
+
+    @contextmanager
+    def _timed_stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stages[name] += elapsed
+            logger.info(f"stage {name} finished in {elapsed:.2f} s")
+
+    def record_fetch(
+        self,
+        url: str,
+        status_code: int | None,
+        cache: str,
+        timings: Dict[str, float] = None,
+        n_bytes: int = 0,
+        retries: int = 0,
+        throttle_wait: float = 0.0,
+    ) -> None:
+        """
+        Speichert die Messwerte eines Abrufs.
+
+        Args:
+            url (str): Die angefragte URL.
+            status_code (int | None): Der Statuscode, None bei einem Verbindungsfehler.
+            cache (str): "hit", "revalidated", "miss" oder "off".
+            timings (Dict[str, float]): Dauer der Phasen aus FETCH_PHASES in Sekunden.
+            n_bytes (int): Über das Netzwerk geladene Bytes (dekodiert).
+            retries (int): Anzahl der Wiederholungen (Backoff und Rate-Limiter).
+            throttle_wait (float): Wartezeit durch das Rate-Limit in Sekunden.
+        """
+        if not self.enabled:
+            return
+        timings = timings or {}
+        record = {
+            "url": url,
+            "host": urlsplit(url).netloc,
+            "status_code": status_code,
+            "cache": cache,
+            **{phase: round(timings.get(phase, 0.0), 4) for phase in FETCH_PHASES},
+            "total": round(sum(timings.values()), 4),
+            "bytes": n_bytes,
+            "retries": retries,
+            "throttle_wait": round(throttle_wait, 4),
+        }
+        with self._lock:
+            self._fetches.append(record)
+
+    def record_parse(self, kind: str, seconds: float) -> None:
+        """
+        Speichert die Dauer eines Parse-Vorgangs, z. B. kind="articles", "links" oder "tables".
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._parses[kind].append(seconds)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """
+        Erhöht einen freien Zähler, z. B. die Anzahl geschriebener Artikel.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += value
+
+    def add_section(self, name: str, data: dict) -> None:
+        """
+        Übernimmt bereits aggregierte Werte anderer Komponenten (z. B. Browser-Pool) in den Report.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._sections[name] = data
+
+    @staticmethod
+    def _summary(values: List[float]) -> dict:
+        if not values:
+            return {"count": 0}
+        values = sorted(values)
+        return {
+            "count": len(values),
+            "sum": round(sum(values), 4),
+            "p50": round(statistics.median(values), 4),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 4),
+            "max": round(values[-1], 4),
+        }
+
+    def _host_summary(self) -> Dict[str, dict]:
+        """
+        Verdichtet die Abrufe pro Host, um langsame Quellen zu finden.
+        """
+        by_host: Dict[str, List[dict]] = defaultdict(list)
+        for record in self._fetches:
+            by_host[record["host"]].append(record)
+
+        summary = {}
+        for host, records in by_host.items():
+            network = [record for record in records if record["cache"] != "hit"]
+            summary[host] = {
+                "requests": len(records),
+                "errors": sum(record["status_code"] != 200 for record in records),
+                "cache": {
+                    result: sum(record["cache"] == result for record in records)
+                    for result in ("hit", "revalidated", "miss", "off")
+                },
+                "bytes": sum(record["bytes"] for record in records),
+                "retries": sum(record["retries"] for record in records),
+                "throttle_wait": round(sum(record["throttle_wait"] for record in records), 4),
+                **{
+                    phase: self._summary([record[phase] for record in network])
+                    for phase in (*FETCH_PHASES, "total")
+                },
+            }
+        return summary
+
+    def report(self) -> dict:
+        """
+        Erstellt den Report des Laufs.
+
+        Returns:
+            dict: Stufen, Abrufe pro Host, Parse-Zeiten, Zähler und weitere Abschnitte
+            (sowie die einzelnen Abrufe, falls Config.metrics_per_url).
+        """
+        with self._lock:
+            report = {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "stages": {name: round(seconds, 4) for name, seconds in self._stages.items()},
+                "hosts": self._host_summary(),
+                "parse": {kind: self._summary(values) for kind, values in self._parses.items()},
+                "counters": dict(self._counters),
+                **self._sections,
+            }
+            if self.config.metrics_per_url:
+                report["fetches"] = list(self._fetches)
+        return report
+
+    def to_prometheus(self) -> str:
+        """
+        Gibt die aggregierten Werte im Textformat von Prometheus zurück, z. B. für den
+        Textfile-Collector des Node-Exporters.
+        """
+        report = self.report()
+        lines = []
+
+        def metric(name: str, metric_type: str, help_text: str, samples: List[tuple]) -> None:
+            lines.append(f"# HELP scraper_{name} {help_text}")
+            lines.append(f"# TYPE scraper_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{label_value}"' for key, label_value in labels.items())
+                lines.append(f"scraper_{name}{{{label_text}}} {value}")
+
+        hosts = report["hosts"]
+        metric("stage_seconds", "gauge", "Wall time per pipeline stage.",
+               [({"stage": stage}, seconds) for stage, seconds in report["stages"].items()])
+        metric("requests_total", "counter", "Requests per host.",
+               [({"host": host}, data["requests"]) for host, data in hosts.items()])
+        metric("request_errors_total", "counter", "Responses other than 200 or failed requests per host.",
+               [({"host": host}, data["errors"]) for host, data in hosts.items()])
+        metric("cache_requests_total", "counter", "Requests per host and cache result.",
+               [({"host": host, "result": result}, count)
+                for host, data in hosts.items() for result, count in data["cache"].items()])
+        metric("response_bytes_total", "counter", "Bytes loaded over the network per host.",
+               [({"host": host}, data["bytes"]) for host, data in hosts.items()])
+        metric("retries_total", "counter", "Retries per host.",
+               [({"host": host}, data["retries"]) for host, data in hosts.items()])
+        metric("throttle_wait_seconds_total", "counter", "Time spent waiting for the rate limit per host.",
+               [({"host": host}, data["throttle_wait"]) for host, data in hosts.items()])
+        metric("request_phase_seconds_sum", "counter", "Summed duration of request phases per host.",
+               [({"host": host, "phase": phase}, data[phase].get("sum", 0))
+                for host, data in hosts.items() for phase in FETCH_PHASES])
+        metric("parse_seconds_sum", "counter", "Summed parse time per kind.",
+               [({"kind": kind}, data.get("sum", 0)) for kind, data in report["parse"].items()])
+        metric("parse_total", "counter", "Parse operations per kind.",
+               [({"kind": kind}, data["count"]) for kind, data in report["parse"].items()])
+        health = report.get("host_health", {})
+        metric("host_circuit_open", "gauge", "1 if the circuit breaker of the host is not closed.",
+               [({"host": host}, int(data["state"] != "closed")) for host, data in health.items()])
+        metric("requests_rejected_total", "counter", "Requests skipped by the circuit breaker per host.",
+               [({"host": host}, data["rejected"]) for host, data in health.items()])
+        return "\n".join(lines) + "\n"
+
+    def write_report(self) -> Path | None:
+        """
+        Schreibt den JSON-Report (und bei Config.metrics_prometheus die Prometheus-Datei)
+        nach Config.metrics_path.
+
+        Returns:
+            Path | None: Der Pfad des JSON-Reports, None falls deaktiviert.
+        """
+        if not self.enabled:
+            return None
+        self.config.metrics_path.mkdir(parents=True, exist_ok=True)
+        stem = f"run_report_{self.started_at.strftime('%Y_%m_%d_%H%M%S')}"
+
+        report_path = self.config.metrics_path.joinpath(f"{stem}.json")
+        report_path.write_text(
+            json.dumps(self.report(), indent=2, default=str), encoding=self.config.encoding
+        )
+        if self.config.metrics_prometheus:
+            self.config.metrics_path.joinpath(f"{stem}.prom").write_text(
+                self.to_prometheus(), encoding=self.config.encoding
+            )
+        logger.success(f"run report written to {report_path}")
+        return report_path
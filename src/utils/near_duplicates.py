@@ -0,0 +1,224 @@
+import hashlib
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from loguru import logger
+
+from config import Config
+from src.utils.metrics import Metrics
+from src.utils.seen_store import normalize_url
+
+# Wörter pro Shingle, kürzere Texte erhalten keinen Fingerabdruck
+SHINGLE_SIZE = 3
+FINGERPRINT_BITS = 64
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+@lru_cache(maxsize=200_000)
+def _token_hash(token: str) -> int:
+    # Stabil über Prozesse hinweg, im Gegensatz zu hash()
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _signed(value: int) -> int:
+    # SQLite speichert INTEGER als vorzeichenbehaftete 64-Bit-Werte
+    return value - (1 << FINGERPRINT_BITS) if value >= 1 << (FINGERPRINT_BITS - 1) else value
+
+
+def _rotate(values: np.ndarray, bits: int) -> np.ndarray:
+    return (values << np.uint64(bits)) | (values >> np.uint64(FINGERPRINT_BITS - bits))
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """
+    64-Bit-Hashes aller Wort-Shingles eines Textes. Jedes Wort wird einmal gehasht, die
+    Shingles entstehen vektorisiert durch Rotation und XOR der benachbarten Wort-Hashes.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter((_token_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens))
+    n_shingles = len(tokens) - SHINGLE_SIZE + 1
+    shingles = hashes[:n_shingles].copy()
+    for offset in range(1, SHINGLE_SIZE):
+        shingles ^= _rotate(hashes[offset:offset + n_shingles], 21 * offset)
+    return shingles
+
+
+def simhash_batch(texts: List[str]) -> List[int | None]:
+    """
+    Berechnet die 64-Bit-SimHashes mehrerer Texte in einem Durchlauf: Die Shingle-Hashes aller
+    Texte werden zu einer Bit-Matrix zusammengefasst und pro Text spaltenweise aufsummiert.
+    Ähnliche Texte unterscheiden sich nur in wenigen Bits.
+
+    Args:
+        texts (List[str]): Die Artikeltexte.
+
+    Returns:
+        List[int | None]: Die Fingerabdrücke, None für Texte mit weniger als SHINGLE_SIZE Wörtern.
+    """
+    shingles = [_shingle_hashes(text or "") for text in texts]
+    indices = [index for index, values in enumerate(shingles) if len(values)]
+    fingerprints: List[int | None] = [None] * len(texts)
+    if not indices:
+        return fingerprints
+
+    lengths = np.array([len(shingles[index]) for index in indices])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    hashes = np.concatenate([shingles[index] for index in indices])
+    bits = ((hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)).astype(np.uint8)
+    # Ein Bit ist gesetzt, wenn es in mehr als der Hälfte der Shingles gesetzt ist
+    majority = np.add.reduceat(bits, offsets, axis=0, dtype=np.int64) * 2 > lengths[:, None]
+    values = (majority.astype(np.uint64) << _BIT_POSITIONS).sum(axis=1, dtype=np.uint64)
+    for index, value in zip(indices, values):
+        fingerprints[index] = int(value)
+    return fingerprints
+
+
+class NearDuplicateIndex:
+    """
+    Persistenter Index der SimHash-Fingerabdrücke aller exportierten Artikel zur Erkennung von
+    Beinahe-Duplikaten, z. B. derselben Agenturmeldung unter verschiedenen Links oder Quellen.
+
+    Zwei Artikel gelten als Duplikat, wenn sich ihre Fingerabdrücke in höchstens
+    Config.dedup_max_distance Bits unterscheiden. Für die Suche wird der Fingerabdruck in
+    dedup_max_distance + 1 Bänder geteilt (LSH-Banding): Ein Duplikat stimmt in mindestens einem
+    Band exakt überein, sodass eine indizierte Abfrage über alle Bänder die Kandidaten liefert,
+    ohne den gesamten Index zu durchsuchen.
+
+    Je nach Config.dedup_action werden Duplikate verworfen ("drop") oder mit dem Link des
+    Originals in der Spalte "duplicate_of" exportiert ("tag").
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        metrics (Metrics | None): Zählt die gefundenen Duplikate ("near_duplicates").
+    """
+
+    def __init__(self, config: Config, metrics: Metrics = None):
+        """
+        Initialisiert die NearDuplicateIndex-Instanz und legt die Datenbank bei Bedarf an.
+        """
+        if config.dedup_action not in ("drop", "tag"):
+            raise ValueError(f"unknown dedup_action {config.dedup_action!r}, expected 'drop' or 'tag'")
+        if not 0 <= config.dedup_max_distance < FINGERPRINT_BITS:
+            raise ValueError(
+                f"dedup_max_distance must be between 0 and {FINGERPRINT_BITS - 1}, got {config.dedup_max_distance}"
+            )
+        self.config = config
+        self.metrics = metrics
+        self._n_bands = config.dedup_max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self._n_bands
+        Path(config.dedup_index_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(config.dedup_index_path)
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                link TEXT,
+                simhash INTEGER,
+                first_seen REAL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band_key INTEGER,
+                fingerprint_id INTEGER,
+                PRIMARY KEY (band_key, fingerprint_id)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def filter(self, articles: List[dict]) -> List[dict]:
+        """
+        Prüft einen Block geparster Artikel gegen den Index und nimmt die Originale auf.
+        Duplikate innerhalb des Blocks werden ebenfalls erkannt.
+
+        Args:
+            articles (List[dict]): Die Artikel-Dictionaries mit "article_link" und "article".
+
+        Returns:
+            List[dict]: Die zu exportierenden Artikel. Mit "tag" sind es alle Artikel, jeweils
+                ergänzt um "duplicate_of" (None für Originale).
+        """
+        fingerprints = simhash_batch([article["article"] for article in articles])
+        kept = []
+        for article, fingerprint in zip(articles, fingerprints):
+            link = article["article_link"]
+            duplicate_of = self._find(fingerprint, link) if fingerprint is not None else None
+            if duplicate_of:
+                logger.info(f"near duplicate of {duplicate_of} : {link}")
+                if self.metrics:
+                    self.metrics.incr("near_duplicates")
+            elif fingerprint is not None:
+                self._add(link, fingerprint)
+
+            if self.config.dedup_action == "tag":
+                article["duplicate_of"] = duplicate_of
+                kept.append(article)
+            elif not duplicate_of:
+                kept.append(article)
+        self._connection.commit()
+        return kept
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        # Band-Nummer und Bandwert in einem Schlüssel, damit eine Abfrage alle Bänder abdeckt.
+        # Bei einem einzigen Band (dedup_max_distance 0) umfasst der Schlüssel alle 64 Bits.
+        mask = (1 << self._band_bits) - 1
+        return [
+            _signed((band << self._band_bits) | ((fingerprint >> (band * self._band_bits)) & mask))
+            for band in range(self._n_bands)
+        ]
+
+    def _find(self, fingerprint: int, link: str) -> str | None:
+        """
+        Gibt den Link des ähnlichsten gespeicherten Artikels zurück, falls er innerhalb von
+        Config.dedup_max_distance Bits liegt. Der Artikel selbst (gleiche URL) zählt nicht.
+        """
+        band_keys = self._band_keys(fingerprint)
+        candidates = self._connection.execute(
+            f"""
+            SELECT DISTINCT f.link, f.simhash FROM bands b
+            JOIN fingerprints f ON f.id = b.fingerprint_id
+            WHERE b.band_key IN ({", ".join("?" * len(band_keys))}) AND f.url != ?
+            """,
+            (*band_keys, normalize_url(link)),
+        ).fetchall()
+
+        best_link, best_distance = None, self.config.dedup_max_distance + 1
+        for candidate_link, simhash in candidates:
+            distance = (fingerprint ^ (simhash & 0xFFFFFFFFFFFFFFFF)).bit_count()
+            if distance < best_distance:
+                best_link, best_distance = candidate_link, distance
+        return best_link
+
+    def _add(self, link: str, fingerprint: int) -> None:
+        url = normalize_url(link)
+        signed = _signed(fingerprint)
+        row = self._connection.execute("SELECT id FROM fingerprints WHERE url = ?", (url,)).fetchone()
+        if row:
+            # Geänderter Artikel (inkrementeller Crawl): alte Bänder ersetzen
+            fingerprint_id = row[0]
+            self._connection.execute("DELETE FROM bands WHERE fingerprint_id = ?", (fingerprint_id,))
+            self._connection.execute(
+                "UPDATE fingerprints SET simhash = ?, link = ? WHERE id = ?", (signed, link, fingerprint_id)
+            )
+        else:
+            fingerprint_id = self._connection.execute(
+                "INSERT INTO fingerprints (url, link, simhash, first_seen) VALUES (?, ?, ?, ?)",
+                (url, link, signed, time.time()),
+            ).lastrowid
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO bands VALUES (?, ?)",
+            [(band_key, fingerprint_id) for band_key in self._band_keys(fingerprint)],
+        )
+
+    def close(self) -> None:
+        self._connection.close()
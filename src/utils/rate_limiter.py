@@ -0,0 +1,241 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests as rq
+from loguru import logger
+
+from config import Config
+from src.utils.http_client import HttpClient
+
+# Statuscodes, bei denen ein Host verlangsamt und die Anfrage später wiederholt wird
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token-Bucket für einen einzelnen Host. Tokens dürfen negativ werden: Jede Anfrage
+    reserviert sofort ein Token und wartet so lange, bis der Bucket es nachgefüllt hätte.
+    Dadurch braucht es innerhalb einer Event-Loop keine Locks.
+
+    Attributes:
+        rate (float): Konfigurierte Anfragen pro Sekunde.
+        burst (int): Maximale Anzahl an Anfragen, die ohne Pause gestellt werden dürfen.
+        current_rate (float): Aktuelle, ggf. nach 429/503 reduzierte Rate.
+        tokens (float): Aktueller Füllstand.
+        updated_at (float): Zeitpunkt der letzten Aktualisierung (time.monotonic).
+        blocked_until (float): Bis zu diesem Zeitpunkt wird der Host gar nicht angefragt.
+    """
+
+    rate: float
+    burst: int
+    current_rate: float = None
+    tokens: float = None
+    updated_at: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+
+    def __post_init__(self):
+        self.current_rate = self.current_rate or self.rate
+        self.tokens = self.burst if self.tokens is None else self.tokens
+
+    def reserve(self, now: float) -> float:
+        """
+        Reserviert ein Token und gibt die nötige Wartezeit in Sekunden zurück.
+        """
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated_at) * self.current_rate
+        )
+        self.updated_at = now
+        self.tokens -= 1
+        wait = -self.tokens / self.current_rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def update(self, rate: float, burst: int, now: float) -> None:
+        """
+        Übernimmt eine geänderte Rate bzw. einen geänderten Burst. Füllstand, eine nach
+        429/503 reduzierte Rate (anteilig) und eine Sperre bleiben erhalten.
+        """
+        # Bis jetzt mit der bisherigen Rate nachfüllen, danach gilt die neue
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.current_rate)
+        self.updated_at = now
+        self.current_rate = rate * self.current_rate / self.rate
+        self.rate, self.burst = rate, burst
+        self.tokens = min(self.tokens, burst)
+
+
+class DomainRateLimiter:
+    """
+    Rate-Limiter mit einem Token-Bucket pro Domain. Verschiedene Hosts laufen unabhängig
+    voneinander, pro Host wird die konfigurierte Rate eingehalten. Optional wird der
+    Crawl-delay aus der robots.txt berücksichtigt, bei 429/503 wird der Host verlangsamt
+    und ein Retry-After-Header eingehalten.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        http_client (HttpClient): Die HTTP-Schicht für den Abruf der robots.txt.
+        throttled_seconds (Dict[str, float]): Summierte Wartezeit pro Domain.
+    """
+
+    def __init__(self, config: Config, http_client: HttpClient):
+        """
+        Initialisiert die DomainRateLimiter-Instanz.
+        """
+        self.config = config
+        self.http_client = http_client
+        self.throttled_seconds: Dict[str, float] = defaultdict(float)
+        self._limits: Dict[str, tuple] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._crawl_delays: Dict[str, float | None] = {}
+        self._schemes: Dict[str, str] = {}
+
+    @staticmethod
+    def domain(url: str) -> str:
+        return urlsplit(url).netloc
+
+    def configure_urls(self, urls: Iterable[str], rate: float = None, burst: int = None) -> None:
+        """
+        Setzt Rate und Burst für die Domains der übergebenen URLs, z. B. `requests_per_second`
+        und `burst` einer Quelle für ihre Seiten und gefundenen Sublinks.
+
+        Args:
+            urls (Iterable[str]): Die URLs.
+            rate (float): Anfragen pro Sekunde (None = Config.default_requests_per_second).
+            burst (int): Größe des Bursts (None = Config.default_burst).
+        """
+        if not rate and not burst:
+            return
+        for domain in {self.domain(url) for url in urls}:
+            self.configure(domain, rate, burst)
+
+    def configure(self, domain: str, rate: float = None, burst: int = None) -> None:
+        """
+        Setzt Rate und Burst für eine Domain. Ein bestehender Bucket wird nur angepasst, wenn
+        sich die Werte ändern, und behält Füllstand und Sperre nach 429/503, sodass z. B. ein
+        erneuter Aufruf von configure_sources (siehe source_spec.py) keinen vollen Burst freigibt.
+        """
+        limits = (
+            rate or self.config.default_requests_per_second,
+            burst or self.config.default_burst,
+        )
+        if self._limits.get(domain) == limits:
+            return
+        self._limits[domain] = limits
+        if domain in self._buckets:
+            rate, burst = limits
+            self._buckets[domain].update(self._limited_rate(domain, rate), burst, time.monotonic())
+
+    def prepare(self, urls: Iterable[str]) -> None:
+        """
+        Lädt für alle noch unbekannten Domains die robots.txt (falls aktiviert) und legt
+        die Buckets an. Wird vor dem ersten Abruf einer Domain im Thread-Pool des
+        AsyncFetcher aufgerufen, damit die Event-Loop nicht blockiert.
+        """
+        for url in urls:
+            split_url = urlsplit(url)
+            self._schemes.setdefault(split_url.netloc, split_url.scheme)
+            self._bucket(split_url.netloc)
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        if domain not in self._buckets:
+            rate, burst = self._limits.get(
+                domain,
+                (self.config.default_requests_per_second, self.config.default_burst),
+            )
+            self._buckets[domain] = TokenBucket(rate=self._limited_rate(domain, rate), burst=burst)
+        return self._buckets[domain]
+
+    def _limited_rate(self, domain: str, rate: float) -> float:
+        crawl_delay = self._crawl_delay(domain)
+        return min(rate, 1 / crawl_delay) if crawl_delay else rate
+
+    def _crawl_delay(self, domain: str) -> float | None:
+        """
+        Liest den Crawl-delay für unseren User-Agent aus der robots.txt einer Domain.
+        """
+        if not self.config.respect_crawl_delay:
+            return None
+        if domain not in self._crawl_delays:
+            crawl_delay = None
+            try:
+                scheme = self._schemes.get(domain, "https")
+                req = self.http_client.get(f"{scheme}://{domain}/robots.txt")
+                if req.status_code == 200:
+                    robot_parser = RobotFileParser()
+                    robot_parser.parse(req.text.splitlines())
+                    crawl_delay = robot_parser.crawl_delay(self.config.headers["User-Agent"])
+            except rq.RequestException as err:
+                logger.warning(f"robots.txt could not be read for {domain} - Error: {err}")
+            if crawl_delay:
+                logger.info(f"crawl-delay of {crawl_delay} s found for {domain}")
+            self._crawl_delays[domain] = float(crawl_delay) if crawl_delay else None
+        return self._crawl_delays[domain]
+
+    def reserve(self, url: str, throttle: bool = True) -> float:
+        """
+        Reserviert einen Slot für eine Anfrage an die Domain der URL.
+
+        Args:
+            url (str): Die anzufragende URL.
+            throttle (bool): Bei False wird nur eine Sperre nach 429/503 beachtet,
+                nicht aber die Rate der Domain.
+
+        Returns:
+            float: Die Wartezeit in Sekunden, bevor die Anfrage gestellt werden darf.
+        """
+        domain = self.domain(url)
+        bucket = self._bucket(domain)
+        now = time.monotonic()
+        wait = bucket.reserve(now) if throttle else max(0.0, bucket.blocked_until - now)
+        if wait > 0:
+            self.throttled_seconds[domain] += wait
+        return wait
+
+    def report(self, url: str, status_code: int, retry_after: str = None) -> None:
+        """
+        Passt die Rate einer Domain an die Antwort an: Bei 429/503 wird die Rate halbiert
+        und der Host bis zum Retry-After gesperrt, bei Erfolg erholt sich die Rate langsam.
+
+        Args:
+            url (str): Die angefragte URL.
+            status_code (int): Der HTTP-Statuscode der Antwort.
+            retry_after (str): Der Wert des Retry-After-Headers, falls vorhanden.
+        """
+        bucket = self._bucket(self.domain(url))
+        if status_code in THROTTLE_STATUS_CODES:
+            bucket.current_rate = max(bucket.current_rate / 2, bucket.rate / 16)
+            pause = self._parse_retry_after(retry_after) or 1 / bucket.current_rate
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + pause)
+            logger.warning(
+                f"{self.domain(url)} answered {status_code}, slowing down to "
+                f"{bucket.current_rate:.2f} req/s and pausing {pause:.1f} s"
+            )
+        elif bucket.current_rate < bucket.rate:
+            bucket.current_rate = min(bucket.rate, bucket.current_rate + bucket.rate / 10)
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str | None) -> float | None:
+        """
+        Wandelt einen Retry-After-Header (Sekunden oder HTTP-Datum) in Sekunden um.
+        """
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_date.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_throttle_stats(self) -> Dict[str, float]:
+        """
+        Gibt die summierte Wartezeit in Sekunden pro Domain zurück.
+        """
+        return dict(self.throttled_seconds)
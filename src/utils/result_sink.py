@@ -0,0 +1,250 @@
+import csv
+import datetime
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from config import Config
+from src.utils.arrow_writer import FILE_EXTENSIONS, ArrowWriter
+
+# Spalte, über die bereits geschriebene Datensätze beim Fortsetzen erkannt werden
+KEY_COLUMN = "article_link"
+
+EXPORT_FORMATS = ("csv", *FILE_EXTENSIONS)
+
+
+class CsvWriter:
+    """
+    Hängt Datensätze an eine CSV-Datei pro Quelle ("<name>_<run_id>.csv") an. Die Spalten der
+    ersten Zeile legen den Aufbau der Datei fest.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        run_id (str): Kennung des Laufs, Teil der Dateinamen.
+    """
+
+    def __init__(self, config: Config, run_id: str):
+        """
+        Initialisiert die CsvWriter-Instanz.
+        """
+        self.config = config
+        self.run_id = run_id
+        self._columns: Dict[str, List[str]] = {}
+
+    def path(self, name: str) -> Path:
+        """
+        Pfad der Ausgabedatei einer Quelle.
+        """
+        return self.config.output_path.joinpath(f"{name}_{self.run_id}.csv")
+
+    def exists(self, name: str) -> bool:
+        path = self.path(name)
+        return path.exists() and path.stat().st_size > 0
+
+    def read_keys(self, name: str, key_column: str) -> set:
+        """
+        Liest Kopfzeile und Schlüssel einer vorhandenen Datei, damit sie fortgesetzt werden kann.
+        """
+        with self.path(name).open(encoding=self.config.encoding, newline="") as csv_file:
+            reader = csv.reader(csv_file, delimiter=self.config.delimiter)
+            self._columns[name] = next(reader, [])
+            if key_column not in self._columns[name]:
+                return set()
+            key_index = self._columns[name].index(key_column)
+            return {row[key_index] for row in reader if len(row) > key_index}
+
+    def write_records(self, name: str, records: List[dict]) -> None:
+        self.write_frame(name, pd.DataFrame(records))
+
+    def write_frame(self, name: str, frame: pd.DataFrame) -> None:
+        columns = self._columns.get(name)
+        write_header = not columns
+        if write_header:
+            self._columns[name] = list(frame.columns)
+        else:
+            # Neue Spalten eines späteren Blocks würden die Datei verschieben
+            unknown_columns = set(frame.columns) - set(columns)
+            if unknown_columns:
+                logger.warning(f"dropping columns {sorted(unknown_columns)} not in the header of {name}")
+            frame = frame.reindex(columns=columns)
+
+        # NaN und None werden beide als leeres Feld geschrieben
+        frame.to_csv(
+            self.path(name),
+            mode="a",
+            header=write_header,
+            encoding=self.config.encoding,
+            sep=self.config.delimiter,
+            index=False,
+        )
+
+    def close(self) -> None:
+        pass
+
+
+class ResultSink:
+    """
+    Schreibt Ergebnisse fortlaufend in Dateien pro Quelle, statt alle DataFrames bis zum Ende
+    des Laufs im Speicher zu halten. Datensätze werden pro Quelle gepuffert und spätestens nach
+    Config.sink_flush_records Datensätzen oder Config.sink_flush_interval Sekunden geschrieben,
+    sodass der Speicherbedarf unabhängig von der Anzahl der Artikel begrenzt bleibt.
+
+    Das Format wird über Config.export_format gewählt: "csv" (CsvWriter) oder spaltenorientiert
+    als "parquet" bzw. "arrow" (ArrowWriter, benötigt pyarrow).
+
+    Wird ein Lauf mit derselben run_id neu gestartet (Config.result_run_id), werden vorhandene
+    Dateien fortgesetzt: Artikel, deren article_link bereits geschrieben wurde, und bereits
+    geschriebene Tabellen werden übersprungen.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        run_id (str): Kennung des Laufs, Teil der Dateinamen.
+        export_format (str): Das Ausgabeformat.
+    """
+
+    def __init__(self, config: Config, run_id: str = None, export_format: str = None):
+        """
+        Initialisiert die ResultSink-Instanz. Ohne run_id wird Config.result_run_id bzw. der
+        aktuelle Zeitstempel verwendet, ohne export_format Config.export_format.
+        """
+        self.config = config
+        self.run_id = run_id or config.result_run_id or datetime.datetime.now().strftime("%Y_%m_%d_%H%M%S")
+        self.export_format = export_format or config.export_format
+        if self.export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"unknown export format '{self.export_format}', choose from {list(EXPORT_FORMATS)}"
+            )
+        self.config.output_path.mkdir(parents=True, exist_ok=True)
+
+        if self.export_format == "csv":
+            self.writer = CsvWriter(config=config, run_id=self.run_id)
+        else:
+            self.writer = ArrowWriter(config=config, run_id=self.run_id, file_format=self.export_format)
+
+        self._buffers: Dict[str, List[dict]] = {}
+        self._on_written: Dict[str, List[Callable[[], None]]] = {}
+        self._written_keys: Dict[str, set] = {}
+        self._resumed: set = set()
+        self._last_flush = time.monotonic()
+        self._n_written = 0
+
+    def _open_source(self, name: str) -> None:
+        """
+        Liest beim ersten Zugriff auf eine Quelle die Schlüssel bereits vorhandener Dateien
+        dieses Laufs ein, damit sie fortgesetzt werden können.
+        """
+        if name in self._written_keys:
+            return
+        self._written_keys[name] = set()
+        if not self.writer.exists(name):
+            return
+
+        self._resumed.add(name)
+        self._written_keys[name] = self.writer.read_keys(name, KEY_COLUMN)
+        logger.info(
+            f"resuming output of {name} with {len(self._written_keys[name])} records already written"
+        )
+
+    def written_keys(self, name: str) -> set:
+        """
+        Die article_links, die für eine Quelle bereits geschrieben wurden (auch aus einem
+        fortgesetzten Lauf).
+        """
+        self._open_source(name)
+        return self._written_keys[name]
+
+    def write(self, name: str, records: Iterable[dict], on_written: Callable[[], None] = None) -> None:
+        """
+        Nimmt Datensätze einer Quelle entgegen und schreibt sie gepuffert in deren Datei.
+
+        Args:
+            name (str): Der Name der Quelle bzw. der Ausgabedatei.
+            records (Iterable[dict]): Die Datensätze, z. B. extrahierte Artikel.
+            on_written (Callable[[], None]): Optionale Funktion, die aufgerufen wird, sobald die
+                Datensätze in der Datei stehen, z. B. um Artikel erst dann als gesehen zu
+                vermerken (nach einem Absturz fehlen sonst Artikel, die nie geschrieben wurden).
+        """
+        self._open_source(name)
+        buffer = self._buffers.setdefault(name, [])
+        written_keys = self._written_keys[name]
+        for record in records:
+            key = record.get(KEY_COLUMN)
+            if key is not None:
+                if key in written_keys:
+                    logger.info(f"record already written, skipping : {key}")
+                    continue
+                written_keys.add(key)
+            buffer.append(record)
+        if on_written:
+            self._on_written.setdefault(name, []).append(on_written)
+
+        if (
+            len(buffer) >= self.config.sink_flush_records
+            or time.monotonic() - self._last_flush >= self.config.sink_flush_interval
+        ):
+            self.flush()
+
+    def write_frame(self, output: pd.DataFrame) -> None:
+        """
+        Schreibt einen vollständigen DataFrame (z. B. eine Tabelle) sofort unter dem Namen aus
+        dessen Spalte "name". DataFrames mit Artikeln werden wie write behandelt, beim Fortsetzen
+        werden bereits vorhandene Tabellen übersprungen.
+
+        Args:
+            output (pd.DataFrame): Der DataFrame mit einer Spalte "name".
+        """
+        if not isinstance(output, pd.DataFrame) or output.empty:
+            logger.warning("dataframe is empty or the output is not a dataframe")
+            return
+
+        name = output["name"].iloc[0]
+        if KEY_COLUMN in output.columns:
+            # Artikel-DataFrames laufen über den Artikelpfad (festes Schema, Schlüssel)
+            self.write(name, output.replace({np.nan: None}).to_dict("records"))
+            self._flush_source(name)
+            return
+
+        self._open_source(name)
+        if name in self._resumed:
+            logger.info(f"dataframe {name} already exported, skipping")
+            return
+
+        self._flush_source(name)
+        self.writer.write_frame(name, output)
+        self._n_written += len(output)
+        logger.success(f"dataframe {name} exported successfully")
+
+    def flush(self) -> None:
+        """
+        Schreibt die gepufferten Datensätze aller Quellen.
+        """
+        for name in self._buffers:
+            self._flush_source(name)
+        self._last_flush = time.monotonic()
+
+    def _flush_source(self, name: str) -> None:
+        buffer = self._buffers.get(name)
+        if buffer:
+            self.writer.write_records(name, buffer)
+            self._n_written += len(buffer)
+            buffer.clear()
+        for on_written in self._on_written.pop(name, []):
+            on_written()
+
+    def close(self) -> None:
+        """
+        Schreibt alle verbleibenden Datensätze.
+        """
+        self.flush()
+        self.writer.close()
+        logger.success(f"{self._n_written} records exported to {self.config.output_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,142 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import Config
+
+# Query-Parameter, die nur dem Tracking dienen und den Inhalt nicht verändern
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalisiert eine URL für den Vergleich: Schema und Host in Kleinbuchstaben,
+    ohne Fragment, ohne Tracking-Parameter, sortierte Query und ohne abschließenden Slash.
+
+    Args:
+        url (str): Die zu normalisierende URL.
+
+    Returns:
+        str: Die normalisierte URL.
+    """
+    split_url = urlsplit(url.strip())
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(split_url.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+        )
+    )
+    path = split_url.path.rstrip("/") or "/"
+    return urlunsplit(
+        (split_url.scheme.lower(), split_url.netloc.lower(), path, query, "")
+    )
+
+
+def content_hash(content: bytes | str) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class SeenArticleStore:
+    """
+    Persistenter Speicher bereits extrahierter Artikel für den inkrementellen Crawl.
+    Pro normalisierter URL werden der Hash der HTML-Seite und der Hash des Artikeltextes
+    gespeichert, sodass unveränderte Artikel weder erneut geparst noch erneut exportiert werden.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die SeenArticleStore-Instanz und legt die Datenbank bei Bedarf an.
+        """
+        self.config = config
+        Path(config.seen_store_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(config.seen_store_path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_articles (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT,
+                text_hash TEXT,
+                first_seen REAL,
+                last_seen REAL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def filter_unseen(self, links: Iterable[str], include_seen: bool = False) -> List[str]:
+        """
+        Gibt nur die Links zurück, die noch nie extrahiert wurden (ohne Duplikate,
+        Reihenfolge bleibt erhalten).
+
+        Args:
+            links (Iterable[str]): Die gefundenen Links.
+            include_seen (bool): Bei True werden bekannte Links nicht entfernt, sondern nur
+                Duplikate, z. B. um bekannte Artikel auf Änderungen zu prüfen.
+
+        Returns:
+            List[str]: Die zu ladenden Links.
+        """
+        unseen, normalized_links = [], set()
+        for link in links:
+            normalized_link = normalize_url(link)
+            if normalized_link in normalized_links:
+                continue
+            normalized_links.add(normalized_link)
+            if include_seen or not self._row(normalized_link):
+                unseen.append(link)
+        return unseen
+
+    def is_unchanged_body(self, link: str, body: bytes) -> bool:
+        """
+        Prüft, ob die heruntergeladene Seite identisch mit der zuletzt extrahierten ist.
+        """
+        row = self._row(normalize_url(link))
+        return bool(row) and row[0] == content_hash(body)
+
+    def is_unchanged_text(self, link: str, text: str) -> bool:
+        """
+        Prüft, ob der Artikeltext identisch mit dem zuletzt extrahierten ist.
+        """
+        row = self._row(normalize_url(link))
+        return bool(row) and row[1] == content_hash(text)
+
+    def mark_seen(self, records: Iterable[tuple]) -> None:
+        """
+        Speichert extrahierte Artikel in einer Transaktion.
+
+        Args:
+            records (Iterable[tuple]): Tupel aus (Link, HTML-Inhalt, Artikeltext).
+        """
+        now = time.time()
+        self._connection.executemany(
+            """
+            INSERT INTO seen_articles VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                body_hash = excluded.body_hash,
+                text_hash = excluded.text_hash,
+                last_seen = excluded.last_seen
+            """,
+            [
+                (normalize_url(link), content_hash(body), content_hash(text), now, now)
+                for link, body, text in records
+            ],
+        )
+        self._connection.commit()
+
+    def _row(self, normalized_link: str) -> tuple | None:
+        return self._connection.execute(
+            "SELECT body_hash, text_hash FROM seen_articles WHERE url = ?",
+            (normalized_link,),
+        ).fetchone()
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,404 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import Config
+
+# redis ist optional und wird nur für task_queue_url "redis://..." benötigt
+try:
+    import redis
+except ImportError:
+    redis = None
+
+TASK_STATES = ("queued", "leased", "done", "failed")
+
+
+@dataclass
+class Task:
+    """
+    Eine Aufgabe in der TaskQueue.
+
+    Attributes:
+        id (str): Die Kennung der Aufgabe.
+        kind (str): Die Art der Aufgabe, z. B. "source" oder "article".
+        payload (dict): Die Daten der Aufgabe (JSON-serialisierbar).
+        attempts (int): Anzahl der bisherigen Zuteilungen inkl. der aktuellen.
+    """
+
+    id: str
+    kind: str
+    payload: dict
+    attempts: int = 0
+
+
+def retry_delay(config: Config, task: Task, delay: float | None = None) -> float:
+    """
+    Wartezeit, bevor eine fehlgeschlagene Aufgabe erneut vergeben wird: exponentiell mit den
+    Versuchen ab Config.task_retry_delay, höchstens Config.task_retry_max_delay, mindestens
+    delay (z. B. die verbleibende Pause des Circuit Breakers).
+    """
+    backoff = min(config.task_retry_max_delay, config.task_retry_delay * 2 ** max(0, task.attempts - 1))
+    return max(backoff, delay or 0.0)
+
+
+def open_task_queue(config: Config) -> "SqliteTaskQueue | RedisTaskQueue":
+    """
+    Öffnet die TaskQueue aus Config.task_queue_url: "sqlite:///<pfad>" für einen Rechner
+    (mehrere Prozesse), "redis://<host>:<port>/<db>" für mehrere Rechner.
+    """
+    scheme = urlsplit(config.task_queue_url).scheme
+    if scheme == "sqlite":
+        return SqliteTaskQueue(config=config)
+    if scheme in ("redis", "rediss"):
+        return RedisTaskQueue(config=config)
+    raise ValueError(f"unsupported task_queue_url '{config.task_queue_url}'")
+
+
+class SqliteTaskQueue:
+    """
+    Gemeinsame Warteschlange für Coordinator und Worker auf Basis einer SQLite-Datei.
+    Mehrere Prozesse auf einem Rechner können sie gleichzeitig nutzen (WAL-Modus, jede
+    Zuteilung in einer eigenen Schreibtransaktion).
+
+    Aufgaben werden mit einem Lease zugeteilt: Wird eine Aufgabe nicht innerhalb von
+    Config.task_visibility_timeout Sekunden bestätigt (ack) oder verlängert (extend), wird
+    sie erneut vergeben, z. B. wenn ein Worker abgestürzt ist. Eine fehlgeschlagene Aufgabe
+    wird erst nach einer Wartezeit (siehe retry_delay) erneut vergeben, nach
+    Config.task_max_attempts Zuteilungen gilt sie als fehlgeschlagen. Über dedup_key werden doppelte Aufgaben (z. B.
+    dieselbe URL von mehreren Workern) nur einmal angelegt.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+        path (Path): Pfad der Datenbank.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die SqliteTaskQueue-Instanz und legt die Datenbank bei Bedarf an.
+        """
+        self.config = config
+        # Wie bei SQLAlchemy: sqlite:///relativ/pfad bzw. sqlite:////absoluter/pfad
+        self.path = Path(config.task_queue_url.removeprefix("sqlite:///"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Der Heartbeat des Workers läuft in einem eigenen Thread, daher eine Verbindung mit Lock
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                dedup_key TEXT UNIQUE,
+                payload TEXT,
+                state TEXT,
+                attempts INTEGER,
+                lease_until REAL,
+                available_at REAL,
+                worker TEXT,
+                error TEXT
+            )
+            """
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(tasks)")}
+        if "available_at" not in columns:
+            # Datenbank einer früheren Version
+            self._connection.execute("ALTER TABLE tasks ADD COLUMN available_at REAL")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, kind, lease_until)"
+        )
+
+    def put_many(self, kind: str, payloads: Iterable[dict], dedup_keys: Iterable[str] = None) -> int:
+        """
+        Legt Aufgaben an. Aufgaben mit bereits vorhandenem dedup_key werden übersprungen.
+
+        Args:
+            kind (str): Die Art der Aufgaben.
+            payloads (Iterable[dict]): Die Daten der Aufgaben.
+            dedup_keys (Iterable[str]): Optional ein Schlüssel pro Aufgabe.
+
+        Returns:
+            int: Anzahl der neu angelegten Aufgaben.
+        """
+        payloads = list(payloads)
+        dedup_keys = list(dedup_keys) if dedup_keys is not None else [None] * len(payloads)
+        with self._lock:
+            before = self._connection.total_changes
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.executemany(
+                """
+                INSERT OR IGNORE INTO tasks (kind, dedup_key, payload, state, attempts)
+                VALUES (?, ?, ?, 'queued', 0)
+                """,
+                [
+                    (kind, dedup_key, json.dumps(payload, default=str))
+                    for payload, dedup_key in zip(payloads, dedup_keys)
+                ],
+            )
+            self._connection.execute("COMMIT")
+            return self._connection.total_changes - before
+
+    def lease(self, worker: str, kinds: Iterable[str] = None, limit: int = 1) -> List[Task]:
+        """
+        Teilt bis zu limit wartende (deren Wartezeit abgelaufen ist) oder abgelaufene Aufgaben
+        dem Worker zu.
+
+        Args:
+            worker (str): Die Kennung des Workers.
+            kinds (Iterable[str]): Optional nur Aufgaben dieser Arten.
+            limit (int): Maximale Anzahl Aufgaben.
+
+        Returns:
+            List[Task]: Die zugeteilten Aufgaben (leer, falls keine verfügbar ist).
+        """
+        now = time.time()
+        kinds = list(kinds or [])
+        kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Aufgaben mit abgelaufenem Lease nach zu vielen Versuchen aufgeben
+                self._connection.execute(
+                    """
+                    UPDATE tasks SET state = 'failed', error = 'lease expired'
+                    WHERE state = 'leased' AND lease_until < ? AND attempts >= ?
+                    """,
+                    (now, self.config.task_max_attempts),
+                )
+                rows = self._connection.execute(
+                    f"""
+                    SELECT id, kind, payload, attempts FROM tasks
+                    WHERE (
+                        (state = 'queued' AND (available_at IS NULL OR available_at <= ?))
+                        OR (state = 'leased' AND lease_until < ?)
+                    ) {kind_filter}
+                    ORDER BY id LIMIT ?
+                    """,
+                    (now, now, *kinds, limit),
+                ).fetchall()
+                self._connection.executemany(
+                    """
+                    UPDATE tasks SET state = 'leased', attempts = attempts + 1,
+                        lease_until = ?, worker = ? WHERE id = ?
+                    """,
+                    [(now + self.config.task_visibility_timeout, worker, row[0]) for row in rows],
+                )
+                self._connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                raise
+        return [
+            Task(id=str(task_id), kind=kind, payload=json.loads(payload), attempts=attempts + 1)
+            for task_id, kind, payload, attempts in rows
+        ]
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """
+        Verlängert das Lease laufender Aufgaben (Heartbeat des Workers).
+        """
+        lease_until = time.time() + self.config.task_visibility_timeout
+        with self._lock:
+            self._connection.executemany(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND state = 'leased'",
+                [(lease_until, int(task.id)) for task in tasks],
+            )
+
+    def ack(self, task: Task) -> None:
+        """
+        Markiert eine Aufgabe als erledigt.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tasks SET state = 'done', lease_until = NULL WHERE id = ?", (int(task.id),)
+            )
+
+    def fail(self, task: Task, error: str, delay: float = None) -> None:
+        """
+        Gibt eine fehlgeschlagene Aufgabe zurück. Sie wird nach einer Wartezeit erneut
+        vergeben, bis Config.task_max_attempts erreicht ist.
+
+        Args:
+            task (Task): Die Aufgabe.
+            error (str): Der Fehler.
+            delay (float): Mindestwartezeit in Sekunden, z. B. die Pause des Circuit Breakers.
+        """
+        state = "queued" if task.attempts < self.config.task_max_attempts else "failed"
+        available_at = time.time() + retry_delay(self.config, task, delay)
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tasks SET state = ?, lease_until = NULL, available_at = ?, error = ? WHERE id = ?",
+                (state, available_at, error, int(task.id)),
+            )
+        if state == "failed":
+            logger.error(f"task {task.kind} {task.id} failed after {task.attempts} attempts - {error}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Anzahl der Aufgaben pro Zustand.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+            ).fetchall()
+        return {state: dict(rows).get(state, 0) for state in TASK_STATES}
+
+    def pending(self) -> int:
+        """
+        Anzahl der wartenden und laufenden Aufgaben.
+        """
+        stats = self.stats()
+        return stats["queued"] + stats["leased"]
+
+    def clear(self) -> None:
+        """
+        Entfernt alle Aufgaben, z. B. vor einem neuen Lauf.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisTaskQueue:
+    """
+    TaskQueue mit Redis (oder einem kompatiblen Server wie Valkey/KeyDB) für Worker auf
+    mehreren Rechnern. Verhalten wie SqliteTaskQueue: wartende Aufgaben liegen in einer Liste
+    pro Art, laufende in einem Sorted Set mit dem Ablauf des Leases als Score, zurückgegebene
+    bis zum Ende ihrer Wartezeit in einem Sorted Set mit diesem Zeitpunkt als Score, die
+    Deduplizierung erfolgt über ein Set. Alle Schlüssel beginnen mit Config.task_queue_prefix.
+
+    Attributes:
+        config (Config): Eine Instanz der Konfigurationsklasse.
+    """
+
+    # Atomar: Aufgabe aus der Warteschlange nehmen und mit Lease als laufend eintragen
+    _LEASE_SCRIPT = """
+        local task_id = redis.call('RPOP', KEYS[1])
+        if not task_id then return nil end
+        redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+        redis.call('HSET', KEYS[3] .. task_id, 'state', 'leased', 'worker', ARGV[2])
+        redis.call('HINCRBY', KEYS[3] .. task_id, 'attempts', 1)
+        return task_id
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialisiert die RedisTaskQueue-Instanz.
+        """
+        if redis is None:
+            raise ImportError(
+                "task_queue_url 'redis://...' requires the optional package redis (pip install redis)"
+            )
+        self.config = config
+        self._redis = redis.Redis.from_url(config.task_queue_url, decode_responses=True)
+        self._lease_script = self._redis.register_script(self._LEASE_SCRIPT)
+        self._prefix = config.task_queue_prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self._prefix, *parts))
+
+    def put_many(self, kind: str, payloads: Iterable[dict], dedup_keys: Iterable[str] = None) -> int:
+        payloads = list(payloads)
+        dedup_keys = list(dedup_keys) if dedup_keys is not None else [None] * len(payloads)
+        n_new = 0
+        for payload, dedup_key in zip(payloads, dedup_keys):
+            # SADD ist atomar, nur der erste Worker legt die Aufgabe an
+            if dedup_key is not None and not self._redis.sadd(self._key("dedup"), dedup_key):
+                continue
+            task_id = str(self._redis.incr(self._key("seq")))
+            pipeline = self._redis.pipeline()
+            pipeline.hset(
+                self._key("task", task_id),
+                mapping={"kind": kind, "payload": json.dumps(payload, default=str), "state": "queued", "attempts": 0},
+            )
+            pipeline.lpush(self._key("queued", kind), task_id)
+            pipeline.sadd(self._key("kinds"), kind)
+            pipeline.execute()
+            n_new += 1
+        return n_new
+
+    def _requeue_expired(self) -> None:
+        now = time.time()
+        for task_id in self._redis.zrangebyscore(self._key("delayed"), "-inf", now):
+            # Wartezeit abgelaufen, nur wer den Eintrag entfernt, stellt die Aufgabe ein
+            if self._redis.zrem(self._key("delayed"), task_id):
+                kind = self._redis.hget(self._key("task", task_id), "kind")
+                self._redis.rpush(self._key("queued", kind), task_id)
+        for task_id in self._redis.zrangebyscore(self._key("leased"), "-inf", now):
+            # Nur wer den Eintrag entfernt, vergibt die Aufgabe neu
+            if not self._redis.zrem(self._key("leased"), task_id):
+                continue
+            task = self._redis.hgetall(self._key("task", task_id))
+            if int(task.get("attempts", 0)) >= self.config.task_max_attempts:
+                self._redis.hset(self._key("task", task_id), mapping={"state": "failed", "error": "lease expired"})
+            else:
+                self._redis.hset(self._key("task", task_id), "state", "queued")
+                self._redis.rpush(self._key("queued", task["kind"]), task_id)
+
+    def lease(self, worker: str, kinds: Iterable[str] = None, limit: int = 1) -> List[Task]:
+        self._requeue_expired()
+        kinds = list(kinds or self._redis.smembers(self._key("kinds")))
+        lease_until = time.time() + self.config.task_visibility_timeout
+        tasks = []
+        for kind in kinds:
+            while len(tasks) < limit:
+                task_id = self._lease_script(
+                    keys=[self._key("queued", kind), self._key("leased"), self._key("task", "")],
+                    args=[lease_until, worker],
+                )
+                if task_id is None:
+                    break
+                task = self._redis.hgetall(self._key("task", task_id))
+                tasks.append(
+                    Task(id=task_id, kind=kind, payload=json.loads(task["payload"]), attempts=int(task["attempts"]))
+                )
+        return tasks
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        lease_until = time.time() + self.config.task_visibility_timeout
+        for task in tasks:
+            # XX: nur noch laufende Aufgaben verlängern
+            self._redis.zadd(self._key("leased"), {task.id: lease_until}, xx=True)
+
+    def ack(self, task: Task) -> None:
+        self._redis.zrem(self._key("leased"), task.id)
+        self._redis.hset(self._key("task", task.id), "state", "done")
+
+    def fail(self, task: Task, error: str, delay: float = None) -> None:
+        self._redis.zrem(self._key("leased"), task.id)
+        if task.attempts < self.config.task_max_attempts:
+            available_at = time.time() + retry_delay(self.config, task, delay)
+            self._redis.hset(self._key("task", task.id), mapping={"state": "queued", "error": error})
+            self._redis.zadd(self._key("delayed"), {task.id: available_at})
+        else:
+            self._redis.hset(self._key("task", task.id), mapping={"state": "failed", "error": error})
+            logger.error(f"task {task.kind} {task.id} failed after {task.attempts} attempts - {error}")
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict.fromkeys(TASK_STATES, 0)
+        for task_key in self._redis.scan_iter(self._key("task", "*")):
+            counts[self._redis.hget(task_key, "state")] += 1
+        return counts
+
+    def pending(self) -> int:
+        kinds = self._redis.smembers(self._key("kinds"))
+        n_queued = sum(self._redis.llen(self._key("queued", kind)) for kind in kinds)
+        return n_queued + self._redis.zcard(self._key("leased")) + self._redis.zcard(self._key("delayed"))
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(self._key("*")):
+            self._redis.delete(key)
+
+    def close(self) -> None:
+        self._redis.close()
@@ -0,0 +1,53 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Die Module importieren "config" und "src..." relativ zum Projektverzeichnis
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+from benchmarks.make_fixtures import make_site  # noqa: E402
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    """
+    Config, deren Dateien (Caches, Indizes, Checkpoints, Queue) im temporären Verzeichnis liegen.
+    """
+    config = Config()
+    config.output_path = tmp_path.joinpath("output")
+    config.strategy_probe_path = tmp_path.joinpath("strategy_probe.sqlite")
+    config.cache_path = tmp_path.joinpath("http_cache")
+    config.seen_store_path = tmp_path.joinpath("seen_articles.sqlite")
+    config.dedup_index_path = tmp_path.joinpath("near_duplicates.sqlite")
+    config.checkpoint_path = tmp_path.joinpath("checkpoints")
+    config.metrics_path = tmp_path.joinpath("reports")
+    config.task_queue_url = f"sqlite:///{tmp_path.joinpath('task_queue.sqlite')}"
+    config.user_agent = "test"
+    # Gegen den lokalen FixtureServer ohne Höflichkeitspausen und Prozess-Pool
+    config.cache_enabled = False
+    config.default_requests_per_second = 1000.0
+    config.default_burst = 100
+    config.respect_crawl_delay = False
+    config.parse_workers = 0
+    return config
+
+
+@pytest.fixture(scope="session")
+def fixture_site(tmp_path_factory) -> FixtureServer:
+    """
+    Kleine Website aus benchmarks/make_fixtures.py (2 Listenseiten mit je 5 Artikeln, Sitemap,
+    Feed und Tabellenseite) auf einem lokalen FixtureServer.
+    """
+    root = tmp_path_factory.mktemp("site")
+    for path, content in make_site(random.Random(1), n_pages=2, n_articles=5, n_paragraphs=4).items():
+        root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            root.joinpath(path).write_bytes(content)
+        else:
+            root.joinpath(path).write_text(content, encoding="utf-8")
+    with FixtureServer(root=root) as server:
+        yield server
@@ -0,0 +1,62 @@
+import asyncio
+import random
+
+import pandas as pd
+
+from benchmarks.make_fixtures import make_site
+from src.parser.html_parser import HtmlParser
+from src.parser.source_spec import SourcePlan
+from src.utils.async_fetcher import AsyncFetcher
+from src.utils.result_sink import ResultSink
+
+
+def make_source(base_url: str) -> SourcePlan:
+    source = SourcePlan.from_dict({"url": f"{base_url}/latest/", "name": "news", "newspaper3K": True})
+    # Dieselbe Website wie im fixture_site
+    paths = make_site(random.Random(1), n_pages=2, n_articles=5, n_paragraphs=4)
+    source.sublinks = [
+        f"{base_url}/{path.removesuffix('index.html')}" for path in paths if path.startswith("2024/")
+    ]
+    return source
+
+
+def test_only_written_articles_are_marked_seen(config, fixture_site):
+    config.incremental_crawl = True
+    config.sink_flush_records = 100
+    html_parser = HtmlParser(config=config)
+    source = make_source(fixture_site.base_url)
+    links = list(source.sublinks)
+
+    with ResultSink(config=config, run_id="run") as sink:
+        html_parser.get_articles_with_newspaper([source], n_articles=3, sink=sink)
+        # Vor dem Schreiben gilt noch kein Artikel als gesehen
+        assert html_parser.seen_store.filter_unseen(links) == links
+
+    written = pd.read_csv(config.output_path.joinpath("news_run.csv"), sep=config.delimiter)
+    seen = set(links) - set(html_parser.seen_store.filter_unseen(links))
+    assert len(written) == 3
+    assert seen == set(written["article_link"])
+
+
+def test_slow_download_does_not_hold_back_the_others(config, fixture_site, monkeypatch):
+    config.parse_queue_size = 2
+    html_parser = HtmlParser(config=config)
+    source = make_source(fixture_site.base_url)
+    slow_link = source.sublinks[0]
+    started, slow_done = [], []
+
+    fetch_one = AsyncFetcher._fetch_one
+
+    async def slow_fetch_one(self, url, *args):
+        started.append(url)
+        if url == slow_link:
+            await asyncio.sleep(0.5)
+            slow_done.append(len(started))
+        return await fetch_one(self, url, *args)
+
+    monkeypatch.setattr(AsyncFetcher, "_fetch_one", slow_fetch_one)
+    frames = html_parser.get_articles_with_newspaper([source])
+
+    # Der zweite Platz der Warteschlange wird währenddessen weiter neu belegt
+    assert slow_done[0] == len(source.sublinks)
+    assert len(frames[0]) == len(source.sublinks)
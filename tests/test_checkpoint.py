@@ -0,0 +1,134 @@
+import json
+import os
+import time
+
+import pytest
+
+from src.parser.checkpoint import CheckpointStore
+from src.parser.source_spec import SourcePlan
+
+
+def make_sources(max_pages: int = 2) -> list:
+    return [
+        SourcePlan.from_dict(
+            {
+                "url": "https://example.com/latest/",
+                "name": "news",
+                "bs4": True,
+                "newspaper3K": True,
+                "paginated": True,
+                "a_tag_location_css": "title",
+                "pagination": {"strategy": "url_template", "template": "{url}page/{page}/", "max_pages": max_pages},
+            }
+        ),
+        SourcePlan.from_dict({"url": "https://example.com/medals/", "name": "medals", "pandas": True}),
+    ]
+
+
+def interrupted_run(config) -> str:
+    sources = make_sources()
+    checkpoint = CheckpointStore.open(config, sources)
+    sources[0].pages = ["https://example.com/latest/", "https://example.com/latest/page/2/"]
+    sources[0].sublinks = ["https://example.com/a/", "https://example.com/b/"]
+    checkpoint.record_source(sources[0])
+    checkpoint.record_tables("medals")
+    checkpoint.record_link("news", "https://example.com/a/")
+    checkpoint.close()
+    return checkpoint.run_id
+
+
+def test_unfinished_run_is_resumed(config):
+    run_id = interrupted_run(config)
+    sources = make_sources()
+
+    checkpoint = CheckpointStore.open(config, sources)
+
+    assert checkpoint.run_id == run_id
+    assert sources[0].sublinks == ["https://example.com/a/", "https://example.com/b/"]
+    assert sources[0].pages[-1] == "https://example.com/latest/page/2/"
+    assert sources[0].pagination_strategy is None
+    assert sources[1].sublinks is None
+    assert checkpoint.tables_done("medals")
+    assert checkpoint.done_links("news") == {"https://example.com/a/"}
+    checkpoint.close()
+
+
+def test_finished_run_starts_a_new_run(config):
+    run_id = interrupted_run(config)
+    with CheckpointStore.open(config, make_sources()) as checkpoint:
+        assert checkpoint.run_id == run_id
+
+    sources = make_sources()
+    checkpoint = CheckpointStore.open(config, sources)
+    assert checkpoint.run_id != run_id
+    assert sources[0].sublinks is None
+    assert not checkpoint.tables_done("medals")
+    checkpoint.close()
+
+
+def test_run_stays_open_after_an_error(config):
+    run_id = interrupted_run(config)
+    with pytest.raises(KeyboardInterrupt):
+        with CheckpointStore.open(config, make_sources()):
+            raise KeyboardInterrupt
+
+    assert CheckpointStore.open(config, make_sources()).run_id == run_id
+
+
+def test_changed_sources_start_a_new_run(config):
+    run_id = interrupted_run(config)
+
+    checkpoint = CheckpointStore.open(config, make_sources(max_pages=5))
+
+    assert checkpoint.run_id != run_id
+    checkpoint.close()
+
+
+def test_old_run_is_not_resumed(config):
+    run_id = interrupted_run(config)
+    path = config.checkpoint_path.joinpath(f"{run_id}.jsonl")
+    old = time.time() - config.checkpoint_max_age - 60
+    os.utime(path, (old, old))
+
+    checkpoint = CheckpointStore.open(config, make_sources())
+    assert checkpoint.run_id != run_id
+    checkpoint.close()
+
+    # Mit fester run_id wird der Lauf unabhängig vom Alter fortgesetzt
+    config.result_run_id = run_id
+    sources = make_sources()
+    checkpoint = CheckpointStore.open(config, sources)
+    assert sources[0].sublinks is not None
+    checkpoint.close()
+
+
+def test_truncated_last_line_is_skipped(config):
+    run_id = interrupted_run(config)
+    path = config.checkpoint_path.joinpath(f"{run_id}.jsonl")
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"event": "link", "name": "news", "url": "https://exa')
+
+    checkpoint = CheckpointStore.open(config, make_sources())
+    checkpoint.record_link("news", "https://example.com/b/")
+    checkpoint.close()
+
+    # Das nächste Ereignis steht in einer eigenen Zeile statt hinter der abgeschnittenen
+    assert json.loads(path.read_text(encoding="utf-8").splitlines()[-1])["url"] == "https://example.com/b/"
+    assert CheckpointStore.open(config, make_sources()).done_links("news") == {
+        "https://example.com/a/",
+        "https://example.com/b/",
+    }
+
+
+def test_links_are_buffered(config):
+    config.checkpoint_flush_records, config.checkpoint_flush_interval = 3, 3600
+    checkpoint = CheckpointStore.open(config, make_sources())
+    size = checkpoint.path.stat().st_size
+
+    checkpoint.record_link("news", "https://example.com/a/")
+    checkpoint.record_link("news", "https://example.com/b/")
+    assert checkpoint.path.stat().st_size == size
+
+    checkpoint.record_link("news", "https://example.com/c/")
+    assert checkpoint.path.stat().st_size > size
+    checkpoint.close()
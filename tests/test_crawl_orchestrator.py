@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.parser.article_pipeline import ArticlePipeline
+from src.parser.checkpoint import CheckpointStore
+from src.parser.crawl_orchestrator import CrawlOrchestrator, SourceFlow
+from src.parser.generic_html_parser import DynamicPageHandler
+from src.parser.html_parser import HtmlParser
+from src.parser.source_spec import SourcePlan
+from src.utils.near_duplicates import NearDuplicateIndex
+from src.utils.result_sink import ResultSink
+
+
+def make_sources(base_url: str) -> list:
+    return [
+        SourcePlan.from_dict(
+            {
+                "url": f"{base_url}/latest/",
+                "name": "news",
+                "bs4": True,
+                "newspaper3K": True,
+                "paginated": True,
+                "a_tag_location_css": "loop-card__title-link",
+                "pagination": {"strategy": "url_template", "template": "{url}page/{page}/", "max_pages": 2},
+            }
+        ),
+        SourcePlan.from_dict({"url": f"{base_url}/statistics/medal/country/", "name": "medals", "pandas": True}),
+    ]
+
+
+def make_orchestrator(config) -> CrawlOrchestrator:
+    html_parser = HtmlParser(config=config)
+    return CrawlOrchestrator(
+        config=config,
+        html_parser=html_parser,
+        dynamic_page_handler=DynamicPageHandler(config=config, fetcher=html_parser.fetcher),
+    )
+
+
+def run_with_timeout(function, timeout: float = 60.0):
+    """
+    Führt function in einem Daemon-Thread aus, damit ein hängender Datenfluss den Test
+    fehlschlagen lässt, statt pytest zu blockieren.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = function()
+        except BaseException as err:
+            outcome["error"] = err
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "dataflow did not finish"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def test_run_returns_articles_and_tables(config, fixture_site):
+    orchestrator = make_orchestrator(config)
+
+    results = run_with_timeout(lambda: orchestrator.run(make_sources(fixture_site.base_url), n_articles=3))
+
+    articles, *tables = results
+    assert len(articles) == 3
+    assert len(tables) == 3
+    assert all(isinstance(table, pd.DataFrame) for table in tables)
+
+
+def test_run_writes_to_sink_and_records_checkpoint(config, fixture_site):
+    config.result_run_id = "run"
+    sources = make_sources(fixture_site.base_url)
+    checkpoint = CheckpointStore.open(config, sources)
+    orchestrator = make_orchestrator(config)
+
+    with ResultSink(config=config, run_id="run") as sink:
+        assert run_with_timeout(lambda: orchestrator.run(sources, sink=sink, checkpoint=checkpoint)) == []
+    checkpoint.close(finished=True)
+
+    articles = pd.read_csv(config.output_path.joinpath("news_run.csv"), sep=config.delimiter)
+    assert len(articles) == 10
+    assert checkpoint.tables_done("medals")
+
+
+def test_failing_export_stops_the_run(config, fixture_site):
+    class FailingSink(ResultSink):
+        def write(self, name, records, on_written=None):
+            raise OSError("disk full")
+
+    # Wenige Plätze in den Warteschlangen, ohne Überwachung warteten die Produzenten für immer
+    config.stage_queue_size = 1
+    orchestrator = make_orchestrator(config)
+    with FailingSink(config=config, run_id="run") as sink:
+        with pytest.raises(OSError, match="disk full"):
+            run_with_timeout(lambda: orchestrator.run(make_sources(fixture_site.base_url), sink=sink))
+
+
+def test_failing_download_worker_stops_the_run(config, fixture_site, monkeypatch):
+    async def acquire(self, n_articles):
+        raise RuntimeError("worker crashed")
+
+    monkeypatch.setattr(SourceFlow, "acquire", acquire)
+    # Wenige Plätze in den Warteschlangen, ohne Überwachung warteten die Produzenten für immer
+    config.stage_queue_size = 1
+    orchestrator = make_orchestrator(config)
+
+    with pytest.raises(RuntimeError, match="worker crashed"):
+        run_with_timeout(lambda: orchestrator.run(make_sources(fixture_site.base_url)))
+
+
+def test_only_written_articles_are_marked_seen(config, fixture_site):
+    config.incremental_crawl = True
+    config.sink_flush_records = 100
+
+    def run():
+        # Der SeenArticleStore (SQLite) wird im Thread des Laufs angelegt
+        orchestrator = make_orchestrator(config)
+        count = "SELECT COUNT(*) FROM seen_articles"
+        with ResultSink(config=config, run_id="run") as sink:
+            orchestrator.run(make_sources(fixture_site.base_url), n_articles=3, sink=sink)
+            n_seen_before_flush = orchestrator.seen_store._connection.execute(count).fetchone()[0]
+        return n_seen_before_flush, orchestrator.seen_store._connection.execute(count).fetchone()[0]
+
+    n_seen_before_flush, n_seen = run_with_timeout(run)
+
+    written = pd.read_csv(config.output_path.joinpath("news_run.csv"), sep=config.delimiter)
+    # Als gesehen gelten nur Artikel, die der Sink geschrieben hat
+    assert n_seen_before_flush == 0
+    assert len(written) == 3
+    assert n_seen == 3
+
+
+def test_near_duplicates_are_filtered_in_blocks(config, fixture_site, monkeypatch):
+    config.dedup_enabled = True
+    block_sizes = []
+    filter_block = NearDuplicateIndex.filter
+
+    def slow_filter(self, articles):
+        # Während ein Block geprüft wird, laufen weitere Artikel in der Warteschlange auf
+        block_sizes.append(len(articles))
+        time.sleep(0.05)
+        return filter_block(self, articles)
+
+    monkeypatch.setattr(NearDuplicateIndex, "filter", slow_filter)
+    # Mehrere Parse-Worker, aber Threads statt Prozessen
+    config.parse_workers = 4
+    monkeypatch.setattr(ArticlePipeline, "create_executor", lambda self: ThreadPoolExecutor(max_workers=4))
+
+    def run():
+        # Der NearDuplicateIndex (SQLite) wird im Thread des Laufs angelegt
+        return make_orchestrator(config).run(make_sources(fixture_site.base_url))
+
+    articles, *_ = run_with_timeout(run)
+
+    assert sum(block_sizes) == len(articles) == 10
+    assert max(block_sizes) > 1
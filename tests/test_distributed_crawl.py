@@ -0,0 +1,56 @@
+from src.parser.distributed_crawl import CrawlCoordinator, CrawlWorker
+from src.parser.source_spec import SourcePlan
+from src.utils.result_sink import ResultSink
+
+
+def make_sources(base_url: str) -> list:
+    return [
+        SourcePlan.from_dict(
+            {
+                "url": f"{base_url}/latest/",
+                "name": "news",
+                "bs4": True,
+                "newspaper3K": True,
+                "a_tag_location_css": "loop-card__title-link",
+            }
+        ),
+        SourcePlan.from_dict({"url": f"{base_url}/statistics/medal/country/", "name": "medals", "pandas": True}),
+    ]
+
+
+def test_tasks_are_acknowledged_after_the_sink_has_written_them(config, fixture_site, monkeypatch):
+    config.result_run_id = "run"
+    config.task_poll_interval = 0.05
+    buffered, written, acked_before_write = set(), set(), []
+
+    write = ResultSink.write
+
+    def recording_write(self, name, records, **kwargs):
+        buffered.update(record["article_link"] for record in records)
+        return write(self, name, records, **kwargs)
+
+    flush = ResultSink.flush
+
+    def recording_flush(self):
+        flush(self)
+        written.update(buffered)
+
+    ack = CrawlWorker._ack
+
+    def checking_ack(self, task, error=None, delay=None):
+        key = task.payload.get("link")
+        if key in buffered and key not in written:
+            acked_before_write.append(key)
+        return ack(self, task, error=error, delay=delay)
+
+    monkeypatch.setattr(ResultSink, "write", recording_write)
+    monkeypatch.setattr(ResultSink, "flush", recording_flush)
+    monkeypatch.setattr(CrawlWorker, "_ack", checking_ack)
+
+    CrawlCoordinator(config).enqueue(make_sources(fixture_site.base_url))
+    processed = CrawlWorker(config, worker_id="w0").run()
+
+    assert processed["source"] == 2
+    assert processed["article"] > 0
+    assert written
+    assert acked_before_write == []
@@ -0,0 +1,113 @@
+import os
+import time
+import zlib
+
+import pytest
+
+from src.utils.http_cache import HttpCache
+
+
+def store(cache: HttpCache, url: str, content: bytes, headers: dict = None) -> None:
+    cache.store(url, url, 200, headers or {}, "utf-8", content)
+
+
+def body_files(cache: HttpCache) -> list:
+    return sorted(cache.cache_path.joinpath("bodies").rglob("*.z"))
+
+
+@pytest.fixture
+def cache(config):
+    cache = HttpCache(config=config)
+    yield cache
+    cache.close()
+
+
+def test_store_and_get(cache):
+    store(cache, "https://example.com/a", b"<html>a</html>", {"ETag": '"v1"', "Last-Modified": "yesterday"})
+
+    entry = cache.get("https://example.com/a")
+
+    assert entry.text == "<html>a</html>"
+    assert entry.etag == '"v1"'
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}
+    assert cache.get("https://example.com/b") is None
+
+
+def test_only_successful_responses_are_stored(cache):
+    cache.store("https://example.com/a", "https://example.com/a", 404, {}, "utf-8", b"missing")
+
+    assert cache.get("https://example.com/a") is None
+
+
+def test_identical_bodies_are_stored_once(cache):
+    store(cache, "https://example.com/a", b"same")
+    store(cache, "https://example.com/b", b"same")
+
+    assert len(body_files(cache)) == 1
+    assert cache._total_size == len(zlib.compress(b"same"))
+
+
+def test_freshness_and_touch(config, cache):
+    config.cache_ttl = 60
+    store(cache, "https://example.com/a", b"a")
+    entry = cache.get("https://example.com/a")
+    assert cache.is_fresh(entry)
+
+    entry.stored_at -= 120
+    assert not cache.is_fresh(entry)
+    cache.touch("https://example.com/a")
+    assert cache.is_fresh(cache.get("https://example.com/a"))
+
+
+def test_eviction_removes_least_recently_used(config):
+    bodies = {f"https://example.com/{n}": os.urandom(1000) for n in range(4)}
+    config.cache_max_bytes = 3 * len(zlib.compress(next(iter(bodies.values())))) + 100
+    cache = HttpCache(config=config)
+
+    urls = list(bodies)
+    for url in urls[:3]:
+        store(cache, url, bodies[url])
+        time.sleep(0.01)
+    # Zugriff macht den ältesten Eintrag wieder zum jüngsten
+    cache.get(urls[0])
+    store(cache, urls[3], bodies[urls[3]])
+
+    assert cache.get(urls[1]) is None
+    assert all(cache.get(url) for url in (urls[0], urls[2], urls[3]))
+    assert len(body_files(cache)) == 3
+    assert cache._total_size <= config.cache_max_bytes
+    cache.close()
+
+
+def test_shared_body_is_kept_while_referenced(config):
+    config.cache_max_bytes = 2 * len(zlib.compress(b"x" * 1000)) + 10
+    cache = HttpCache(config=config)
+
+    store(cache, "https://example.com/a", b"x" * 1000)
+    store(cache, "https://example.com/b", b"x" * 1000)
+    store(cache, "https://example.com/c", b"y" * 1000)
+    store(cache, "https://example.com/d", b"z" * 1000)
+
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/c") and cache.get("https://example.com/d")
+    assert len(body_files(cache)) == 2
+    cache.close()
+
+
+def test_replaced_body_is_released(cache):
+    store(cache, "https://example.com/a", b"old version")
+    store(cache, "https://example.com/a", b"new version")
+
+    assert cache.get("https://example.com/a").content == b"new version"
+    assert len(body_files(cache)) == 1
+    assert cache._total_size == len(zlib.compress(b"new version"))
+
+
+def test_total_size_is_restored_on_open(config, cache):
+    store(cache, "https://example.com/a", b"a" * 100)
+    store(cache, "https://example.com/b", b"b" * 100)
+    cache.close()
+
+    reopened = HttpCache(config=config)
+    assert reopened._total_size == sum(path.stat().st_size for path in body_files(reopened))
+    reopened.close()
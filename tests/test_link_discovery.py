@@ -0,0 +1,141 @@
+import asyncio
+import datetime
+import gzip
+from types import SimpleNamespace
+
+from src.parser.link_discovery import LinkDiscovery, iter_entries, parse_date
+from src.parser.source_spec import SourcePlan
+from src.utils.async_fetcher import FetchResult
+from src.utils.metrics import Metrics
+
+SITEMAP_NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+IMAGE_NS = 'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"'
+NEWS_NS = 'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9"'
+
+
+def test_image_sitemap_keeps_entry_loc():
+    content = (
+        f'<?xml version="1.0"?><urlset {SITEMAP_NS} {IMAGE_NS}>'
+        "<url><loc>https://example.com/a/</loc><lastmod>2024-05-01</lastmod>"
+        "<image:image><image:loc>https://example.com/a.jpg</image:loc></image:image></url>"
+        "<url><image:image><image:loc>https://example.com/b.jpg</image:loc></image:image>"
+        "<loc>https://example.com/b/</loc></url>"
+        "</urlset>"
+    ).encode()
+
+    entries = list(iter_entries(content))
+
+    assert [url for _, url, _ in entries] == ["https://example.com/a/", "https://example.com/b/"]
+    assert entries[0][2] == datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+
+
+def test_news_sitemap_prefers_publication_date():
+    content = (
+        f'<?xml version="1.0"?><urlset {SITEMAP_NS} {NEWS_NS}>'
+        "<url><loc>https://example.com/a/</loc><lastmod>2024-05-03T00:00:00Z</lastmod>"
+        "<news:news><news:publication_date>2024-05-01T12:00:00Z</news:publication_date></news:news></url>"
+        "</urlset>"
+    ).encode()
+
+    [(kind, url, date)] = iter_entries(content)
+
+    assert (kind, url) == ("link", "https://example.com/a/")
+    assert date == datetime.datetime(2024, 5, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def test_gzip_sitemap_index():
+    content = gzip.compress(
+        f'<?xml version="1.0"?><sitemapindex {SITEMAP_NS}>'
+        "<sitemap><loc>/sitemap-1.xml</loc></sitemap><sitemap><loc>/sitemap-2.xml</loc></sitemap>"
+        "</sitemapindex>".encode()
+    )
+
+    assert [entry[:2] for entry in iter_entries(content)] == [
+        ("sitemap", "/sitemap-1.xml"),
+        ("sitemap", "/sitemap-2.xml"),
+    ]
+
+
+def test_truncated_sitemap_keeps_complete_entries():
+    content = (
+        f'<?xml version="1.0"?><urlset {SITEMAP_NS}>'
+        "<url><loc>/a/</loc></url><url><loc>/b/</loc></url><url><lastmod>2024-0"
+    ).encode()
+
+    assert [url for _, url, _ in iter_entries(content)] == ["/a/", "/b/"]
+
+
+def test_rss_and_atom_feeds():
+    rss = (
+        '<rss version="2.0"><channel><link>https://example.com/</link>'
+        "<item><link>https://example.com/a/</link><pubDate>Wed, 01 May 2024 10:00:00 +0000</pubDate></item>"
+        "</channel></rss>"
+    ).encode()
+    atom = (
+        '<feed xmlns="http://www.w3.org/2005/Atom"><link rel="self" href="https://example.com/feed"/>'
+        '<entry><link rel="alternate" href="https://example.com/b/"/><published>2024-05-02T10:00:00Z</published></entry>'
+        "</feed>"
+    ).encode()
+
+    assert [url for _, url, _ in iter_entries(rss)] == ["https://example.com/a/"]
+    assert [url for _, url, _ in iter_entries(atom)] == ["https://example.com/b/"]
+
+
+def test_parse_date():
+    assert parse_date("2024-05-01") == datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+    assert parse_date("Wed, 01 May 2024 10:00:00 GMT").hour == 10
+    assert parse_date("gestern") is None
+    assert parse_date(None) is None
+
+
+def test_discover_reads_index_newest_first(config):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    documents = {
+        "https://example.com/robots.txt": b"User-agent: *\nSitemap: /sitemap.xml\n",
+        "https://example.com/sitemap.xml": (
+            f"<sitemapindex {SITEMAP_NS}>"
+            f"<sitemap><loc>/new.xml</loc><lastmod>{now.isoformat()}</lastmod></sitemap>"
+            "<sitemap><loc>/old.xml</loc><lastmod>2001-01-01</lastmod></sitemap>"
+            "</sitemapindex>"
+        ).encode(),
+        "https://example.com/new.xml": (
+            f"<urlset {SITEMAP_NS} {IMAGE_NS}>"
+            f"<url><loc>/a/</loc><lastmod>{(now - datetime.timedelta(days=1)).isoformat()}</lastmod>"
+            "<image:image><image:loc>/a.jpg</image:loc></image:image></url>"
+            f"<url><loc>/b/</loc><lastmod>{now.isoformat()}</lastmod></url>"
+            "<url><loc>/c/</loc><lastmod>2001-01-01</lastmod></url>"
+            "</urlset>"
+        ).encode(),
+    }
+    requested = []
+
+    async def fetch(url):
+        requested.append(url)
+        if url not in documents:
+            return FetchResult(url=url, final_url=url, status_code=404, content=b"", text="")
+        content = documents[url]
+        return FetchResult(url=url, final_url=url, status_code=200, content=content, text=content.decode())
+
+    source = SourcePlan.from_dict(
+        {"name": "example", "url": "https://example.com/latest/", "discovery": {"sitemaps": "auto"}}
+    )
+    discovery = LinkDiscovery(config=config, fetcher=SimpleNamespace(metrics=Metrics(config=config)))
+
+    assert asyncio.run(discovery.discover(source, fetch))
+    assert source.sublinks == ["https://example.com/b/", "https://example.com/a/"]
+    assert source.pages == ["https://example.com/sitemap.xml", "https://example.com/new.xml"]
+    assert "https://example.com/old.xml" not in requested
+
+
+def test_discover_without_links_keeps_source(config):
+    async def fetch(url):
+        return None
+
+    source = SourcePlan.from_dict(
+        {"name": "example", "url": "https://example.com/latest/", "discovery": {"sitemaps": ["/sitemap.xml"]}}
+    )
+    discovery = LinkDiscovery(config=config, fetcher=SimpleNamespace(metrics=Metrics(config=config)))
+
+    assert not asyncio.run(discovery.discover(source, fetch))
+    assert source.sublinks is None
+    assert source.pages == ["https://example.com/latest/"]
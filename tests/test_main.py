@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+import main
+from src.parser.crawl_orchestrator import CrawlOrchestrator
+from src.parser.generic_html_parser import DynamicPageHandler
+
+
+@pytest.mark.parametrize("dataflow_enabled", [True, False])
+def test_browsers_are_closed_after_an_error(config, monkeypatch, dataflow_enabled):
+    config.dataflow_enabled = dataflow_enabled
+    config.urls_json_path = config.output_path.joinpath("urls.json")
+    config.urls_json_path.parent.mkdir(parents=True, exist_ok=True)
+    config.urls_json_path.write_text(
+        json.dumps([{"url": "https://example.com/", "name": "news", "bs4": True}]), encoding="utf-8"
+    )
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("stage failed")
+
+    closed = []
+    monkeypatch.setattr(CrawlOrchestrator, "run", fail)
+    monkeypatch.setattr(DynamicPageHandler, "get_paginated_links", fail)
+    monkeypatch.setattr(DynamicPageHandler, "close", lambda self: closed.append(self))
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        main.run(config=config)
+    assert len(closed) == 1
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from src.utils.near_duplicates import NearDuplicateIndex, simhash_batch
+
+WORDS = "agency report market growth security data launch team users policy funding round".split()
+
+
+def make_text(seed: int, n_words: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(n_words))
+
+
+def article(link: str, text: str) -> dict:
+    return {"article_link": link, "article": text}
+
+
+@pytest.fixture
+def index(config):
+    config.dedup_enabled = True
+    index = NearDuplicateIndex(config=config)
+    yield index
+    index.close()
+
+
+def test_simhash_is_stable_and_similar_for_small_edits():
+    text = make_text(1)
+    edited = text.replace(text.split()[10], "changed", 1)
+
+    first, second, other, short = simhash_batch([text, edited, make_text(2), "zu kurz"])
+
+    assert simhash_batch([text]) == [first]
+    assert 0 <= first < 1 << 64
+    assert (first ^ second).bit_count() <= 3
+    assert (first ^ other).bit_count() > 10
+    assert short is None
+
+
+def test_drop_removes_duplicates_within_and_across_blocks(index):
+    text = make_text(1)
+
+    kept = index.filter([article("https://a.com/1", text), article("https://b.com/1", text)])
+    assert [item["article_link"] for item in kept] == ["https://a.com/1"]
+
+    kept = index.filter([article("https://c.com/1", text), article("https://c.com/2", make_text(2))])
+    assert [item["article_link"] for item in kept] == ["https://c.com/2"]
+
+
+def test_same_url_is_not_its_own_duplicate(index):
+    text = make_text(1)
+    index.filter([article("https://a.com/1", text)])
+
+    assert len(index.filter([article("https://a.com/1", text)])) == 1
+
+
+def test_tag_keeps_duplicates_with_original_link(config):
+    config.dedup_action = "tag"
+    index = NearDuplicateIndex(config=config)
+    text = make_text(1)
+
+    kept = index.filter([article("https://a.com/1", text), article("https://b.com/1", text)])
+
+    assert [item["duplicate_of"] for item in kept] == [None, "https://a.com/1"]
+    index.close()
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 7])
+def test_all_band_widths_fit_into_sqlite(config, max_distance):
+    config.dedup_max_distance = max_distance
+    index = NearDuplicateIndex(config=config)
+    texts = [make_text(seed) for seed in range(20)]
+
+    kept = index.filter([article(f"https://a.com/{seed}", text) for seed, text in enumerate(texts)])
+    assert len(kept) == len({fingerprint for fingerprint in simhash_batch(texts)})
+    # Identische Texte werden über jeden Band-Schlüssel gefunden
+    assert index.filter([article("https://b.com/0", texts[0])]) == []
+    index.close()
+
+
+def test_largest_max_distance_uses_one_bit_bands(config):
+    config.dedup_max_distance = 63
+    index = NearDuplicateIndex(config=config)
+
+    # Bis auf das Komplement liegt jeder Fingerabdruck innerhalb von 63 Bits
+    kept = index.filter([article(f"https://a.com/{seed}", make_text(seed)) for seed in range(5)])
+    assert [item["article_link"] for item in kept] == ["https://a.com/0"]
+    index.close()
+
+
+@pytest.mark.parametrize("max_distance", [-1, 64])
+def test_invalid_max_distance(config, max_distance):
+    config.dedup_max_distance = max_distance
+    with pytest.raises(ValueError, match="dedup_max_distance"):
+        NearDuplicateIndex(config=config)
+
+
+def test_invalid_action(config):
+    config.dedup_action = "merge"
+    with pytest.raises(ValueError, match="dedup_action"):
+        NearDuplicateIndex(config=config)
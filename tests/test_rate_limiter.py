@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from src.utils.rate_limiter import DomainRateLimiter
+
+URL = "https://example.com/article/1"
+
+
+@pytest.fixture
+def limiter(config):
+    config.respect_crawl_delay = False
+    config.default_requests_per_second, config.default_burst = 1.0, 1
+    return DomainRateLimiter(config=config, http_client=None)
+
+
+def test_reserve_waits_for_the_rate(limiter):
+    limiter.configure("example.com", rate=2.0, burst=2)
+
+    waits = [limiter.reserve(URL) for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.01)
+    assert waits[3] == pytest.approx(1.0, abs=0.01)
+    assert limiter.reserve(URL, throttle=False) == 0.0
+
+
+def test_configure_again_keeps_bucket_and_block(limiter):
+    limiter.configure("example.com", rate=1.0, burst=5)
+    for _ in range(5):
+        limiter.reserve(URL)
+    limiter.report(URL, 429, retry_after="60")
+
+    # z. B. ein erneuter Aufruf von configure_sources
+    limiter.configure("example.com", rate=1.0, burst=5)
+
+    assert limiter.reserve(URL) > 55
+    assert limiter.reserve(URL, throttle=False) > 55
+
+
+def test_configure_updates_changed_rate_without_refilling_burst(limiter):
+    limiter.configure("example.com", rate=1.0, burst=3)
+    for _ in range(3):
+        limiter.reserve(URL)
+
+    limiter.configure("example.com", rate=10.0, burst=10)
+
+    # Kein neuer Burst, das nächste Token kommt mit der neuen Rate
+    assert limiter.reserve(URL) == pytest.approx(0.1, abs=0.02)
+
+
+def test_throttled_rate_recovers_after_success(limiter):
+    limiter.configure("example.com", rate=4.0, burst=1)
+    limiter.report(URL, 503)
+    bucket = limiter._bucket("example.com")
+    assert bucket.current_rate == 2.0
+    assert bucket.blocked_until > time.monotonic()
+
+    limiter.report(URL, 200)
+    assert bucket.current_rate == pytest.approx(2.4)
+
+
+def test_parse_retry_after():
+    assert DomainRateLimiter._parse_retry_after("120") == 120.0
+    assert DomainRateLimiter._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert DomainRateLimiter._parse_retry_after("soon") is None
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.utils.result_sink import ResultSink
+
+
+def article(link: str) -> dict:
+    return {"name": "news", "article_link": link, "title": "t", "article": "text"}
+
+
+def test_on_written_runs_after_the_flush(config):
+    config.sink_flush_records, config.sink_flush_interval = 2, 3600
+    written = []
+
+    with ResultSink(config=config, run_id="run") as sink:
+        sink.write("news", [article("https://example.com/a")], on_written=lambda: written.append("a"))
+        assert written == []
+        assert not sink.writer.exists("news")
+
+        sink.write("news", [article("https://example.com/b")], on_written=lambda: written.append("b"))
+        assert written == ["a", "b"]
+        assert sink.writer.exists("news")
+
+        sink.write("news", [article("https://example.com/c")], on_written=lambda: written.append("c"))
+    assert written == ["a", "b", "c"]
+
+
+def test_resumed_output_skips_written_records(config):
+    with ResultSink(config=config, run_id="run") as sink:
+        sink.write("news", [article("https://example.com/a")])
+
+    with ResultSink(config=config, run_id="run") as sink:
+        sink.write("news", [article("https://example.com/a"), article("https://example.com/b")])
+
+    output = pd.read_csv(config.output_path.joinpath("news_run.csv"), sep=config.delimiter)
+    assert list(output["article_link"]) == ["https://example.com/a", "https://example.com/b"]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from src.parser.source_spec import SourcePlan, SourceSpec
+from src.utils.file_manager import FileHandler
+
+ENTRY = {
+    "url": "https://example.com/medals/",
+    "name": "medals",
+    "pandas": True,
+    "tables": {"index": [0, 2], "dtypes": {"Gold": "int"}},
+}
+
+
+def test_options_are_immutable():
+    spec = SourceSpec.from_dict(ENTRY)
+
+    with pytest.raises(TypeError):
+        spec.tables["index"] = 1
+    with pytest.raises(TypeError):
+        spec.tables["dtypes"]["Gold"] = "float"
+    assert spec.tables["index"] == (0, 2)
+    assert hash(spec.urls)
+
+
+def test_to_dict_round_trip():
+    spec = SourceSpec.from_dict(ENTRY)
+
+    data = spec.to_dict()
+
+    assert data["tables"] == ENTRY["tables"]
+    assert json.loads(json.dumps(data)) == data
+    assert SourceSpec.from_dict(data) == spec
+
+
+def test_frozen_options_are_validated():
+    with pytest.raises(ValueError, match="index"):
+        SourcePlan.from_dict({**ENTRY, "tables": {"index": [0, "x"]}})
+    assert SourcePlan.from_dict(ENTRY).spec.tables["index"] == (0, 2)
+
+
+def test_deprecated_loaders(config):
+    config.urls_json_path = config.output_path.joinpath("urls.json")
+    config.urls_json_path.parent.mkdir(parents=True, exist_ok=True)
+    config.urls_json_path.write_text(json.dumps([ENTRY]), encoding="utf-8")
+
+    with pytest.warns(DeprecationWarning, match="load_sources_from_json"):
+        entries = FileHandler(config=config).create_main_url_dict_from_json()
+
+    assert entries[0]["url"] == [ENTRY["url"]]
+    assert entries[0]["tables"] == ENTRY["tables"]
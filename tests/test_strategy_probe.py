@@ -0,0 +1,56 @@
+from src.parser.html_parser import HtmlParser
+from src.parser.pagination import HttpPaginator
+from src.parser.source_spec import SourcePlan
+from src.parser.strategy_probe import StrategyProbe
+
+
+def make_source(base_url: str, path: str = "/latest/") -> SourcePlan:
+    return SourcePlan.from_dict(
+        {
+            "url": f"{base_url}{path}",
+            "name": "news",
+            "bs4": True,
+            "newspaper3K": True,
+            "paginated": True,
+            "a_tag_location_css": "loop-card__title-link",
+            "page_button_location": "wp-block-query-pagination-next",
+        }
+    )
+
+
+def test_http_source_keeps_selenium_page_limit(config, fixture_site):
+    config.selenium_max_pages, config.pagination_max_pages = 1, 50
+    fetcher = HtmlParser(config=config).fetcher
+    probe = StrategyProbe(config=config, fetcher=fetcher)
+    source = make_source(fixture_site.base_url)
+
+    probe.resolve([source])
+    assert source.pagination_strategy == "rel_next"
+    HttpPaginator(config=config, fetcher=fetcher).paginate(source)
+
+    assert source.pages == [source.spec.urls[0]]
+    assert len(source.sublinks) == 5
+    probe.close()
+
+
+def test_decision_is_cached(config, fixture_site):
+    fetcher = HtmlParser(config=config).fetcher
+    probe = StrategyProbe(config=config, fetcher=fetcher)
+    probe.resolve([make_source(fixture_site.base_url, "/statistics/medal/country/")])
+    probe.close()
+
+    n_requests = fixture_site.n_requests
+    source = make_source(fixture_site.base_url, "/statistics/medal/country/")
+    StrategyProbe(config=config, fetcher=fetcher).resolve([source])
+
+    assert source.pagination_strategy == "selenium"
+    assert fixture_site.n_requests == n_requests
+
+
+def test_database_is_created_only_when_needed(config, fixture_site):
+    probe = StrategyProbe(config=config, fetcher=HtmlParser(config=config).fetcher)
+
+    probe.resolve([SourcePlan.from_dict({"url": f"{fixture_site.base_url}/latest/", "name": "plain", "bs4": True})])
+    probe.close()
+
+    assert not config.strategy_probe_path.exists()
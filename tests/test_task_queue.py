@@ -0,0 +1,120 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.utils.task_queue import SqliteTaskQueue, Task, open_task_queue, retry_delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(config):
+    queue = open_task_queue(config)
+    yield queue
+    queue.close()
+
+
+def test_put_many_skips_duplicates(queue):
+    assert queue.put_many("article", [{"link": "a"}, {"link": "b"}], dedup_keys=["a", "b"]) == 2
+    assert queue.put_many("article", [{"link": "a"}, {"link": "c"}], dedup_keys=["a", "c"]) == 1
+    assert queue.stats()["queued"] == 3
+
+
+def test_lease_ack_and_kinds(queue):
+    queue.put_many("source", [{"name": "s"}])
+    queue.put_many("article", [{"link": "a"}, {"link": "b"}])
+
+    [task] = queue.lease("w1", kinds=["source"], limit=5)
+    assert (task.kind, task.payload, task.attempts) == ("source", {"name": "s"}, 1)
+    assert len(queue.lease("w1", kinds=["article"], limit=5)) == 2
+    assert queue.lease("w2") == []
+
+    queue.ack(task)
+    assert queue.stats() == {"queued": 0, "leased": 2, "done": 1, "failed": 0}
+    assert queue.pending() == 2
+
+
+def test_expired_lease_is_leased_again(config, queue, clock):
+    queue.put_many("article", [{"link": "a"}])
+    [task] = queue.lease("w1")
+
+    clock[0] += config.task_visibility_timeout + 1
+    [again] = queue.lease("w2")
+
+    assert again.id == task.id and again.attempts == 2
+
+
+def test_failed_task_waits_before_it_is_leased_again(config, queue, clock):
+    queue.put_many("article", [{"link": "a"}])
+    [task] = queue.lease("w1")
+    queue.fail(task, "request failed")
+
+    assert queue.lease("w1") == []
+    assert queue.pending() == 1
+
+    clock[0] += config.task_retry_delay
+    [again] = queue.lease("w1")
+    assert again.attempts == 2
+
+
+def test_fail_waits_for_given_delay(config, queue, clock):
+    queue.put_many("article", [{"link": "a"}])
+    [task] = queue.lease("w1")
+    queue.fail(task, "request failed", delay=config.task_retry_delay * 10)
+
+    clock[0] += config.task_retry_delay * 5
+    assert queue.lease("w1") == []
+    clock[0] += config.task_retry_delay * 5
+    assert len(queue.lease("w1")) == 1
+
+
+def test_task_fails_after_max_attempts(config, queue, clock):
+    queue.put_many("article", [{"link": "a"}])
+    for _ in range(config.task_max_attempts):
+        [task] = queue.lease("w1")
+        queue.fail(task, "status code 503")
+        clock[0] += config.task_retry_max_delay
+
+    assert queue.lease("w1") == []
+    assert queue.stats()["failed"] == 1
+    assert queue.pending() == 0
+
+
+def test_retry_delay_grows_and_is_capped(config):
+    config.task_retry_delay, config.task_retry_max_delay = 10.0, 35.0
+
+    assert [retry_delay(config, Task(id="1", kind="article", payload={}, attempts=n)) for n in (1, 2, 3)] == [
+        10.0,
+        20.0,
+        35.0,
+    ]
+    assert retry_delay(config, Task(id="1", kind="article", payload={}, attempts=1), delay=60.0) == 60.0
+
+
+def test_database_of_previous_version_is_migrated(config, tmp_path):
+    path = tmp_path.joinpath("old.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, dedup_key TEXT UNIQUE, "
+        "payload TEXT, state TEXT, attempts INTEGER, lease_until REAL, worker TEXT, error TEXT)"
+    )
+    connection.execute("INSERT INTO tasks (kind, payload, state, attempts) VALUES ('article', '{}', 'queued', 0)")
+    connection.commit()
+    connection.close()
+    config.task_queue_url = f"sqlite:///{path}"
+
+    queue = SqliteTaskQueue(config=config)
+    assert len(queue.lease("w1")) == 1
+    queue.close()
+
+
+def test_unsupported_url(config):
+    config.task_queue_url = "postgres://localhost/tasks"
+    with pytest.raises(ValueError):
+        open_task_queue(config)